@@ -32,11 +32,12 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db)
-) -> User:
-    """Get the current authenticated user from JWT token."""
+async def get_user_from_token(token: str, db: AsyncSession, scope: Optional[str] = None) -> User:
+    """Resolve a JWT to its active user.
+
+    Tokens issued for a single purpose carry a `scope` claim and are only
+    accepted where that scope is asked for, never as access tokens.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -46,7 +47,7 @@ async def get_current_user(
     try:
         payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
         user_id: str = payload.get("sub")
-        if user_id is None:
+        if user_id is None or payload.get("scope") != scope:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
@@ -61,10 +62,25 @@ async def get_current_user(
 
     return user
 
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """Get the current authenticated user from JWT token."""
+    return await get_user_from_token(token, db)
+
 async def get_current_active_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
     """Ensure the current user is active."""
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
+    return current_user
+
+async def get_current_ops_user(
+    current_user: User = Depends(get_current_active_user)
+) -> User:
+    """Restrict worker-wide diagnostics to the accounts listed in OPS_EMAILS."""
+    if current_user.email.lower() not in settings.ops_emails_list:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not permitted")
     return current_user
\ No newline at end of file
@@ -10,11 +10,39 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRATION_HOURS: int = 24
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    DATABASE_BUSY_TIMEOUT_SECONDS: float = 30.0  # how long a SQLite write waits for the lock before failing
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024  # bytes read from an upload at a time
+    IMPORT_BATCH_SIZE: int = 1000  # transactions parsed and inserted per batch
+    IMPORT_MAX_REPORTED_ERRORS: int = 100
+    IMPORT_MAX_CONCURRENT_JOBS: int = 1  # background imports running at once per worker; SQLite has a single writer
+    IMPORT_JOB_RETENTION_SECONDS: int = 3600  # how long finished jobs stay pollable
+    IMPORT_PROCESS_WORKERS: int = 0  # processes parsing multi-file uploads, 0 = one per core
+    IMPORT_MAX_ARCHIVE_FILES: int = 500
+    IMPORT_MAX_ARCHIVE_BYTES: int = 1024 * 1024 * 1024  # uncompressed size limit for ZIP uploads
+    ALERT_DEBOUNCE_SECONDS: float = 2.0  # alert triggers for a user within this window share one run
+    ALERT_BATCH_INTERVAL_SECONDS: int = 3600  # seconds between all-user alert runs in the API process; 0 on all but one worker, or when cron runs run_alert_batch.py
+    ALERT_BATCH_CHUNK_SIZE: int = 500  # users fetched and checkpointed at a time
+    ALERT_BATCH_CONCURRENCY: int = 8  # users evaluated at once
+    ALERT_STREAM_HEARTBEAT_SECONDS: float = 15.0  # comment line sent on idle alert streams to keep proxies from closing them
+    ALERT_STREAM_QUEUE_SIZE: int = 100  # undelivered alerts buffered per stream before the oldest are dropped
+    ALERT_STREAM_TOKEN_SECONDS: int = 60  # lifetime of the single-purpose token an EventSource opens a stream with
+    ALERT_PROFILE_LOGGING: bool = False  # log per-rule timings and query counts of every alert run
+    GOAL_SIMULATION_TRAJECTORIES: int = 2000  # Monte Carlo paths per goal projection
+    GOAL_SIMULATION_HORIZON_MONTHS: int = 120
+    GOAL_SIMULATION_HISTORY_MONTHS: int = 24  # past months resampled for net savings
+    GOAL_SIMULATION_MIN_MONTHS: int = 3
+    DASHBOARD_CACHE_MAX_ENTRIES: int = 1000  # cached dashboard payloads per worker
+    DASHBOARD_CACHE_MAX_BYTES: int = 32 * 1024 * 1024  # serialized size limit across all cached payloads
+    OPS_EMAILS: str = ""  # comma-separated accounts allowed to read worker-wide stats endpoints
 
     @property
     def cors_origins_list(self) -> List[str]:
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
 
+    @property
+    def ops_emails_list(self) -> List[str]:
+        return [email.strip().lower() for email in self.OPS_EMAILS.split(",") if email.strip()]
+
     class Config:
         env_file = ".env"
 
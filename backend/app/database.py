@@ -1,3 +1,4 @@
+from sqlalchemy import event, inspect, text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
@@ -6,18 +7,73 @@ from app.models import Base
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=False,
-    future=True
+    future=True,
+    connect_args={"timeout": settings.DATABASE_BUSY_TIMEOUT_SECONDS} if settings.DATABASE_URL.startswith("sqlite") else {}
 )
 
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine.sync_engine, "connect")
+    def _enable_wal(dbapi_connection, connection_record):
+        # Readers keep going while an import holds the write lock
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.close()
+
 AsyncSessionLocal = sessionmaker(
     engine,
     class_=AsyncSession,
     expire_on_commit=False
 )
 
+def upgrade_schema(connection):
+    """Create missing tables and bring tables from an older version up to date.
+
+    create_all only creates missing tables, so columns added to existing
+    models are added here, backfilled if needed, and their indexes created.
+    Tables that are new to an existing database get their backfill too.
+    """
+    from app.services.transaction_service import TransactionService
+    from app.services.rollup_service import RollupService
+    from app.services.alert_service import AlertService
+    from app.services.alert_generation_service import AlertGenerationService
+
+    table_backfills = {
+        "monthly_rollups": RollupService.rebuild_sync,
+        "alert_counters": AlertService.rebuild_unread_counts_sync,
+    }
+    column_backfills = {
+        ("transactions", "fingerprint"): TransactionService.backfill_fingerprints,
+        ("alerts", "dedup_key"): AlertGenerationService.backfill_dedup_keys,
+        ("alerts", "entity_id"): AlertService.backfill_entities,
+    }
+
+    inspector = inspect(connection)
+    existing_tables = set(inspector.get_table_names())
+    Base.metadata.create_all(connection)
+
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            backfill = table_backfills.get(table.name)
+            if backfill:
+                backfill(connection)
+            continue
+
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(connection.dialect)
+            connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+            backfill = column_backfills.get((table.name, column.name))
+            if backfill:
+                backfill(connection)
+
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
 async def init_db():
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(upgrade_schema)
 
 async def get_db():
     async with AsyncSessionLocal() as session:
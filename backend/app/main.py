@@ -3,12 +3,22 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from app.config import settings
 from app.database import init_db
+from app.request_memo import RequestMemoMiddleware
+from app.services.import_jobs import import_jobs
+from app.services.alert_scheduler import alert_scheduler
+from app.services.alert_batch import alert_batch_scheduler
+from app.services.import_service import ImportService
 from app.routers import auth, transactions, subscriptions, anomalies, goals, budgets, alerts, dashboard
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    alert_batch_scheduler.start()
     yield
+    await alert_batch_scheduler.shutdown()
+    await import_jobs.shutdown()
+    await alert_scheduler.shutdown()
+    ImportService.shutdown_process_pool()
 
 app = FastAPI(
     title="Nudget - Smart Financial Coach API",
@@ -24,6 +34,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(RequestMemoMiddleware)
 
 app.include_router(auth.router)
 app.include_router(transactions.router)
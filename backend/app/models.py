@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, ForeignKey, Text, Index, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -23,6 +23,7 @@ class User(Base):
     recurring_charges = relationship("RecurringCharge", back_populates="user", cascade="all, delete-orphan")
     budgets = relationship("Budget", back_populates="user", cascade="all, delete-orphan")
     alerts = relationship("Alert", back_populates="user", cascade="all, delete-orphan")
+    monthly_rollups = relationship("MonthlyRollup", back_populates="user", cascade="all, delete-orphan")
 
 class Transaction(Base):
     __tablename__ = "transactions"
@@ -38,12 +39,19 @@ class Transaction(Base):
     is_recurring = Column(Boolean, default=False)
     is_anomaly = Column(Boolean, default=False)
     anomaly_score = Column(Float, default=0.0)
+    import_job_id = Column(String(36), index=True)  # background import that wrote the row, removed if the job fails
+    fingerprint = Column(String(64))  # content hash used to skip re-imported rows
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationship
     user = relationship("User", back_populates="transactions")
 
+    __table_args__ = (
+        Index("ix_transactions_user_fingerprint", "user_id", "fingerprint", unique=True),
+        Index("ix_transactions_user_date", "user_id", "date"),
+    )
+
 class Goal(Base):
     __tablename__ = "goals"
 
@@ -104,7 +112,55 @@ class Alert(Base):
     description = Column(Text, nullable=False)
     is_read = Column(Boolean, default=False)
     metadata_json = Column(Text)  # JSON string for extra data
+    dedup_key = Column(String(255))  # at most one unread alert per user and key
+    entity_type = Column(String(50))  # goal, budget, merchant or category the alert is about
+    entity_id = Column(String(255))
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationship
-    user = relationship("User", back_populates="alerts")
\ No newline at end of file
+    user = relationship("User", back_populates="alerts")
+
+    __table_args__ = (
+        Index(
+            "ix_alerts_user_dedup_unread", "user_id", "dedup_key",
+            unique=True,
+            sqlite_where=text("is_read = 0 AND dedup_key IS NOT NULL")
+        ),
+        Index("ix_alerts_user_entity", "user_id", "entity_type", "entity_id"),
+        Index("ix_alerts_user_read_created", "user_id", "is_read", "created_at"),
+    )
+
+class AlertCounter(Base):
+    __tablename__ = "alert_counters"
+
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    unread_count = Column(Integer, nullable=False, default=0)  # kept in step with inserts and mark-read
+
+class DataVersion(Base):
+    __tablename__ = "data_versions"
+
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)  # bumped by every commit that changes the user's data
+
+class MonthlyRollup(Base):
+    __tablename__ = "monthly_rollups"
+
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    month = Column(String(7), primary_key=True)  # YYYY-MM
+    category = Column(String(100), primary_key=True)
+    transaction_type = Column(String(50), primary_key=True)
+    total_amount = Column(Float, nullable=False, default=0.0)
+    transaction_count = Column(Integer, nullable=False, default=0)
+
+    # Relationship
+    user = relationship("User", back_populates="monthly_rollups")
+
+class JobCheckpoint(Base):
+    __tablename__ = "job_checkpoints"
+
+    name = Column(String(100), primary_key=True)
+    last_user_id = Column(String)  # keyset position of an unfinished run, None once it completes
+    users_processed = Column(Integer, nullable=False, default=0)
+    started_at = Column(DateTime)
+    completed_at = Column(DateTime)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
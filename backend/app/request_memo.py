@@ -0,0 +1,50 @@
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+_memo: ContextVar[Optional[Dict[Tuple[str, str], asyncio.Future]]] = ContextVar('request_memo', default=None)
+
+@contextmanager
+def memo_scope():
+    """Share memoized per-user metrics for the length of a request or background job."""
+    token = _memo.set({})
+    try:
+        yield
+    finally:
+        _memo.reset(token)
+
+async def memoized(name: str, user_id: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+    """Compute a user metric at most once per scope.
+
+    Concurrent callers in the same scope await the same computation. Outside
+    a scope the metric is simply computed. Scopes are short-lived, so values
+    are not invalidated by writes made later in the same request or job.
+    """
+    memo = _memo.get()
+    if memo is None:
+        return await compute()
+
+    key = (name, user_id)
+    future = memo.get(key)
+    if future is None:
+        future = memo[key] = asyncio.ensure_future(compute())
+    try:
+        return await asyncio.shield(future)
+    except Exception:
+        memo.pop(key, None)
+        raise
+
+class RequestMemoMiddleware:
+    """Pure ASGI middleware giving every HTTP request its own memo scope."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with memo_scope():
+            await self.app(scope, receive, send)
@@ -1,16 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+from datetime import timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query, Header
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from app.database import get_db
+from app.config import settings
+from app.database import get_db, AsyncSessionLocal
 from app.models import User
-from app.auth import get_current_active_user
+from app.auth import get_current_active_user, get_current_ops_user, get_user_from_token, create_access_token
 from app.schemas import (
-    AlertResponse, MarkAlertsReadRequest
+    AlertResponse, MarkAlertsReadRequest, MarkAlertsReadByTypeRequest, DeleteAlertsRequest
 )
 from app.services.alert_service import AlertService
+from app.services.alert_hub import alert_hub
 
 router = APIRouter(prefix="/api/alerts", tags=["alerts"])
 
+STREAM_TOKEN_SCOPE = "alert_stream"
+
 @router.get("/", response_model=List[AlertResponse])
 async def get_alerts(
     unread_only: bool = False,
@@ -33,6 +40,60 @@ async def get_alerts(
 
     return alerts
 
+@router.post("/stream-token")
+async def create_stream_token(current_user: User = Depends(get_current_active_user)):
+    """Short-lived token that can only open the current user's alert stream"""
+    token = create_access_token(
+        {"sub": current_user.id, "scope": STREAM_TOKEN_SCOPE},
+        timedelta(seconds=settings.ALERT_STREAM_TOKEN_SECONDS)
+    )
+    return {"token": token, "expires_in": settings.ALERT_STREAM_TOKEN_SECONDS}
+
+@router.get("/stream")
+async def stream_alerts(
+    token: Optional[str] = Query(None),
+    authorization: Optional[str] = Header(None)
+):
+    """Server-sent events for the current user's new alerts.
+
+    EventSource cannot set headers, so it passes a token from /stream-token
+    as ?token=; access tokens are only accepted in the Authorization header,
+    keeping them out of URLs and logs. The user is looked up once with a
+    short-lived session; the open stream itself never touches the database.
+    """
+    scope = STREAM_TOKEN_SCOPE
+    if authorization and authorization.lower().startswith("bearer "):
+        token, scope = authorization[7:], None
+    if not token:
+        raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+
+    async with AsyncSessionLocal() as db:
+        user = await get_user_from_token(token, db, scope)
+    user_id = user.id
+
+    async def events():
+        queue = alert_hub.subscribe(user_id)
+        try:
+            yield ": connected\n\n"
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), settings.ALERT_STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+        finally:
+            alert_hub.unsubscribe(user_id, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/stream/stats")
+async def stream_stats(current_user: User = Depends(get_current_ops_user)):
+    """Open alert streams in this worker"""
+    return alert_hub.stats()
+
 @router.post("/mark-read")
 async def mark_alerts_read(
     request: MarkAlertsReadRequest,
@@ -48,6 +109,44 @@ async def mark_alerts_read(
         "count": count
     }
 
+@router.post("/mark-all-read")
+async def mark_all_alerts_read(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    count = await AlertService.mark_all_read(db, current_user.id)
+    return {
+        "message": f"Marked {count} alerts as read",
+        "count": count
+    }
+
+@router.post("/mark-read-by-type")
+async def mark_alerts_read_by_type(
+    request: MarkAlertsReadByTypeRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    count = await AlertService.mark_read_by_type(db, current_user.id, request.type.value)
+    return {
+        "message": f"Marked {count} alerts as read",
+        "count": count
+    }
+
+@router.post("/delete")
+async def delete_alerts(
+    request: DeleteAlertsRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    if not request.ids:
+        raise HTTPException(status_code=400, detail="No alert IDs provided")
+
+    count = await AlertService.delete_alerts(db, request.ids, current_user.id)
+    return {
+        "message": f"Deleted {count} alerts",
+        "count": count
+    }
+
 @router.post("/generate")
 async def generate_alerts(
     db: AsyncSession = Depends(get_db),
@@ -67,6 +166,25 @@ async def generate_alerts(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate alerts: {str(e)}")
 
+@router.get("/unread-count")
+async def get_unread_count(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Number of unread alerts, read from the user's counter row"""
+    return {"unread_count": await AlertService.get_unread_count(db, current_user.id)}
+
+@router.get("/dry-run")
+async def dry_run_alerts(
+    group: Optional[List[str]] = Query(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Evaluate alert rules without creating alerts, with per-step timings and query counts"""
+    from app.services.alert_rules import AlertRuleEngine
+
+    return await AlertRuleEngine.dry_run(db, current_user.id, group)
+
 @router.post("/generate-subscription-alerts")
 async def generate_subscription_alerts(
     db: AsyncSession = Depends(get_db),
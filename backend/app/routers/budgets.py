@@ -1,14 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
+from datetime import datetime
 from app.database import get_db
 from app.models import User
 from app.auth import get_current_active_user
 from app.schemas import (
-    BudgetCreate, BudgetUpdate, BudgetResponse, BudgetUsage
+    BudgetCreate, BudgetUpdate, BudgetResponse, BudgetUsage, BudgetUsageHistory, BudgetForecast
 )
 from app.services.budget_service import BudgetService
-from app.services.alert_service import AlertService
+from app.services.budget_forecaster import BudgetForecaster
+from app.services.rollup_service import RollupService
+from app.services.alert_scheduler import alert_scheduler
 
 router = APIRouter(prefix="/api/budgets", tags=["budgets"])
 
@@ -21,8 +24,8 @@ async def create_budget(
     try:
         new_budget = await BudgetService.create_budget(db, budget, current_user.id)
 
-        # Generate budget alerts immediately after creation
-        await AlertService.generate_budget_alerts(db, current_user.id)
+        # Re-evaluate alerts in the background
+        alert_scheduler.trigger(current_user.id)
 
         return new_budget
     except ValueError as e:
@@ -48,6 +51,33 @@ async def get_budget_usage(
     usage = await BudgetService.calculate_budget_usage(db, current_user.id, month)
     return usage
 
+MONTH_PATTERN = r"^\d{4}-(0[1-9]|1[0-2])$"
+MAX_HISTORY_MONTHS = 120
+
+@router.get("/usage/history", response_model=BudgetUsageHistory)
+async def get_budget_usage_history(
+    from_month: Optional[str] = Query(None, alias="from", pattern=MONTH_PATTERN),  # Default: 11 months before `to`
+    to_month: Optional[str] = Query(None, alias="to", pattern=MONTH_PATTERN),  # Default: current month
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    to_month = to_month or datetime.utcnow().strftime("%Y-%m")
+    from_month = from_month or RollupService.shift_month(to_month, -11)
+
+    if from_month > to_month:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+    if from_month < RollupService.shift_month(to_month, -(MAX_HISTORY_MONTHS - 1)):
+        raise HTTPException(status_code=400, detail=f"History is limited to {MAX_HISTORY_MONTHS} months")
+
+    return await BudgetService.calculate_budget_usage_history(db, current_user.id, from_month, to_month)
+
+@router.get("/forecast", response_model=List[BudgetForecast])
+async def get_budget_forecast(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    return await BudgetForecaster.forecast_user(db, current_user.id)
+
 @router.get("/{budget_id}", response_model=BudgetResponse)
 async def get_budget(
     budget_id: str,
@@ -72,8 +102,8 @@ async def update_budget(
     if not updated_budget:
         raise HTTPException(status_code=404, detail="Budget not found")
 
-    # Generate budget alerts after update
-    await AlertService.generate_budget_alerts(db, current_user.id)
+    # Re-evaluate alerts in the background
+    alert_scheduler.trigger(current_user.id)
 
     return updated_budget
 
@@ -1,29 +1,60 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, Response
 from typing import Dict, Any
+from datetime import datetime
+import asyncio
 import json
-from app.database import get_db
+import time
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import AsyncSessionLocal, get_db
 from app.models import User
-from app.auth import get_current_active_user
+from app.auth import get_current_active_user, get_current_ops_user
 from app.schemas import DashboardOverview
 from app.services.transaction_service import TransactionService
 from app.services.budget_service import BudgetService
 from app.services.alert_service import AlertService
+from app.services.rollup_service import RollupService
+from app.services.dashboard_cache import dashboard_cache, data_versions
 
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 
+async def _load_section(name: str, timings: Dict[str, float], loader, *args):
+    """Run one dashboard read on its own pooled session and record its duration."""
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as session:
+        result = await loader(session, *args)
+    timings[name] = time.perf_counter() - started
+    return result
+
+def _server_timing(timings: Dict[str, float]) -> str:
+    return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.items())
+
 @router.get("/overview", response_model=DashboardOverview)
 async def get_dashboard_overview(
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    response: Response,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get comprehensive dashboard data including transactions, budgets, and alerts"""
+    started = time.perf_counter()
     try:
-        # Generate fresh alerts for the user
-        await AlertService.generate_all_alerts(db, current_user.id)
+        # Serve the cached payload while none of the user's data has changed;
+        # month-to-date figures also roll over when a new month starts
+        period = RollupService.month_key(datetime.utcnow())
+        version = await data_versions.get(db, current_user.id)
+        cached = dashboard_cache.get(current_user.id, version, period)
+        if cached is not None:
+            response.headers["Server-Timing"] = _server_timing({"cache": time.perf_counter() - started})
+            return cached
+
+        # Alerts are generated in the background when data changes; only read them here
 
-        # Get spending overview from transaction service
-        spending_data = await TransactionService.get_spending_overview(db, current_user.id)
+        # The sections are independent, so read them concurrently
+        timings: Dict[str, float] = {}
+        spending_data, budget_usage, recent_alerts_raw = await asyncio.gather(
+            _load_section("spending", timings, TransactionService.get_spending_overview, current_user.id),
+            _load_section("budgets", timings, BudgetService.calculate_budget_usage, current_user.id),
+            _load_section("alerts", timings, AlertService.get_alerts, current_user.id, False, 10)
+        )
 
         # Prepare summary
         summary = {
@@ -41,14 +72,6 @@ async def get_dashboard_overview(
             for cat, amount in spending_data["categories"].items()
         ]
 
-        # Get budget usage
-        budget_usage = await BudgetService.calculate_budget_usage(db, current_user.id)
-
-        # Get recent alerts
-        recent_alerts_raw = await AlertService.get_alerts(
-            db, current_user.id, unread_only=False, limit=10
-        )
-
         # Convert alerts to response format
         recent_alerts = []
         for alert in recent_alerts_raw:
@@ -72,16 +95,28 @@ async def get_dashboard_overview(
 
             recent_alerts.append(alert_dict)
 
-        return DashboardOverview(
+        overview = DashboardOverview(
             summary=summary,
             income_vs_expenses=income_vs_expenses,
             spending_by_category=spending_by_category,
             budget_usage=budget_usage,
             recent_alerts=recent_alerts
         )
+        dashboard_cache.put(current_user.id, version, period, overview)
+
+        timings["total"] = time.perf_counter() - started
+        response.headers["Server-Timing"] = _server_timing(timings)
+        return overview
 
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Failed to generate dashboard overview: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+@router.get("/cache-stats")
+async def get_dashboard_cache_stats(
+    current_user: User = Depends(get_current_ops_user)
+) -> Dict[str, Any]:
+    """Hit, miss and eviction counters for sizing the dashboard cache"""
+    return dashboard_cache.stats()
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from app.database import get_db
@@ -6,7 +6,7 @@ from app.auth import get_current_active_user
 from app.models import User
 from app.schemas import GoalCreate, GoalUpdate, GoalResponse
 from app.services.goal_service import GoalService
-from app.services.alert_service import AlertService
+from app.services.alert_scheduler import alert_scheduler
 
 router = APIRouter(prefix="/api/goals", tags=["goals"])
 
@@ -18,8 +18,8 @@ async def create_goal(
 ):
     new_goal = await GoalService.create_goal(db, goal, current_user.id)
 
-    # Generate goal alerts after creating goal
-    await AlertService.generate_goal_alerts(db, current_user.id)
+    # Re-evaluate alerts in the background
+    alert_scheduler.trigger(current_user.id)
 
     return new_goal
 
@@ -40,6 +40,15 @@ async def get_goal_recommendations(
     recommendations = await GoalService.get_goal_recommendations(db, current_user.id)
     return {"recommendations": recommendations}
 
+@router.get("/projections")
+async def get_goal_projections(
+    trajectories: Optional[int] = Query(None, ge=100, le=20000),
+    seed: Optional[int] = None,  # Fixes the simulation for reproducible results
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    return await GoalService.project_goals(db, current_user.id, trajectories, seed)
+
 @router.get("/{goal_id}", response_model=GoalResponse)
 async def get_goal(
     goal_id: int,
@@ -85,8 +94,8 @@ async def update_goal_progress(
     if not goal:
         raise HTTPException(status_code=404, detail="Goal not found")
 
-    # Generate goal alerts after updating progress
-    await AlertService.generate_goal_alerts(db, current_user.id)
+    # Re-evaluate alerts in the background
+    alert_scheduler.trigger(current_user.id)
 
     return {
         "message": f"Added ${amount:.2f} to goal",
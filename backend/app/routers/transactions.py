@@ -1,56 +1,69 @@
+import os
+import shutil
+import tempfile
+import time
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 from app.database import get_db
 from app.models import User
 from app.auth import get_current_active_user
 from app.schemas import (
     TransactionResponse, TransactionCreate, SpendingOverview,
-    FileUploadResponse
+    ImportJobResponse
 )
 from app.services.transaction_service import TransactionService
-from app.services.alert_service import AlertService
+from app.services.import_service import SUPPORTED_EXTENSIONS, ARCHIVE_EXTENSIONS
+from app.services.import_jobs import import_jobs
+from app.services.alert_scheduler import alert_scheduler
 
 router = APIRouter(prefix="/api/transactions", tags=["transactions"])
 
-@router.post("/upload", response_model=FileUploadResponse)
+@router.post("/upload", response_model=ImportJobResponse, status_code=202)
 async def upload_transactions(
-    file: UploadFile = File(...),
-    db: AsyncSession = Depends(get_db),
+    file: Optional[UploadFile] = File(None),
+    files: Optional[List[UploadFile]] = File(None),
     current_user: User = Depends(get_current_active_user)
 ):
-    if not file.filename:
+    uploads = ([file] if file else []) + (files or [])
+    if not uploads or not all(upload.filename for upload in uploads):
         raise HTTPException(status_code=400, detail="No file provided")
 
-    file_extension = file.filename.split('.')[-1].lower()
-    if file_extension not in ['csv', 'json']:
-        raise HTTPException(status_code=400, detail="Only CSV and JSON files are supported")
+    extensions = [upload.filename.split('.')[-1].lower() for upload in uploads]
+    if any(ext not in SUPPORTED_EXTENSIONS + ARCHIVE_EXTENSIONS for ext in extensions):
+        raise HTTPException(status_code=400, detail="Only CSV, JSON, NDJSON and ZIP files are supported")
 
+    # Spool uploads to disk; parsing, inserting and alerting run on a background job
+    started = time.perf_counter()
+    work_dir = tempfile.mkdtemp(prefix="nudget-import-")
+    spooled = []
     try:
-        content = await file.read()
-        content_str = content.decode('utf-8')
-
-        if file_extension == 'csv':
-            transactions = await TransactionService.parse_csv(content_str)
-        else:
-            transactions = await TransactionService.parse_json(content_str)
-
-        count = await TransactionService.bulk_create(db, transactions, current_user.id)
-
-        # Generate alerts after uploading transactions
-        await AlertService.generate_budget_alerts(db, current_user.id)
-        await AlertService.generate_anomaly_alerts(db, current_user.id)
+        for position, (upload, extension) in enumerate(zip(uploads, extensions)):
+            path = os.path.join(work_dir, f"upload-{position}.{extension}")
+            with open(path, 'wb') as spool:
+                await run_in_threadpool(shutil.copyfileobj, upload.file, spool)
+            spooled.append((upload.filename, extension, path))
+    except Exception as e:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        raise HTTPException(status_code=500, detail=f"Failed to receive file: {str(e)}")
 
-        return FileUploadResponse(
-            message=f"Successfully imported {count} transactions",
-            transactions_imported=count
-        )
+    job = import_jobs.submit(
+        current_user.id, work_dir, spooled,
+        upload_seconds=time.perf_counter() - started
+    )
+    return job.to_dict()
 
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to process file: {str(e)}")
+@router.get("/import-jobs/{job_id}", response_model=ImportJobResponse)
+async def get_import_job(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    job = import_jobs.get(job_id, current_user.id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job.to_dict()
 
 @router.get("/", response_model=List[TransactionResponse])
 async def get_transactions(
@@ -89,11 +102,10 @@ async def create_transaction(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    new_transaction = await TransactionService.bulk_create(db, [transaction.dict()], current_user.id)
+    new_transaction = await TransactionService.create_transaction(db, transaction.dict(), current_user.id)
     if new_transaction:
-        # Generate alerts after creating transaction
-        await AlertService.generate_budget_alerts(db, current_user.id)
+        # Re-evaluate alerts in the background
+        alert_scheduler.trigger(current_user.id)
 
-        result = await TransactionService.get_all(db, current_user.id, skip=0, limit=1)
-        return result[0]
+        return new_transaction
     raise HTTPException(status_code=400, detail="Failed to create transaction")
\ No newline at end of file
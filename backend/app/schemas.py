@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, validator, EmailStr
-from datetime import datetime
+from datetime import datetime, date
 from typing import Optional, List, Dict, Any
 from enum import Enum
 
@@ -147,10 +147,20 @@ class AnomalyAlert(BaseModel):
     severity: str
     anomaly_score: float
 
-class FileUploadResponse(BaseModel):
-    message: str
-    transactions_imported: int
+class ImportJobResponse(BaseModel):
+    job_id: str
+    files: List[str]
+    status: str  # "queued", "importing", "completed", "failed"
+    rows_parsed: int = 0
+    rows_inserted: int = 0
+    rows_rejected: int = 0
+    duplicates_skipped: int = 0
+    batches: int = 0
     errors: List[str] = []
+    error: Optional[str] = None
+    phase_timings: Dict[str, float] = {}
+    created_at: datetime
+    finished_at: Optional[datetime] = None
 
 class BudgetBase(BaseModel):
     category: Optional[str] = Field(None, max_length=100)  # None for overall budget
@@ -186,6 +196,29 @@ class BudgetUsage(BaseModel):
     status: str  # "ok", "warning", "danger"
     currency: str
 
+class BudgetForecast(BaseModel):
+    budget_id: str
+    category: Optional[str]
+    budgeted_amount: float
+    spent_amount: float
+    daily_burn_rate: float
+    projected_amount: float  # Month-end spend at the current daily rate
+    projected_overspend: float
+    overspend_date: Optional[date]  # None if the budget is projected to hold
+    currency: str
+
+class BudgetHistoryColumn(BaseModel):
+    budget_id: str
+    category: Optional[str]
+    budgeted_amount: float
+    currency: str
+
+class BudgetUsageHistory(BaseModel):
+    months: List[str]  # Row labels, YYYY-MM
+    budgets: List[BudgetHistoryColumn]  # Column labels
+    spent: List[List[float]]  # spent[month][budget]
+    percent_used: List[List[float]]
+
 class AlertType(str, Enum):
     ANOMALY = "ANOMALY"
     BUDGET_WARNING = "BUDGET_WARNING"
@@ -215,6 +248,12 @@ class AlertResponse(AlertBase):
 class MarkAlertsReadRequest(BaseModel):
     ids: List[str]
 
+class MarkAlertsReadByTypeRequest(BaseModel):
+    type: AlertType
+
+class DeleteAlertsRequest(BaseModel):
+    ids: List[str]
+
 class DashboardOverview(BaseModel):
     summary: Dict[str, float]  # total_income, total_expenses, net_savings
     income_vs_expenses: List[Dict[str, Any]]
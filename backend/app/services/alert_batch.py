@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from sqlalchemy import select, and_
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models import JobCheckpoint, User
+from app.request_memo import memo_scope
+from app.services.alert_service import AlertService
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_NAME = "alert_batch"
+
+class AlertBatchRunner:
+    """Alert generation for every active user, outside of request handling.
+
+    Users are walked in primary key order, a chunk at a time, with at most
+    `concurrency` users evaluated at once. The last user id of each finished
+    chunk is stored in job_checkpoints, so a run that was interrupted
+    resumes after it instead of starting over.
+    """
+
+    @staticmethod
+    async def _get_checkpoint(db) -> JobCheckpoint:
+        checkpoint = await db.get(JobCheckpoint, CHECKPOINT_NAME)
+        if not checkpoint:
+            checkpoint = JobCheckpoint(name=CHECKPOINT_NAME, users_processed=0)
+            db.add(checkpoint)
+        return checkpoint
+
+    @staticmethod
+    async def _next_chunk(after_user_id: Optional[str], chunk_size: int) -> List[str]:
+        conditions = [User.is_active == True]
+        if after_user_id:
+            conditions.append(User.id > after_user_id)
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(User.id).where(and_(*conditions)).order_by(User.id).limit(chunk_size)
+            )
+            return list(result.scalars().all())
+
+    @staticmethod
+    async def _generate(user_id: str, semaphore: asyncio.Semaphore) -> bool:
+        async with semaphore:
+            try:
+                with memo_scope():
+                    async with AsyncSessionLocal() as db:
+                        await AlertService.generate_all_alerts(db, user_id)
+                return True
+            except Exception:
+                logger.exception("Batch alert generation failed for user %s", user_id)
+                return False
+
+    @staticmethod
+    async def run(
+        chunk_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        resume: bool = True
+    ) -> Dict[str, Any]:
+        """Generate alerts for all active users and report throughput.
+
+        With `resume`, an unfinished run continues after its checkpoint;
+        otherwise the walk starts from the first user.
+        """
+        chunk_size = chunk_size or settings.ALERT_BATCH_CHUNK_SIZE
+        semaphore = asyncio.Semaphore(concurrency or settings.ALERT_BATCH_CONCURRENCY)
+
+        async with AsyncSessionLocal() as db:
+            checkpoint = await AlertBatchRunner._get_checkpoint(db)
+            if not resume or checkpoint.last_user_id is None:
+                checkpoint.last_user_id = None
+                checkpoint.users_processed = 0
+                checkpoint.started_at = datetime.utcnow()
+                checkpoint.completed_at = None
+            resumed_after = checkpoint.last_user_id
+            after_user_id = checkpoint.last_user_id
+            await db.commit()
+
+        started = time.perf_counter()
+        users = failed = 0
+        while True:
+            user_ids = await AlertBatchRunner._next_chunk(after_user_id, chunk_size)
+            if not user_ids:
+                break
+
+            results = await asyncio.gather(
+                *(AlertBatchRunner._generate(user_id, semaphore) for user_id in user_ids)
+            )
+            users += len(user_ids)
+            failed += results.count(False)
+            after_user_id = user_ids[-1]
+
+            async with AsyncSessionLocal() as db:
+                checkpoint = await AlertBatchRunner._get_checkpoint(db)
+                checkpoint.last_user_id = after_user_id
+                checkpoint.users_processed += len(user_ids)
+                await db.commit()
+
+            elapsed = time.perf_counter() - started
+            logger.info("Alert batch: %d users in %.1fs (%.1f users/s)", users, elapsed, users / elapsed)
+
+        async with AsyncSessionLocal() as db:
+            checkpoint = await AlertBatchRunner._get_checkpoint(db)
+            checkpoint.last_user_id = None
+            checkpoint.completed_at = datetime.utcnow()
+            await db.commit()
+
+        elapsed = time.perf_counter() - started
+        return {
+            "users": users,
+            "failed": failed,
+            "resumed_after": resumed_after,
+            "seconds": round(elapsed, 3),
+            "users_per_second": round(users / elapsed, 1) if elapsed > 0 else 0.0
+        }
+
+class AlertBatchScheduler:
+    """Runs AlertBatchRunner every ALERT_BATCH_INTERVAL_SECONDS inside the API process.
+
+    The first run starts one interval after startup, so restarts do not
+    trigger a burst of all-user runs.
+    """
+
+    def __init__(self, interval_seconds: int):
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self.interval_seconds > 0 and self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def shutdown(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                report = await AlertBatchRunner.run()
+                logger.info(
+                    "Alert batch completed: %d users (%d failed) in %.1fs, %.1f users/s",
+                    report["users"], report["failed"], report["seconds"], report["users_per_second"]
+                )
+            except Exception:
+                logger.exception("Alert batch run failed")
+
+alert_batch_scheduler = AlertBatchScheduler(settings.ALERT_BATCH_INTERVAL_SECONDS)
@@ -1,244 +1,115 @@
 from typing import Optional, Dict, Any, List
-from datetime import datetime, timedelta
+from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func, or_
+from sqlalchemy import text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 import json
-from app.models import Alert, Goal, Budget, Transaction, User, RecurringCharge
-from app.schemas import AlertType
-from app.services.subscription_detector import SubscriptionDetector
+import uuid
+from app.models import Alert
+from app.services.alert_service import AlertService
+from app.services.dashboard_cache import data_versions
+from app.services.alert_hub import alert_hub
 
 class AlertGenerationService:
+    """Alert candidates and their bulk writer; the rules themselves live in alert_rules."""
+
     @staticmethod
-    async def create_alert_if_not_exists(
-        db: AsyncSession,
-        user_id: str,
+    def build_candidate(
         alert_type: str,
         title: str,
         description: str,
-        metadata: Optional[Dict[str, Any]] = None
-    ) -> Optional[Alert]:
-        """Create an alert if a similar unread one doesn't already exist"""
-
-        # Check for duplicate unread alert (same type, user, and title)
-        # Don't create duplicate if there's already an unread alert with same title
-        existing_query = select(Alert).where(
-            and_(
-                Alert.user_id == user_id,
-                Alert.type == alert_type,
-                Alert.title == title,  # Same title means same alert
-                Alert.is_read == False  # Only check unread alerts
-            )
-        )
-
-        result = await db.execute(existing_query)
-        if result.scalar():
-            return None  # Alert already exists and is unread
-
-        # Create new alert
-        alert = Alert(
-            user_id=user_id,
-            type=alert_type,
-            title=title,
-            description=description,
-            metadata_json=json.dumps(metadata) if metadata else None
-        )
-
-        db.add(alert)
-        await db.commit()
-        await db.refresh(alert)
-        return alert
+        metadata: Optional[Dict[str, Any]] = None,
+        dedup_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """An alert to create unless an unread one with the same dedup key exists.
+
+        The key defaults to type and title, the rule the generators have always used.
+        """
+        entity_type, entity_id = AlertService.entity_from_metadata(metadata)
+        return {
+            "type": alert_type,
+            "title": title,
+            "description": description,
+            "metadata_json": json.dumps(metadata) if metadata else None,
+            "dedup_key": dedup_key or f"{alert_type}:{title}",
+            "entity_type": entity_type,
+            "entity_id": entity_id
+        }
 
     @staticmethod
-    async def generate_goal_progress_alerts(
+    async def write_alerts(
         db: AsyncSession,
-        user_id: str
+        user_id: str,
+        candidates: List[Dict[str, Any]]
     ) -> List[Alert]:
-        """Generate alerts for goals that are 70% or more complete with completion forecasting"""
-        from app.services.goal_service import GoalService
+        """Insert candidates in one statement, skipping those with an unread duplicate.
 
-        created_alerts = []
+        The partial unique index over unread (user_id, dedup_key) makes the
+        database do the duplicate check; only newly created alerts are
+        returned, and the run commits once.
+        """
+        if not candidates:
+            return []
 
-        # Get all active goals for the user
-        goals_query = select(Goal).where(
-            and_(
-                Goal.user_id == user_id,
-                Goal.is_active == True
+        now = datetime.utcnow()
+        rows = {}
+        for candidate in candidates:
+            # Later candidates with the same key in one run are dropped like stored ones
+            rows.setdefault(candidate["dedup_key"], {
+                **candidate,
+                "id": str(uuid.uuid4()),
+                "user_id": user_id,
+                "is_read": False,
+                "created_at": now
+            })
+
+        statement = (
+            sqlite_insert(Alert)
+            .values(list(rows.values()))
+            .on_conflict_do_nothing(
+                index_elements=["user_id", "dedup_key"],
+                index_where=text("is_read = 0 AND dedup_key IS NOT NULL")
             )
+            .returning(Alert)
         )
-        result = await db.execute(goals_query)
-        goals = result.scalars().all()
-
-        for goal in goals:
-            # Calculate progress
-            if goal.target_amount <= 0:
-                continue
-
-            progress = goal.current_amount / goal.target_amount
-            progress_percent = int(progress * 100)
-
-            # Generate alert if progress is between 70% and 100%
-            if 0.7 <= progress < 1.0:
-                remaining = goal.target_amount - goal.current_amount
-
-                # Calculate projected completion date
-                projected_date = await GoalService.project_goal_completion(db, goal, user_id)
-
-                if projected_date:
-                    days_to_completion = (projected_date - datetime.utcnow()).days
-                    forecast_message = (
-                        f" Based on your saving patterns, you're on track to reach this goal in "
-                        f"approximately {days_to_completion} days ({projected_date.strftime('%B %d, %Y')}). "
-                        f"Keep going!"
-                    )
-                else:
-                    # Calculate how much they need to save per month
-                    days_until_deadline = (goal.deadline - datetime.utcnow()).days
-                    if days_until_deadline > 0:
-                        monthly_needed = (remaining / days_until_deadline) * 30
-                        forecast_message = (
-                            f" To meet your deadline, you'll need to save approximately "
-                            f"${monthly_needed:.2f} per month."
-                        )
-                    else:
-                        forecast_message = " Your deadline has passed, but don't give up!"
-
-                alert = await AlertGenerationService.create_alert_if_not_exists(
-                    db,
-                    user_id=user_id,
-                    alert_type="GOAL_PROGRESS",
-                    title=f"Goal Progress: {goal.name}",
-                    description=(
-                        f"Great progress! You're {progress_percent}% of the way to your "
-                        f"{goal.name} goal. Only ${remaining:.2f} left to save!{forecast_message}"
-                    ),
-                    metadata={
-                        "goal_id": goal.id,
-                        "goal_name": goal.name,
-                        "current_amount": goal.current_amount,
-                        "target_amount": goal.target_amount,
-                        "progress_percentage": progress_percent,
-                        "projected_completion_date": projected_date.isoformat() if projected_date else None
-                    }
-                )
-
-                if alert:
-                    created_alerts.append(alert)
+        result = await db.execute(statement)
+        created = list(result.scalars().all())
 
-            # Generate completion alert if goal is 100% or more complete
-            elif progress >= 1.0:
-                alert = await AlertGenerationService.create_alert_if_not_exists(
-                    db,
-                    user_id=user_id,
-                    alert_type="GOAL_PROGRESS",
-                    title=f"Goal Complete: {goal.name}",
-                    description=(
-                        f"Congratulations! You've reached your {goal.name} goal "
-                        f"of ${goal.target_amount:.2f}!"
-                    ),
-                    metadata={
-                        "goal_id": goal.id,
-                        "goal_name": goal.name,
-                        "current_amount": goal.current_amount,
-                        "target_amount": goal.target_amount,
-                        "progress_percentage": 100
-                    }
-                )
-
-                if alert:
-                    created_alerts.append(alert)
-
-            # Check for deadline alerts
-            if goal.deadline:
-                time_until_deadline = goal.deadline - datetime.utcnow()
-                days_until_deadline = time_until_deadline.days
-                hours_until_deadline = time_until_deadline.total_seconds() / 3600
-
-                # Alert for expired goals
-                if time_until_deadline.total_seconds() < 0:
-                    alert = await AlertGenerationService.create_alert_if_not_exists(
-                        db,
-                        user_id=user_id,
-                        alert_type="GOAL_PROGRESS",
-                        title=f"Goal Deadline Passed: {goal.name}",
-                        description=(
-                            f"Your deadline for {goal.name} has passed. You had saved "
-                            f"${goal.current_amount:.2f} out of ${goal.target_amount:.2f} "
-                            f"({progress_percent}%). Consider setting a new deadline or adjusting your goal."
-                        ),
-                        metadata={
-                            "goal_id": goal.id,
-                            "goal_name": goal.name,
-                            "current_amount": goal.current_amount,
-                            "target_amount": goal.target_amount,
-                            "progress_percentage": progress_percent,
-                            "days_overdue": abs(days_until_deadline),
-                            "deadline_status": "expired"
-                        }
-                    )
-                    if alert:
-                        created_alerts.append(alert)
-
-                # Alert for goals with deadline in less than 24 hours
-                elif 0 < hours_until_deadline <= 24:
-                    remaining = goal.target_amount - goal.current_amount
-                    hours_left = int(hours_until_deadline)
+        if created:
+            await AlertService.adjust_unread_count(db, user_id, len(created))
+            data_versions.mark_changed(db, user_id)
+        await db.commit()
+        alert_hub.publish(user_id, created)
+        return created
 
-                    alert = await AlertGenerationService.create_alert_if_not_exists(
-                        db,
-                        user_id=user_id,
-                        alert_type="GOAL_PROGRESS",
-                        title=f"⚠️ URGENT: {goal.name} Deadline in {hours_left} hours!",
-                        description=(
-                            f"Only {hours_left} hour{'s' if hours_left != 1 else ''} left "
-                            f"to reach your {goal.name} goal! You still need ${remaining:.2f} "
-                            f"to meet your target of ${goal.target_amount:.2f}. "
-                            f"This is your final warning!"
-                        ),
-                        metadata={
-                            "goal_id": goal.id,
-                            "goal_name": goal.name,
-                            "current_amount": goal.current_amount,
-                            "target_amount": goal.target_amount,
-                            "progress_percentage": progress_percent,
-                            "hours_until_deadline": hours_left,
-                            "amount_needed": remaining,
-                            "deadline_status": "critical"
-                        }
-                    )
-                    if alert:
-                        created_alerts.append(alert)
+    @staticmethod
+    def backfill_dedup_keys(connection):
+        """Key the newest unread alert per (user, type, title) when upgrading an existing database."""
+        connection.execute(text(
+            "UPDATE alerts SET dedup_key = type || ':' || title "
+            "WHERE rowid IN (SELECT max(rowid) FROM alerts WHERE is_read = 0 GROUP BY user_id, type, title)"
+        ))
 
-                # Alert for goals with deadline in 7 days or less (but more than 24 hours)
-                elif days_until_deadline <= 7:
-                    remaining = goal.target_amount - goal.current_amount
-                    daily_needed = remaining / max(days_until_deadline, 1)
+    @staticmethod
+    async def create_alert_if_not_exists(
+        db: AsyncSession,
+        user_id: str,
+        alert_type: str,
+        title: str,
+        description: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Optional[Alert]:
+        """Create an alert if a similar unread one doesn't already exist"""
+        created = await AlertGenerationService.write_alerts(
+            db, user_id, [AlertGenerationService.build_candidate(alert_type, title, description, metadata)]
+        )
+        return created[0] if created else None
 
-                    alert = await AlertGenerationService.create_alert_if_not_exists(
-                        db,
-                        user_id=user_id,
-                        alert_type="GOAL_PROGRESS",
-                        title=f"Goal Deadline Approaching: {goal.name}",
-                        description=(
-                            f"Only {days_until_deadline} day{'s' if days_until_deadline != 1 else ''} left "
-                            f"to reach your {goal.name} goal! You need to save ${remaining:.2f} more "
-                            f"(${daily_needed:.2f} per day) to meet your deadline."
-                        ),
-                        metadata={
-                            "goal_id": goal.id,
-                            "goal_name": goal.name,
-                            "current_amount": goal.current_amount,
-                            "target_amount": goal.target_amount,
-                            "progress_percentage": progress_percent,
-                            "days_until_deadline": days_until_deadline,
-                            "amount_needed": remaining,
-                            "daily_amount_needed": daily_needed,
-                            "deadline_status": "approaching"
-                        }
-                    )
-                    if alert:
-                        created_alerts.append(alert)
+    @staticmethod
+    async def generate_goal_progress_alerts(db: AsyncSession, user_id: str) -> List[Alert]:
+        from app.services.alert_rules import AlertRuleEngine
 
-        return created_alerts
+        return (await AlertRuleEngine.run(db, user_id, ["goal"]))["goal"]
 
     @staticmethod
     async def generate_budget_overspending_alerts(
@@ -246,130 +117,9 @@ class AlertGenerationService:
         user_id: str,
         month: Optional[datetime] = None
     ) -> List[Alert]:
-        """Generate alerts for budgets that are 80% spent or exceeded"""
-
-        created_alerts = []
-
-        # Determine month to check
-        if not month:
-            month = datetime.utcnow()
-
-        # Get start and end of month
-        month_start = month.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        if month.month == 12:
-            month_end = month.replace(year=month.year + 1, month=1, day=1) - timedelta(seconds=1)
-        else:
-            month_end = month.replace(month=month.month + 1, day=1) - timedelta(seconds=1)
-
-        # Calculate how far through the month we are
-        days_in_month = (month_end - month_start).days + 1
-        days_elapsed = (datetime.utcnow() - month_start).days + 1
-        month_progress_percent = (days_elapsed / days_in_month) * 100
-
-        # Get all active budgets for the user
-        budgets_query = select(Budget).where(
-            and_(
-                Budget.user_id == user_id,
-                Budget.is_active == True
-            )
-        )
-        result = await db.execute(budgets_query)
-        budgets = result.scalars().all()
+        from app.services.alert_rules import AlertRuleEngine
 
-        for budget in budgets:
-            # Calculate spending for this budget's category
-            if budget.category:
-                # Category-specific budget
-                spending_query = select(func.sum(Transaction.amount)).where(
-                    and_(
-                        Transaction.user_id == user_id,
-                        Transaction.category == budget.category,
-                        Transaction.transaction_type == 'expense',
-                        Transaction.date >= month_start,
-                        Transaction.date <= month_end
-                    )
-                )
-            else:
-                # Overall budget
-                spending_query = select(func.sum(Transaction.amount)).where(
-                    and_(
-                        Transaction.user_id == user_id,
-                        Transaction.transaction_type == 'expense',
-                        Transaction.date >= month_start,
-                        Transaction.date <= month_end
-                    )
-                )
-
-            result = await db.execute(spending_query)
-            spent_amount = result.scalar() or 0.0
-
-            # Calculate budget usage percentage
-            budget_usage_percent = (spent_amount / budget.amount_monthly * 100) if budget.amount_monthly > 0 else 0
-            category_name = budget.category or "Overall"
-
-            # Check if budget is exceeded
-            if spent_amount > budget.amount_monthly:
-                overspend = spent_amount - budget.amount_monthly
-                percent_over = int((spent_amount / budget.amount_monthly - 1) * 100)
-
-                alert = await AlertGenerationService.create_alert_if_not_exists(
-                    db,
-                    user_id=user_id,
-                    alert_type="BUDGET_WARNING",
-                    title=f"Budget Exceeded: {category_name}",
-                    description=(
-                        f"You've spent ${spent_amount:.2f} in {category_name} this month, "
-                        f"which is ${overspend:.2f} over your ${budget.amount_monthly:.2f} budget "
-                        f"({percent_over}% over)."
-                    ),
-                    metadata={
-                        "budget_id": budget.id,
-                        "category": budget.category,
-                        "budgeted_amount": budget.amount_monthly,
-                        "spent_amount": spent_amount,
-                        "overspend_amount": overspend,
-                        "severity": "high",
-                        "month": month.strftime("%Y-%m")
-                    }
-                )
-
-                if alert:
-                    created_alerts.append(alert)
-
-            # Check if budget is 80% spent and we're only halfway through the month or less
-            elif budget_usage_percent >= 80 and month_progress_percent <= 60:
-                remaining = budget.amount_monthly - spent_amount
-                days_left = days_in_month - days_elapsed
-                daily_budget_remaining = remaining / days_left if days_left > 0 else 0
-
-                alert = await AlertGenerationService.create_alert_if_not_exists(
-                    db,
-                    user_id=user_id,
-                    alert_type="BUDGET_WARNING",
-                    title=f"Budget Alert: {category_name}",
-                    description=(
-                        f"Careful! You've spent ${spent_amount:.2f} ({int(budget_usage_percent)}%) "
-                        f"of your ${budget.amount_monthly:.2f} {category_name} budget, "
-                        f"but we're only {int(month_progress_percent)}% through the month. "
-                        f"You have ${remaining:.2f} left for the next {days_left} days "
-                        f"(about ${daily_budget_remaining:.2f}/day)."
-                    ),
-                    metadata={
-                        "budget_id": budget.id,
-                        "category": budget.category,
-                        "budgeted_amount": budget.amount_monthly,
-                        "spent_amount": spent_amount,
-                        "budget_usage_percent": budget_usage_percent,
-                        "month_progress_percent": month_progress_percent,
-                        "severity": "medium",
-                        "month": month.strftime("%Y-%m")
-                    }
-                )
-
-                if alert:
-                    created_alerts.append(alert)
-
-        return created_alerts
+        return (await AlertRuleEngine.run(db, user_id, ["budget"], month))["budget"]
 
     @staticmethod
     async def generate_anomaly_alerts(
@@ -377,226 +127,30 @@ class AlertGenerationService:
         user_id: str,
         month: Optional[datetime] = None
     ) -> List[Alert]:
-        """Generate alerts for unusual spending patterns (>40% above 3-month average)"""
-
-        created_alerts = []
-
-        # Determine current month
-        if not month:
-            month = datetime.utcnow()
-
-        current_month_start = month.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        if month.month == 12:
-            current_month_end = month.replace(year=month.year + 1, month=1, day=1) - timedelta(seconds=1)
-        else:
-            current_month_end = month.replace(month=month.month + 1, day=1) - timedelta(seconds=1)
-
-        # Calculate 3 months ago
-        three_months_ago = current_month_start - timedelta(days=90)
-
-        # Get distinct categories used by this user in recent months
-        categories_query = select(Transaction.category).distinct().where(
-            and_(
-                Transaction.user_id == user_id,
-                Transaction.transaction_type == 'expense',
-                Transaction.date >= three_months_ago,
-                Transaction.category.isnot(None)
-            )
-        )
-        result = await db.execute(categories_query)
-        categories = result.scalars().all()
-
-        for category in categories:
-            # Calculate current month spending
-            current_query = select(func.sum(Transaction.amount)).where(
-                and_(
-                    Transaction.user_id == user_id,
-                    Transaction.category == category,
-                    Transaction.transaction_type == 'expense',
-                    Transaction.date >= current_month_start,
-                    Transaction.date <= current_month_end
-                )
-            )
-            result = await db.execute(current_query)
-            current_spending = result.scalar() or 0.0
-
-            if current_spending == 0:
-                continue
-
-            # Calculate average of last 3 months (excluding current month)
-            last_3_months_end = current_month_start - timedelta(seconds=1)
-            last_3_months_start = last_3_months_end.replace(day=1) - timedelta(days=89)  # ~3 months
-
-            avg_query = select(func.avg(Transaction.amount)).where(
-                and_(
-                    Transaction.user_id == user_id,
-                    Transaction.category == category,
-                    Transaction.transaction_type == 'expense',
-                    Transaction.date >= last_3_months_start,
-                    Transaction.date <= last_3_months_end
-                )
-            )
-
-            # Get count of transactions for average calculation
-            count_query = select(func.count(Transaction.id)).where(
-                and_(
-                    Transaction.user_id == user_id,
-                    Transaction.category == category,
-                    Transaction.transaction_type == 'expense',
-                    Transaction.date >= last_3_months_start,
-                    Transaction.date <= last_3_months_end
-                )
-            )
-
-            avg_result = await db.execute(avg_query)
-            avg_transaction = avg_result.scalar() or 0.0
+        from app.services.alert_rules import AlertRuleEngine
 
-            count_result = await db.execute(count_query)
-            transaction_count = count_result.scalar() or 0
-
-            if transaction_count < 3:  # Need at least 3 transactions for meaningful average
-                continue
-
-            # Estimate monthly average (assuming similar transaction frequency)
-            monthly_avg = avg_transaction * (transaction_count / 3)  # Rough monthly estimate
-
-            # Check if current spending is anomalous (>40% above average)
-            if monthly_avg > 0 and current_spending > monthly_avg * 1.4:
-                percent_of_usual = int((current_spending / monthly_avg) * 100)
-
-                alert = await AlertGenerationService.create_alert_if_not_exists(
-                    db,
-                    user_id=user_id,
-                    alert_type="ANOMALY",
-                    title=f"Unusual Spending: {category}",
-                    description=(
-                        f"Your {category} spending this month (${current_spending:.2f}) "
-                        f"is {percent_of_usual}% of your usual amount. "
-                        f"This is significantly higher than your typical spending pattern."
-                    ),
-                    metadata={
-                        "category": category,
-                        "current_amount": current_spending,
-                        "average_amount": monthly_avg,
-                        "percent_of_usual": percent_of_usual,
-                        "month": month.strftime("%Y-%m")
-                    }
-                )
-
-                if alert:
-                    created_alerts.append(alert)
-
-        return created_alerts
+        return (await AlertRuleEngine.run(db, user_id, ["anomaly"], month))["anomaly"]
 
     @staticmethod
-    async def generate_subscription_alerts(
-        db: AsyncSession,
-        user_id: str
-    ) -> List[Alert]:
-        """Generate alerts for upcoming subscription payments and gray charges"""
-
-        created_alerts = []
-        now = datetime.utcnow()
+    async def generate_subscription_alerts(db: AsyncSession, user_id: str) -> List[Alert]:
+        from app.services.alert_rules import AlertRuleEngine
 
-        # Get all recurring charges
-        recurring_charges = await SubscriptionDetector.get_all_recurring(db)
-
-        # Filter charges for this user (based on transactions)
-        user_transactions = await db.execute(
-            select(Transaction.merchant).distinct().where(
-                Transaction.user_id == user_id
-            )
-        )
-        user_merchants = set(user_transactions.scalars().all())
-
-        # Check for upcoming payments (within 3 days)
-        for charge in recurring_charges:
-            if charge.merchant not in user_merchants:
-                continue
-
-            days_until_charge = (charge.next_expected_date - now).days
-
-            # Alert for upcoming payments (within 3 days)
-            if 0 <= days_until_charge <= 3:
-                alert = await AlertGenerationService.create_alert_if_not_exists(
-                    db,
-                    user_id=user_id,
-                    alert_type="SUBSCRIPTION_REMINDER",
-                    title=f"Upcoming Payment: {charge.merchant}",
-                    description=(
-                        f"You have a recurring payment of ${charge.average_amount:.2f} "
-                        f"from {charge.merchant} coming up in {days_until_charge} day(s). "
-                        f"Expected on {charge.next_expected_date.strftime('%B %d, %Y')}."
-                    ),
-                    metadata={
-                        "merchant": charge.merchant,
-                        "amount": charge.average_amount,
-                        "next_charge_date": charge.next_expected_date.isoformat(),
-                        "frequency_days": charge.frequency_days,
-                        "confidence_score": charge.confidence_score
-                    }
-                )
-
-                if alert:
-                    created_alerts.append(alert)
-
-        # Generate gray charge alerts
-        gray_charges = await SubscriptionDetector.identify_gray_charges(db)
-
-        for gray_charge in gray_charges:
-            if gray_charge['merchant'] not in user_merchants:
-                continue
-
-            # Only alert for high-confidence gray charges
-            if gray_charge['confidence_score'] > 0.7:
-                reasons_text = ". ".join(gray_charge['reasons']) if gray_charge['reasons'] else "Potentially forgotten subscription"
-
-                alert = await AlertGenerationService.create_alert_if_not_exists(
-                    db,
-                    user_id=user_id,
-                    alert_type="GRAY_CHARGE",
-                    title=f"Review Subscription: {gray_charge['merchant']}",
-                    description=(
-                        f"You have a recurring charge of ${gray_charge['average_amount']:.2f} "
-                        f"from {gray_charge['merchant']} every {gray_charge['frequency_days']} days. "
-                        f"{reasons_text}. Consider reviewing if you still need this subscription."
-                    ),
-                    metadata={
-                        "merchant": gray_charge['merchant'],
-                        "amount": gray_charge['average_amount'],
-                        "frequency_days": gray_charge['frequency_days'],
-                        "reasons": gray_charge['reasons'],
-                        "confidence_score": gray_charge['confidence_score'],
-                        "last_charge_date": gray_charge['last_charge_date'].isoformat() if gray_charge['last_charge_date'] else None
-                    }
-                )
-
-                if alert:
-                    created_alerts.append(alert)
-
-        return created_alerts
+        return (await AlertRuleEngine.run(db, user_id, ["subscription"]))["subscription"]
 
     @staticmethod
     async def generate_all_alerts_for_user(
         db: AsyncSession,
         user_id: str,
         month: Optional[datetime] = None
-    ) -> Dict[str, List[Alert]]:
-        """Generate all types of alerts for a user"""
-
-        if not month:
-            month = datetime.utcnow()
-
-        # Generate all alert types
-        goal_alerts = await AlertGenerationService.generate_goal_progress_alerts(db, user_id)
-        budget_alerts = await AlertGenerationService.generate_budget_overspending_alerts(db, user_id, month)
-        anomaly_alerts = await AlertGenerationService.generate_anomaly_alerts(db, user_id, month)
-        subscription_alerts = await AlertGenerationService.generate_subscription_alerts(db, user_id)
+    ) -> Dict[str, Any]:
+        """Generate all types of alerts for a user, written in one statement and commit"""
+        from app.services.alert_rules import AlertRuleEngine
 
+        results = await AlertRuleEngine.run(db, user_id, now=month)
         return {
-            "goal_progress": goal_alerts,
-            "budget_overspending": budget_alerts,
-            "anomalies": anomaly_alerts,
-            "subscriptions": subscription_alerts,
-            "total": len(goal_alerts) + len(budget_alerts) + len(anomaly_alerts) + len(subscription_alerts)
-        }
\ No newline at end of file
+            "goal_progress": results["goal"],
+            "budget_overspending": results["budget"],
+            "anomalies": results["anomaly"],
+            "subscriptions": results["subscription"],
+            "total": sum(len(alerts) for alerts in results.values())
+        }
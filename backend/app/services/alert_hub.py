@@ -0,0 +1,71 @@
+import asyncio
+import json
+from typing import Any, Dict, Iterable, Set
+from app.config import settings
+from app.models import Alert
+
+class AlertHub:
+    """In-process publish/subscribe of new alerts, one set of queues per user.
+
+    Every open stream holds a bounded queue; publishing is a non-blocking
+    put into the queues of that user's streams, and a stream that falls
+    behind loses its oldest events rather than holding back the writer.
+    Idle subscribers cost a queue and a parked task, nothing else.
+    Only alerts written by this process are delivered.
+    """
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue):
+        queues = self._subscribers.get(user_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[user_id]
+
+    def publish(self, user_id: str, alerts: Iterable[Alert]):
+        queues = self._subscribers.get(user_id)
+        if not queues:
+            return
+
+        for alert in alerts:
+            event = AlertHub.alert_event(alert)
+            for queue in queues:
+                if queue.full():
+                    queue.get_nowait()
+                queue.put_nowait(event)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "users": len(self._subscribers),
+            "subscribers": sum(len(queues) for queues in self._subscribers.values())
+        }
+
+    @staticmethod
+    def alert_event(alert: Alert) -> str:
+        """An alert as a server-sent `alert` event, shaped like AlertResponse."""
+        try:
+            metadata = json.loads(alert.metadata_json) if alert.metadata_json else None
+        except ValueError:
+            metadata = None
+        data: Dict[str, Any] = {
+            "id": alert.id,
+            "user_id": alert.user_id,
+            "type": alert.type,
+            "title": alert.title,
+            "description": alert.description,
+            "metadata": metadata,
+            "is_read": bool(alert.is_read),
+            "created_at": alert.created_at.isoformat() if alert.created_at else None
+        }
+        return f"id: {alert.id}\nevent: alert\ndata: {json.dumps(data)}\n\n"
+
+alert_hub = AlertHub(settings.ALERT_STREAM_QUEUE_SIZE)
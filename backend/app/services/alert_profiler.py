@@ -0,0 +1,58 @@
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+from sqlalchemy import event
+from app.database import engine
+
+logger = logging.getLogger(__name__)
+
+_active_section: ContextVar[Optional[Dict[str, Any]]] = ContextVar('alert_profile_section', default=None)
+
+class AlertRunProfile:
+    """Wall time, SQL statements, rows read and candidates per step of an alert run.
+
+    Steps are the snapshot queries, each rule and the final write. Statements
+    are counted by an engine listener for whichever step is active in the
+    current context, so concurrent runs never share counts.
+    """
+
+    def __init__(self, user_id: str, dry_run: bool = False):
+        self.user_id = user_id
+        self.dry_run = dry_run
+        self.steps: List[Dict[str, Any]] = []
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def step(self, name: str, kind: str):
+        stats = {"name": name, "kind": kind, "wall_ms": 0.0, "statements": 0, "rows_read": 0, "candidates": 0}
+        token = _active_section.set(stats)
+        started = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            stats["wall_ms"] = round((time.perf_counter() - started) * 1000, 3)
+            _active_section.reset(token)
+            self.steps.append(stats)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "user_id": self.user_id,
+            "dry_run": self.dry_run,
+            "wall_ms": round((time.perf_counter() - self._started) * 1000, 3),
+            "statements": sum(step["statements"] for step in self.steps),
+            "rows_read": sum(step["rows_read"] for step in self.steps),
+            "candidates": sum(step["candidates"] for step in self.steps),
+            "steps": self.steps
+        }
+
+    def log(self):
+        logger.info("alert_run_profile %s", json.dumps(self.to_dict()))
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    stats = _active_section.get()
+    if stats is not None:
+        stats["statements"] += 1
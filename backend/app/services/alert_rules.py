@@ -0,0 +1,573 @@
+import calendar
+import json
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_
+from app.config import settings
+from app.models import Alert, Budget, Goal, MonthlyRollup, RecurringCharge
+from app.schemas import AlertType
+from app.services.alert_generation_service import AlertGenerationService
+from app.services.alert_profiler import AlertRunProfile
+from app.services.goal_service import GoalService
+from app.services.rollup_service import RollupService
+from app.services.subscription_detector import SubscriptionDetector
+
+ANOMALY_LOOKBACK_MONTHS = 3
+RECENT_ALERT_DAYS = 30
+
+class AlertSnapshot:
+    """Everything the alert rules read for one user, loaded up front."""
+
+    def __init__(
+        self,
+        user_id: str,
+        now: datetime,
+        month_totals: Dict[str, Dict[str, Tuple[float, int]]],
+        budgets: List[Budget],
+        goals: List[Goal],
+        recurring_charges: List[RecurringCharge],
+        recent_alerts: List[Tuple[str, str, str, datetime]],
+        monthly_savings: float
+    ):
+        self.user_id = user_id
+        self.now = now
+        self.current_month = RollupService.month_key(now)
+        self.month_totals = month_totals  # month -> category -> (expense total, transaction count)
+        self.budgets = budgets
+        self.goals = goals
+        self.recurring_charges = recurring_charges
+        self.recent_alerts = recent_alerts  # (type, entity_type, entity_id, created_at)
+        self.monthly_savings = monthly_savings
+
+    def category_totals(self, start_month: str, end_month: str) -> Dict[str, Tuple[float, int]]:
+        """Expense total and count per category over an inclusive month range."""
+        totals: Dict[str, List[float]] = defaultdict(lambda: [0.0, 0])
+        for month, categories in self.month_totals.items():
+            if start_month <= month <= end_month:
+                for category, (total, count) in categories.items():
+                    totals[category][0] += total
+                    totals[category][1] += count
+        return {category: (total, int(count)) for category, (total, count) in totals.items()}
+
+    def month_spending(self, month: str) -> Dict[Optional[str], float]:
+        """Expense total per category for one month, with the overall total under None."""
+        spending: Dict[Optional[str], float] = {None: 0.0}
+        for category, (total, _) in self.month_totals.get(month, {}).items():
+            spending[category] = total
+            spending[None] += total
+        return spending
+
+    def alerted_entities(self, alert_type: str, entity_type: str, days: int) -> Set[str]:
+        """Ids of entities that got an alert of this type in the last `days` days."""
+        since = self.now - timedelta(days=days)
+        return {
+            entity_id
+            for type_, entity_type_, entity_id, created_at in self.recent_alerts
+            if type_ == alert_type and entity_type_ == entity_type and created_at >= since
+        }
+
+Rule = Callable[[AlertSnapshot], List[Dict[str, Any]]]
+
+# name -> (group, rule); groups are the alert families reported to callers
+RULES: Dict[str, Tuple[str, Rule]] = {}
+
+def alert_rule(name: str, group: str):
+    """Register a rule; it receives the snapshot and returns alert candidates."""
+    def register(rule: Rule) -> Rule:
+        RULES[name] = (group, rule)
+        return rule
+    return register
+
+class AlertRuleEngine:
+    """Evaluates every registered alert rule against one per-user snapshot.
+
+    The snapshot takes a fixed number of queries however many budgets,
+    goals or categories the user has, and the candidates are written in a
+    single insert, so adding a rule costs no extra I/O.
+    """
+
+    @staticmethod
+    async def load_snapshot(
+        db: AsyncSession,
+        user_id: str,
+        now: Optional[datetime] = None,
+        profile: Optional[AlertRunProfile] = None
+    ) -> AlertSnapshot:
+        now = now or datetime.utcnow()
+        current_month = RollupService.month_key(now)
+        profile = profile or AlertRunProfile(user_id)
+
+        with profile.step("monthly_totals", "snapshot") as stats:
+            rollup_result = await db.execute(
+                select(MonthlyRollup.month, MonthlyRollup.category, MonthlyRollup.total_amount, MonthlyRollup.transaction_count)
+                .where(and_(
+                    MonthlyRollup.user_id == user_id,
+                    MonthlyRollup.transaction_type == 'expense',
+                    MonthlyRollup.month >= RollupService.shift_month(current_month, -ANOMALY_LOOKBACK_MONTHS),
+                    MonthlyRollup.month <= current_month
+                ))
+            )
+            month_totals: Dict[str, Dict[str, Tuple[float, int]]] = defaultdict(dict)
+            for month, category, total, count in rollup_result:
+                month_totals[month][category] = (total, count)
+                stats["rows_read"] += 1
+
+        with profile.step("budgets", "snapshot") as stats:
+            budget_result = await db.execute(
+                select(Budget).where(and_(Budget.user_id == user_id, Budget.is_active == True))
+            )
+            budgets = budget_result.scalars().all()
+            stats["rows_read"] = len(budgets)
+
+        with profile.step("goals", "snapshot") as stats:
+            goal_result = await db.execute(
+                select(Goal).where(and_(Goal.user_id == user_id, Goal.is_active == True))
+            )
+            goals = goal_result.scalars().all()
+            stats["rows_read"] = len(goals)
+
+        with profile.step("recurring_charges", "snapshot") as stats:
+            recurring_charges = await SubscriptionDetector.get_all_recurring(db, user_id)
+            stats["rows_read"] = len(recurring_charges)
+
+        with profile.step("recent_alerts", "snapshot") as stats:
+            alert_result = await db.execute(
+                select(Alert.type, Alert.entity_type, Alert.entity_id, Alert.created_at)
+                .where(and_(
+                    Alert.user_id == user_id,
+                    Alert.entity_type.isnot(None),
+                    Alert.created_at >= now - timedelta(days=RECENT_ALERT_DAYS)
+                ))
+            )
+            recent_alerts = [tuple(row) for row in alert_result]
+            stats["rows_read"] = len(recent_alerts)
+
+        with profile.step("savings_rate", "snapshot") as stats:
+            monthly_savings = await GoalService.calculate_savings_rate(db, user_id)
+            stats["rows_read"] = stats["statements"]  # one aggregate row, none when memoized earlier
+
+        return AlertSnapshot(
+            user_id=user_id,
+            now=now,
+            month_totals=dict(month_totals),
+            budgets=budgets,
+            goals=goals,
+            recurring_charges=recurring_charges,
+            recent_alerts=recent_alerts,
+            monthly_savings=monthly_savings
+        )
+
+    @staticmethod
+    def evaluate(
+        snapshot: AlertSnapshot,
+        groups: Optional[List[str]] = None,
+        profile: Optional[AlertRunProfile] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Candidates per rule, for every rule or only those in the given groups."""
+        profile = profile or AlertRunProfile(snapshot.user_id)
+        candidates = {}
+        for name, (group, rule) in RULES.items():
+            if groups is None or group in groups:
+                with profile.step(name, "rule") as stats:
+                    candidates[name] = rule(snapshot)
+                    stats["candidates"] = len(candidates[name])
+        return candidates
+
+    @staticmethod
+    async def run(
+        db: AsyncSession,
+        user_id: str,
+        groups: Optional[List[str]] = None,
+        now: Optional[datetime] = None
+    ) -> Dict[str, List[Alert]]:
+        """Load the snapshot, evaluate the rules and write new alerts with one commit.
+
+        Returns the created alerts per group. With ALERT_PROFILE_LOGGING on,
+        the run's per-step profile is logged as one JSON line.
+        """
+        profile = AlertRunProfile(user_id)
+        snapshot = await AlertRuleEngine.load_snapshot(db, user_id, now, profile)
+        candidates = AlertRuleEngine.evaluate(snapshot, groups, profile)
+        with profile.step("write_alerts", "write"):
+            created = await AlertGenerationService.write_alerts(
+                db, user_id, [candidate for rule_candidates in candidates.values() for candidate in rule_candidates]
+            )
+        if settings.ALERT_PROFILE_LOGGING:
+            profile.log()
+
+        # Attribute the created alerts back to the rules that proposed them
+        created_by_key = {alert.dedup_key: alert for alert in created}
+        results: Dict[str, List[Alert]] = {
+            group: [] for group in (groups or dict.fromkeys(group for group, _ in RULES.values()))
+        }
+        for name, rule_candidates in candidates.items():
+            for candidate in rule_candidates:
+                alert = created_by_key.pop(candidate["dedup_key"], None)
+                if alert:
+                    results[RULES[name][0]].append(alert)
+        return results
+
+    @staticmethod
+    async def dry_run(
+        db: AsyncSession,
+        user_id: str,
+        groups: Optional[List[str]] = None,
+        now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Evaluate the rules without writing anything.
+
+        Returns the run profile with the candidate alerts of each rule.
+        """
+        profile = AlertRunProfile(user_id, dry_run=True)
+        snapshot = await AlertRuleEngine.load_snapshot(db, user_id, now, profile)
+        candidates = AlertRuleEngine.evaluate(snapshot, groups, profile)
+        return {
+            **profile.to_dict(),
+            "alerts": {
+                name: [
+                    {
+                        "type": candidate["type"],
+                        "title": candidate["title"],
+                        "description": candidate["description"],
+                        "metadata": json.loads(candidate["metadata_json"]) if candidate["metadata_json"] else None,
+                        "dedup_key": candidate["dedup_key"]
+                    }
+                    for candidate in rule_candidates
+                ]
+                for name, rule_candidates in candidates.items()
+            }
+        }
+
+@alert_rule("category_anomaly", group="anomaly")
+def category_anomaly_rule(snapshot: AlertSnapshot) -> List[Dict[str, Any]]:
+    """Categories spending more than 40% above their monthly average of the previous three months."""
+    candidates = []
+    current_totals = snapshot.category_totals(snapshot.current_month, snapshot.current_month)
+    previous_totals = snapshot.category_totals(
+        RollupService.shift_month(snapshot.current_month, -ANOMALY_LOOKBACK_MONTHS),
+        RollupService.shift_month(snapshot.current_month, -1)
+    )
+
+    for category, (current_spending, _) in current_totals.items():
+        if current_spending == 0:
+            continue
+
+        total_spent, transaction_count = previous_totals.get(category, (0.0, 0))
+        if transaction_count < 3:  # Need at least 3 transactions for meaningful average
+            continue
+
+        monthly_avg = total_spent / ANOMALY_LOOKBACK_MONTHS
+        if monthly_avg > 0 and current_spending > monthly_avg * 1.4:
+            percent_of_usual = int((current_spending / monthly_avg) * 100)
+            candidates.append(AlertGenerationService.build_candidate(
+                alert_type="ANOMALY",
+                title=f"Unusual Spending: {category}",
+                description=(
+                    f"Your {category} spending this month (${current_spending:.2f}) "
+                    f"is {percent_of_usual}% of your usual amount. "
+                    f"This is significantly higher than your typical spending pattern."
+                ),
+                metadata={
+                    "category": category,
+                    "current_amount": current_spending,
+                    "average_amount": monthly_avg,
+                    "percent_of_usual": percent_of_usual,
+                    "month": snapshot.current_month
+                }
+            ))
+
+    return candidates
+
+@alert_rule("budget_usage", group="budget")
+def budget_usage_rule(snapshot: AlertSnapshot) -> List[Dict[str, Any]]:
+    """Budgets that are exceeded, 80% spent early in the month, or 90% spent."""
+    candidates = []
+    now = snapshot.now
+    days_in_month = calendar.monthrange(now.year, now.month)[1]
+    days_elapsed = now.day
+    month_progress_percent = (days_elapsed / days_in_month) * 100
+
+    spending = snapshot.month_spending(snapshot.current_month)
+    recently_warned = snapshot.alerted_entities(AlertType.BUDGET_WARNING, 'budget', days=7)
+
+    for budget in snapshot.budgets:
+        spent_amount = spending.get(budget.category or None, 0.0)
+        budget_usage_percent = (spent_amount / budget.amount_monthly * 100) if budget.amount_monthly > 0 else 0
+        category_name = budget.category or "Overall"
+
+        if spent_amount > budget.amount_monthly:
+            overspend = spent_amount - budget.amount_monthly
+            percent_over = int((spent_amount / budget.amount_monthly - 1) * 100)
+            candidates.append(AlertGenerationService.build_candidate(
+                alert_type="BUDGET_WARNING",
+                title=f"Budget Exceeded: {category_name}",
+                description=(
+                    f"You've spent ${spent_amount:.2f} in {category_name} this month, "
+                    f"which is ${overspend:.2f} over your ${budget.amount_monthly:.2f} budget "
+                    f"({percent_over}% over)."
+                ),
+                metadata={
+                    "budget_id": budget.id,
+                    "category": budget.category,
+                    "budgeted_amount": budget.amount_monthly,
+                    "spent_amount": spent_amount,
+                    "overspend_amount": overspend,
+                    "severity": "high",
+                    "month": snapshot.current_month
+                }
+            ))
+
+        elif budget_usage_percent >= 80 and month_progress_percent <= 60:
+            remaining = budget.amount_monthly - spent_amount
+            days_left = days_in_month - days_elapsed
+            daily_budget_remaining = remaining / days_left if days_left > 0 else 0
+            candidates.append(AlertGenerationService.build_candidate(
+                alert_type="BUDGET_WARNING",
+                title=f"Budget Alert: {category_name}",
+                description=(
+                    f"Careful! You've spent ${spent_amount:.2f} ({int(budget_usage_percent)}%) "
+                    f"of your ${budget.amount_monthly:.2f} {category_name} budget, "
+                    f"but we're only {int(month_progress_percent)}% through the month. "
+                    f"You have ${remaining:.2f} left for the next {days_left} days "
+                    f"(about ${daily_budget_remaining:.2f}/day)."
+                ),
+                metadata={
+                    "budget_id": budget.id,
+                    "category": budget.category,
+                    "budgeted_amount": budget.amount_monthly,
+                    "spent_amount": spent_amount,
+                    "budget_usage_percent": budget_usage_percent,
+                    "month_progress_percent": month_progress_percent,
+                    "severity": "medium",
+                    "month": snapshot.current_month
+                }
+            ))
+
+        elif budget_usage_percent >= 90 and str(budget.id) not in recently_warned:
+            candidates.append(AlertGenerationService.build_candidate(
+                alert_type="BUDGET_WARNING",
+                title=f"Budget warning for {category_name}",
+                description=(
+                    f"You've used {budget_usage_percent:.1f}% of your {category_name} budget "
+                    f"(${spent_amount:.2f} of ${budget.amount_monthly:.2f})"
+                ),
+                metadata={
+                    "budget_id": budget.id,
+                    "category": budget.category,
+                    "spent_amount": spent_amount,
+                    "budgeted_amount": budget.amount_monthly,
+                    "percent_used": budget_usage_percent
+                }
+            ))
+
+    return candidates
+
+@alert_rule("goal_progress", group="goal")
+def goal_progress_rule(snapshot: AlertSnapshot) -> List[Dict[str, Any]]:
+    """Goals that are 70% or more complete, with a completion forecast, and completed goals."""
+    candidates = []
+    goals = [goal for goal in snapshot.goals if goal.target_amount > 0]
+    projected_dates = GoalService.project_completion_dates(goals, snapshot.monthly_savings, snapshot.now)
+
+    for goal, projected_date in zip(goals, projected_dates):
+        progress = goal.current_amount / goal.target_amount
+        progress_percent = int(progress * 100)
+
+        if 0.7 <= progress < 1.0:
+            remaining = goal.target_amount - goal.current_amount
+
+            if projected_date:
+                days_to_completion = (projected_date - snapshot.now).days
+                forecast_message = (
+                    f" Based on your saving patterns, you're on track to reach this goal in "
+                    f"approximately {days_to_completion} days ({projected_date.strftime('%B %d, %Y')}). "
+                    f"Keep going!"
+                )
+            else:
+                # Calculate how much they need to save per month
+                days_until_deadline = (goal.deadline - snapshot.now).days
+                if days_until_deadline > 0:
+                    monthly_needed = (remaining / days_until_deadline) * 30
+                    forecast_message = (
+                        f" To meet your deadline, you'll need to save approximately "
+                        f"${monthly_needed:.2f} per month."
+                    )
+                else:
+                    forecast_message = " Your deadline has passed, but don't give up!"
+
+            candidates.append(AlertGenerationService.build_candidate(
+                alert_type="GOAL_PROGRESS",
+                title=f"Goal Progress: {goal.name}",
+                description=(
+                    f"Great progress! You're {progress_percent}% of the way to your "
+                    f"{goal.name} goal. Only ${remaining:.2f} left to save!{forecast_message}"
+                ),
+                metadata={
+                    "goal_id": goal.id,
+                    "goal_name": goal.name,
+                    "current_amount": goal.current_amount,
+                    "target_amount": goal.target_amount,
+                    "progress_percentage": progress_percent,
+                    "projected_completion_date": projected_date.isoformat() if projected_date else None
+                }
+            ))
+
+        elif progress >= 1.0:
+            candidates.append(AlertGenerationService.build_candidate(
+                alert_type="GOAL_PROGRESS",
+                title=f"Goal Complete: {goal.name}",
+                description=(
+                    f"Congratulations! You've reached your {goal.name} goal "
+                    f"of ${goal.target_amount:.2f}!"
+                ),
+                metadata={
+                    "goal_id": goal.id,
+                    "goal_name": goal.name,
+                    "current_amount": goal.current_amount,
+                    "target_amount": goal.target_amount,
+                    "progress_percentage": 100
+                }
+            ))
+
+    return candidates
+
+@alert_rule("goal_deadline", group="goal")
+def goal_deadline_rule(snapshot: AlertSnapshot) -> List[Dict[str, Any]]:
+    """Goals whose deadline has passed, is within 24 hours, or is within 7 days."""
+    candidates = []
+
+    for goal in snapshot.goals:
+        if goal.target_amount <= 0 or not goal.deadline:
+            continue
+
+        progress_percent = int(goal.current_amount / goal.target_amount * 100)
+        time_until_deadline = goal.deadline - snapshot.now
+        days_until_deadline = time_until_deadline.days
+        hours_until_deadline = time_until_deadline.total_seconds() / 3600
+        remaining = goal.target_amount - goal.current_amount
+        metadata = {
+            "goal_id": goal.id,
+            "goal_name": goal.name,
+            "current_amount": goal.current_amount,
+            "target_amount": goal.target_amount,
+            "progress_percentage": progress_percent
+        }
+
+        if time_until_deadline.total_seconds() < 0:
+            candidates.append(AlertGenerationService.build_candidate(
+                alert_type="GOAL_PROGRESS",
+                title=f"Goal Deadline Passed: {goal.name}",
+                description=(
+                    f"Your deadline for {goal.name} has passed. You had saved "
+                    f"${goal.current_amount:.2f} out of ${goal.target_amount:.2f} "
+                    f"({progress_percent}%). Consider setting a new deadline or adjusting your goal."
+                ),
+                metadata={
+                    **metadata,
+                    "days_overdue": abs(days_until_deadline),
+                    "deadline_status": "expired"
+                }
+            ))
+
+        elif 0 < hours_until_deadline <= 24:
+            hours_left = int(hours_until_deadline)
+            candidates.append(AlertGenerationService.build_candidate(
+                alert_type="GOAL_PROGRESS",
+                title=f"⚠️ URGENT: {goal.name} Deadline in {hours_left} hours!",
+                description=(
+                    f"Only {hours_left} hour{'s' if hours_left != 1 else ''} left "
+                    f"to reach your {goal.name} goal! You still need ${remaining:.2f} "
+                    f"to meet your target of ${goal.target_amount:.2f}. "
+                    f"This is your final warning!"
+                ),
+                metadata={
+                    **metadata,
+                    "hours_until_deadline": hours_left,
+                    "amount_needed": remaining,
+                    "deadline_status": "critical"
+                }
+            ))
+
+        elif days_until_deadline <= 7:
+            daily_needed = remaining / max(days_until_deadline, 1)
+            candidates.append(AlertGenerationService.build_candidate(
+                alert_type="GOAL_PROGRESS",
+                title=f"Goal Deadline Approaching: {goal.name}",
+                description=(
+                    f"Only {days_until_deadline} day{'s' if days_until_deadline != 1 else ''} left "
+                    f"to reach your {goal.name} goal! You need to save ${remaining:.2f} more "
+                    f"(${daily_needed:.2f} per day) to meet your deadline."
+                ),
+                metadata={
+                    **metadata,
+                    "days_until_deadline": days_until_deadline,
+                    "amount_needed": remaining,
+                    "daily_amount_needed": daily_needed,
+                    "deadline_status": "approaching"
+                }
+            ))
+
+    return candidates
+
+@alert_rule("upcoming_payment", group="subscription")
+def upcoming_payment_rule(snapshot: AlertSnapshot) -> List[Dict[str, Any]]:
+    """Recurring charges expected within the next three days."""
+    candidates = []
+
+    for charge in snapshot.recurring_charges:
+        if not charge.next_expected_date:
+            continue
+
+        days_until_charge = (charge.next_expected_date - snapshot.now).days
+        if 0 <= days_until_charge <= 3:
+            candidates.append(AlertGenerationService.build_candidate(
+                alert_type="SUBSCRIPTION_REMINDER",
+                title=f"Upcoming Payment: {charge.merchant}",
+                description=(
+                    f"You have a recurring payment of ${charge.average_amount:.2f} "
+                    f"from {charge.merchant} coming up in {days_until_charge} day(s). "
+                    f"Expected on {charge.next_expected_date.strftime('%B %d, %Y')}."
+                ),
+                metadata={
+                    "merchant": charge.merchant,
+                    "amount": charge.average_amount,
+                    "next_charge_date": charge.next_expected_date.isoformat(),
+                    "frequency_days": charge.frequency_days,
+                    "confidence_score": charge.confidence_score
+                }
+            ))
+
+    return candidates
+
+@alert_rule("gray_charge", group="subscription")
+def gray_charge_rule(snapshot: AlertSnapshot) -> List[Dict[str, Any]]:
+    """High-confidence recurring charges that look like forgotten subscriptions."""
+    candidates = []
+
+    for charge in snapshot.recurring_charges:
+        gray_charge = SubscriptionDetector.gray_charge(charge)
+        if not gray_charge or gray_charge['confidence_score'] <= 0.7:
+            continue
+
+        reasons_text = ". ".join(gray_charge['reasons']) if gray_charge['reasons'] else "Potentially forgotten subscription"
+        candidates.append(AlertGenerationService.build_candidate(
+            alert_type="GRAY_CHARGE",
+            title=f"Review Subscription: {gray_charge['merchant']}",
+            description=(
+                f"You have a recurring charge of ${gray_charge['average_amount']:.2f} "
+                f"from {gray_charge['merchant']} every {gray_charge['frequency_days']} days. "
+                f"{reasons_text}. Consider reviewing if you still need this subscription."
+            ),
+            metadata={
+                "merchant": gray_charge['merchant'],
+                "amount": gray_charge['average_amount'],
+                "frequency_days": gray_charge['frequency_days'],
+                "reasons": gray_charge['reasons'],
+                "confidence_score": gray_charge['confidence_score'],
+                "last_charge_date": gray_charge['last_charge_date'].isoformat() if gray_charge['last_charge_date'] else None
+            }
+        ))
+
+    return candidates
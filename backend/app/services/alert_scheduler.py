@@ -0,0 +1,55 @@
+import asyncio
+import logging
+from typing import Dict, Set
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.services.alert_service import AlertService
+from app.request_memo import memo_scope
+
+logger = logging.getLogger(__name__)
+
+class AlertScheduler:
+    """Debounced background alert generation, at most one run per user at a time.
+
+    A trigger schedules a run ALERT_DEBOUNCE_SECONDS later; further triggers
+    for the same user before it starts are absorbed into it, and triggers
+    that arrive while it runs cause exactly one follow-up run. Runs use
+    their own session so request handlers never wait on rule evaluation.
+    """
+
+    def __init__(self, debounce_seconds: float):
+        self.debounce_seconds = debounce_seconds
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._retriggered: Set[str] = set()
+
+    def trigger(self, user_id: str):
+        if user_id in self._tasks:
+            self._retriggered.add(user_id)
+            return
+        self._tasks[user_id] = asyncio.create_task(self._run(user_id))
+
+    async def shutdown(self):
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self, user_id: str):
+        try:
+            while True:
+                await asyncio.sleep(self.debounce_seconds)
+                self._retriggered.discard(user_id)
+                try:
+                    with memo_scope():
+                        async with AsyncSessionLocal() as db:
+                            await AlertService.generate_all_alerts(db, user_id)
+                except Exception:
+                    logger.exception("Alert generation failed for user %s", user_id)
+
+                if user_id not in self._retriggered:
+                    break
+        finally:
+            self._tasks.pop(user_id, None)
+            self._retriggered.discard(user_id)
+
+alert_scheduler = AlertScheduler(settings.ALERT_DEBOUNCE_SECONDS)
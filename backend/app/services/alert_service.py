@@ -1,12 +1,112 @@
 import json
-from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func, desc
-from app.models import Alert, Transaction, Budget, Goal
-from app.schemas import AlertCreate, AlertType
+from sqlalchemy import select, update, delete, bindparam, and_, func, desc, literal, union_all
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.models import Alert, AlertCounter
+from app.schemas import AlertCreate
+from app.services.dashboard_cache import data_versions
+from app.services.alert_hub import alert_hub
+
+ENTITY_METADATA_KEYS = [('goal', 'goal_id'), ('budget', 'budget_id'), ('merchant', 'merchant'), ('category', 'category')]
 
 class AlertService:
+    @staticmethod
+    def entity_from_metadata(metadata: Optional[Dict[str, Any]]) -> Tuple[Optional[str], Optional[str]]:
+        """The (entity_type, entity_id) an alert is about, from the ids in its metadata."""
+        for entity_type, key in ENTITY_METADATA_KEYS:
+            if metadata and metadata.get(key) is not None:
+                return entity_type, str(metadata[key])
+        return None, None
+
+    @staticmethod
+    def backfill_entities(connection):
+        """Fill entity columns of existing alerts from their metadata_json."""
+        rows = connection.execute(
+            select(Alert.id, Alert.metadata_json).where(Alert.metadata_json.isnot(None))
+        )
+
+        updates = []
+        for row in rows:
+            try:
+                metadata = json.loads(row.metadata_json)
+            except ValueError:
+                continue
+            if not isinstance(metadata, dict):
+                continue
+            entity_type, entity_id = AlertService.entity_from_metadata(metadata)
+            if entity_type:
+                updates.append({'row_id': row.id, 'row_entity_type': entity_type, 'row_entity_id': entity_id})
+
+        if updates:
+            connection.execute(
+                update(Alert)
+                .where(Alert.id == bindparam('row_id'))
+                .values(entity_type=bindparam('row_entity_type'), entity_id=bindparam('row_entity_id')),
+                updates
+            )
+
+    @staticmethod
+    async def adjust_unread_count(db: AsyncSession, user_id: str, delta: int):
+        """Add delta to the user's unread counter in the caller's transaction.
+
+        The counter is clamped at zero, so a decrement against a missing or
+        drifted row never stores a negative count.
+        """
+        statement = sqlite_insert(AlertCounter).values(user_id=user_id, unread_count=max(delta, 0))
+        await db.execute(statement.on_conflict_do_update(
+            index_elements=["user_id"],
+            set_={"unread_count": func.max(AlertCounter.unread_count + delta, 0)}
+        ))
+
+    @staticmethod
+    async def get_unread_count(db: AsyncSession, user_id: str) -> int:
+        count = await db.scalar(select(AlertCounter.unread_count).where(AlertCounter.user_id == user_id))
+        return count or 0
+
+    @staticmethod
+    def unread_count_statements():
+        """DELETE and INSERT ... SELECT statements that recompute every unread counter."""
+        clear = delete(AlertCounter)
+        fill = sqlite_insert(AlertCounter).from_select(
+            ['user_id', 'unread_count'],
+            select(Alert.user_id, func.count()).where(Alert.is_read == False).group_by(Alert.user_id)
+        )
+        return clear, fill
+
+    @staticmethod
+    async def reconcile_unread_counts(db: AsyncSession) -> int:
+        """Repair unread counters that drifted from the alerts table.
+
+        Returns the number of users whose counter was wrong; counters are
+        only rewritten when there is drift.
+        """
+        actual = (
+            select(Alert.user_id.label('user_id'), func.count().label('unread'), literal(0).label('counted'))
+            .where(Alert.is_read == False)
+            .group_by(Alert.user_id)
+        )
+        counted = select(AlertCounter.user_id, literal(0), AlertCounter.unread_count)
+        both = union_all(actual, counted).subquery()
+        drifted = (
+            select(both.c.user_id)
+            .group_by(both.c.user_id)
+            .having(func.sum(both.c.unread) != func.sum(both.c.counted))
+            .subquery()
+        )
+
+        drift = await db.scalar(select(func.count()).select_from(drifted))
+        if drift:
+            for statement in AlertService.unread_count_statements():
+                await db.execute(statement)
+            await db.commit()
+        return drift
+
+    @staticmethod
+    def rebuild_unread_counts_sync(connection):
+        for statement in AlertService.unread_count_statements():
+            connection.execute(statement)
+
     @staticmethod
     async def create_alert(
         db: AsyncSession,
@@ -15,17 +115,23 @@ class AlertService:
     ) -> Alert:
         # Convert metadata dict to JSON string if provided
         metadata_str = json.dumps(alert_data.metadata) if alert_data.metadata else None
+        entity_type, entity_id = AlertService.entity_from_metadata(alert_data.metadata)
 
         alert = Alert(
             user_id=user_id,
             type=alert_data.type,
             title=alert_data.title,
             description=alert_data.description,
-            metadata_json=metadata_str
+            metadata_json=metadata_str,
+            entity_type=entity_type,
+            entity_id=entity_id
         )
         db.add(alert)
+        await AlertService.adjust_unread_count(db, user_id, 1)
+        data_versions.mark_changed(db, user_id)
         await db.commit()
         await db.refresh(alert)
+        alert_hub.publish(user_id, [alert])
         return alert
 
     @staticmethod
@@ -44,107 +150,71 @@ class AlertService:
         result = await db.execute(query)
         return result.scalars().all()
 
+    @staticmethod
+    async def _mark_read(db: AsyncSession, user_id: str, *conditions) -> int:
+        """Flip matching unread alerts to read in one UPDATE and return how many changed."""
+        result = await db.execute(
+            update(Alert)
+            .where(and_(Alert.user_id == user_id, Alert.is_read == False, *conditions))
+            .values(is_read=True)
+            .execution_options(synchronize_session=False)
+        )
+        count = result.rowcount
+
+        if count:
+            await AlertService.adjust_unread_count(db, user_id, -count)
+            data_versions.mark_changed(db, user_id)
+        await db.commit()
+        return count
+
     @staticmethod
     async def mark_alerts_read(
         db: AsyncSession,
         alert_ids: List[str],
         user_id: str
     ) -> int:
+        return await AlertService._mark_read(db, user_id, Alert.id.in_(alert_ids))
+
+    @staticmethod
+    async def mark_all_read(db: AsyncSession, user_id: str) -> int:
+        return await AlertService._mark_read(db, user_id)
+
+    @staticmethod
+    async def mark_read_by_type(db: AsyncSession, user_id: str, alert_type: str) -> int:
+        return await AlertService._mark_read(db, user_id, Alert.type == alert_type)
+
+    @staticmethod
+    async def delete_alerts(
+        db: AsyncSession,
+        alert_ids: List[str],
+        user_id: str
+    ) -> int:
+        """Delete alerts in one statement; RETURNING tells how many of them were unread."""
         result = await db.execute(
-            select(Alert).where(
-                and_(
-                    Alert.id.in_(alert_ids),
-                    Alert.user_id == user_id
-                )
-            )
+            delete(Alert)
+            .where(and_(Alert.user_id == user_id, Alert.id.in_(alert_ids)))
+            .returning(Alert.is_read)
+            .execution_options(synchronize_session=False)
         )
-        alerts = result.scalars().all()
-
-        count = 0
-        for alert in alerts:
-            if not alert.is_read:
-                alert.is_read = True
-                count += 1
+        deleted = result.scalars().all()
 
+        unread = sum(1 for is_read in deleted if not is_read)
+        if unread:
+            await AlertService.adjust_unread_count(db, user_id, -unread)
+        if deleted:
+            data_versions.mark_changed(db, user_id)
         await db.commit()
-        return count
+        return len(deleted)
 
     @staticmethod
     async def generate_anomaly_alerts(
         db: AsyncSession,
-        user_id: str,
-        lookback_months: int = 3
+        user_id: str
     ) -> List[Alert]:
         """Generate alerts for spending anomalies"""
-        alerts_created = []
-        now = datetime.utcnow()
-        current_month_start = datetime(now.year, now.month, 1)
-
-        # Calculate average spending by category for last N months
-        lookback_start = current_month_start - timedelta(days=lookback_months * 30)
-
-        # Get historical spending by category
-        historical_query = select(
-            Transaction.category,
-            func.avg(Transaction.amount).label('avg_amount'),
-            func.count(Transaction.id).label('transaction_count')
-        ).where(
-            and_(
-                Transaction.user_id == user_id,
-                Transaction.transaction_type == 'expense',
-                Transaction.date >= lookback_start,
-                Transaction.date < current_month_start
-            )
-        ).group_by(Transaction.category)
-
-        historical_result = await db.execute(historical_query)
-        historical_data = {row.category: row.avg_amount for row in historical_result}
-
-        if not historical_data:
-            return alerts_created  # No historical data to compare against
-
-        # Get current month spending by category
-        current_query = select(
-            Transaction.category,
-            func.sum(Transaction.amount).label('current_amount')
-        ).where(
-            and_(
-                Transaction.user_id == user_id,
-                Transaction.transaction_type == 'expense',
-                Transaction.date >= current_month_start
-            )
-        ).group_by(Transaction.category)
-
-        current_result = await db.execute(current_query)
-
-        # Check for anomalies
-        for row in current_result:
-            category = row.category
-            current_amount = row.current_amount
-
-            if category in historical_data:
-                avg_amount = historical_data[category]
-                # Calculate percentage increase
-                if avg_amount > 0:
-                    percent_increase = ((current_amount - avg_amount) / avg_amount) * 100
-
-                    # Create alert if spending is 40% above average
-                    if percent_increase > 40:
-                        alert_data = AlertCreate(
-                            type=AlertType.ANOMALY,
-                            title=f"Unusual spending in {category}",
-                            description=f"Your spending in {category} this month (${current_amount:.2f}) is {percent_increase:.0f}% higher than your {lookback_months}-month average (${avg_amount:.2f})",
-                            metadata={
-                                "category": category,
-                                "current_amount": current_amount,
-                                "average_amount": avg_amount,
-                                "percent_increase": percent_increase
-                            }
-                        )
-                        alert = await AlertService.create_alert(db, alert_data, user_id)
-                        alerts_created.append(alert)
-
-        return alerts_created
+        from app.services.alert_rules import AlertRuleEngine
+
+        return (await AlertRuleEngine.run(db, user_id, ["anomaly"]))["anomaly"]
 
     @staticmethod
     async def generate_budget_alerts(
@@ -152,186 +222,27 @@ class AlertService:
         user_id: str
     ) -> List[Alert]:
         """Generate alerts for budget warnings"""
-        from app.services.budget_service import BudgetService
-
-        alerts_created = []
-
-        # Get budget usage
-        budget_usage = await BudgetService.calculate_budget_usage(db, user_id)
-
-        for usage in budget_usage:
-            # Create alert if budget is over 90% used
-            if usage['percent_used'] >= 90:
-                category_name = usage['category'] or 'Overall'
-                alert_data = AlertCreate(
-                    type=AlertType.BUDGET_WARNING,
-                    title=f"Budget warning for {category_name}",
-                    description=f"You've used {usage['percent_used']:.1f}% of your {category_name} budget (${usage['spent_amount']:.2f} of ${usage['budgeted_amount']:.2f})",
-                    metadata={
-                        "budget_id": usage['budget_id'],
-                        "category": usage['category'],
-                        "spent_amount": usage['spent_amount'],
-                        "budgeted_amount": usage['budgeted_amount'],
-                        "percent_used": usage['percent_used']
-                    }
-                )
-
-                # Check if similar alert already exists in last 7 days
-                existing_alert_query = select(Alert).where(
-                    and_(
-                        Alert.user_id == user_id,
-                        Alert.type == AlertType.BUDGET_WARNING,
-                        Alert.created_at >= datetime.utcnow() - timedelta(days=7)
-                    )
-                )
-                existing_alert_result = await db.execute(existing_alert_query)
-                existing_alerts = existing_alert_result.scalars().all()
-
-                # Check if we already have an alert for this budget
-                already_exists = False
-                for existing in existing_alerts:
-                    if existing.metadata_json:
-                        try:
-                            metadata = json.loads(existing.metadata_json)
-                            if metadata.get('budget_id') == usage['budget_id']:
-                                already_exists = True
-                                break
-                        except:
-                            pass
-
-                if not already_exists:
-                    alert = await AlertService.create_alert(db, alert_data, user_id)
-                    alerts_created.append(alert)
-
-        return alerts_created
+        from app.services.alert_rules import AlertRuleEngine
+
+        return (await AlertRuleEngine.run(db, user_id, ["budget"]))["budget"]
 
     @staticmethod
     async def generate_goal_alerts(
         db: AsyncSession,
         user_id: str
     ) -> List[Alert]:
-        """Generate alerts for goal progress"""
-        alerts_created = []
-
-        # Get active goals
-        goals_query = select(Goal).where(
-            and_(
-                Goal.user_id == user_id,
-                Goal.is_active == True
-            )
-        )
-        goals_result = await db.execute(goals_query)
-        goals = goals_result.scalars().all()
-
-        for goal in goals:
-            # Calculate progress percentage
-            if goal.target_amount > 0:
-                progress_percent = (goal.current_amount / goal.target_amount) * 100
-
-                # Create alert if goal is 70% or more complete
-                if progress_percent >= 70 and progress_percent < 100:
-                    alert_data = AlertCreate(
-                        type=AlertType.GOAL_PROGRESS,
-                        title=f"Almost there! {goal.name} is {progress_percent:.0f}% complete",
-                        description=f"You've saved ${goal.current_amount:.2f} of your ${goal.target_amount:.2f} goal. Keep it up!",
-                        metadata={
-                            "goal_id": goal.id,
-                            "goal_name": goal.name,
-                            "current_amount": goal.current_amount,
-                            "target_amount": goal.target_amount,
-                            "progress_percent": progress_percent
-                        }
-                    )
-
-                    # Check if alert already exists in last 7 days
-                    existing_alert_query = select(Alert).where(
-                        and_(
-                            Alert.user_id == user_id,
-                            Alert.type == AlertType.GOAL_PROGRESS,
-                            Alert.created_at >= datetime.utcnow() - timedelta(days=7)
-                        )
-                    )
-                    existing_alert_result = await db.execute(existing_alert_query)
-                    existing_alerts = existing_alert_result.scalars().all()
-
-                    # Check if we already have an alert for this goal
-                    already_exists = False
-                    for existing in existing_alerts:
-                        if existing.metadata_json:
-                            try:
-                                metadata = json.loads(existing.metadata_json)
-                                if metadata.get('goal_id') == goal.id:
-                                    already_exists = True
-                                    break
-                            except:
-                                pass
-
-                    if not already_exists:
-                        alert = await AlertService.create_alert(db, alert_data, user_id)
-                        alerts_created.append(alert)
-
-                # Create alert if goal is 100% complete
-                elif progress_percent >= 100:
-                    alert_data = AlertCreate(
-                        type=AlertType.GOAL_PROGRESS,
-                        title=f"Congratulations! You've reached your {goal.name} goal!",
-                        description=f"You've successfully saved ${goal.current_amount:.2f}, meeting your target of ${goal.target_amount:.2f}!",
-                        metadata={
-                            "goal_id": goal.id,
-                            "goal_name": goal.name,
-                            "current_amount": goal.current_amount,
-                            "target_amount": goal.target_amount,
-                            "progress_percent": 100
-                        }
-                    )
-
-                    # Check if completion alert already exists
-                    existing_alert_query = select(Alert).where(
-                        and_(
-                            Alert.user_id == user_id,
-                            Alert.type == AlertType.GOAL_PROGRESS,
-                            Alert.title.contains("Congratulations"),
-                            Alert.created_at >= datetime.utcnow() - timedelta(days=30)
-                        )
-                    )
-                    existing_alert_result = await db.execute(existing_alert_query)
-                    existing_alerts = existing_alert_result.scalars().all()
-
-                    # Check if we already have a completion alert for this goal
-                    already_exists = False
-                    for existing in existing_alerts:
-                        if existing.metadata_json:
-                            try:
-                                metadata = json.loads(existing.metadata_json)
-                                if metadata.get('goal_id') == goal.id:
-                                    already_exists = True
-                                    break
-                            except:
-                                pass
-
-                    if not already_exists:
-                        alert = await AlertService.create_alert(db, alert_data, user_id)
-                        alerts_created.append(alert)
-
-        return alerts_created
+        """Generate alerts for goal progress and deadlines"""
+        from app.services.alert_rules import AlertRuleEngine
+
+        return (await AlertRuleEngine.run(db, user_id, ["goal"]))["goal"]
 
     @staticmethod
     async def generate_all_alerts(
         db: AsyncSession,
         user_id: str
-    ) -> Dict[str, List[Alert]]:
-        """Generate all types of alerts for a user"""
-        from app.services.alert_generation_service import AlertGenerationService
-
-        anomaly_alerts = await AlertService.generate_anomaly_alerts(db, user_id)
-        budget_alerts = await AlertService.generate_budget_alerts(db, user_id)
-        goal_alerts = await AlertService.generate_goal_alerts(db, user_id)
-        subscription_alerts = await AlertGenerationService.generate_subscription_alerts(db, user_id)
-
-        return {
-            "anomaly": anomaly_alerts,
-            "budget": budget_alerts,
-            "goal": goal_alerts,
-            "subscription": subscription_alerts,
-            "total": len(anomaly_alerts) + len(budget_alerts) + len(goal_alerts) + len(subscription_alerts)
-        }
\ No newline at end of file
+    ) -> Dict[str, Any]:
+        """Generate all types of alerts for a user from one data snapshot"""
+        from app.services.alert_rules import AlertRuleEngine
+
+        results = await AlertRuleEngine.run(db, user_id)
+        return {**results, "total": sum(len(alerts) for alerts in results.values())}
@@ -0,0 +1,200 @@
+import calendar
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+import pandas as pd
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_, func, cast, Integer
+from app.models import Budget, Transaction
+
+OVERALL = ''  # category key standing in for overall (category-less) budgets
+
+class BudgetForecaster:
+    """Month-end projections of budget spend from the current month's burn rate.
+
+    Daily spend is laid out as a (budgets x days elapsed) matrix so every
+    budget, for one user or all of them, is projected in one NumPy pass.
+    """
+
+    @staticmethod
+    def month_window(as_of: datetime) -> Tuple[datetime, datetime, int, int]:
+        """Month start, end of the as_of day, days in the month and days elapsed."""
+        month_start = as_of.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        days_in_month = calendar.monthrange(as_of.year, as_of.month)[1]
+        return month_start, month_start + timedelta(days=as_of.day), days_in_month, as_of.day
+
+    @staticmethod
+    def project(
+        daily: np.ndarray,
+        limits: np.ndarray,
+        days_in_month: int
+    ) -> Dict[str, np.ndarray]:
+        """Project each row of a (budgets x days elapsed) daily spend matrix to month end.
+
+        The overspend day is the first day cumulative spend went over the
+        limit or, for budgets still under it, the day the average daily rate
+        so far would take it over; 0 when the budget is projected to hold.
+        """
+        days_elapsed = daily.shape[1]
+        cumulative = np.cumsum(daily, axis=1)
+        spent = cumulative[:, -1]
+        burn_rate = spent / days_elapsed
+        projected = spent + burn_rate * (days_in_month - days_elapsed)
+
+        crossed = cumulative > limits[:, None]
+        already_over = crossed[:, -1]
+        will_cross = ~already_over & (projected > limits)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            crossing_day = days_elapsed + np.floor((limits - spent) / burn_rate) + 1
+        overspend_day = np.where(
+            already_over,
+            np.argmax(crossed, axis=1) + 1,
+            np.where(will_cross, crossing_day, 0)
+        ).astype(np.int64)
+
+        return {
+            'spent': spent,
+            'burn_rate': burn_rate,
+            'projected': projected,
+            'overspend_day': overspend_day
+        }
+
+    @staticmethod
+    def forecast_rows(
+        spend: Dict[str, np.ndarray],
+        budgets: Dict[str, np.ndarray],
+        days_elapsed: int,
+        days_in_month: int
+    ) -> Dict[str, np.ndarray]:
+        """Project budgets from grouped (user_id, category, day, amount) spend rows.
+
+        Budgets are keyed by (user_id, category) with OVERALL for budgets
+        without a category; every spend row is counted once under its own
+        category and once under OVERALL.
+        """
+        budget_count = len(budgets['user_id'])
+        user_codes, _ = pd.factorize(np.concatenate([budgets['user_id'], spend['user_id']]))
+        category_codes, categories = pd.factorize(
+            np.concatenate([budgets['category'], spend['category'], np.array([OVERALL], dtype=object)])
+        )
+        overall_code = category_codes[-1]
+
+        # Integer (user, category) keys; budgets sharing a key share a daily row
+        category_count = len(categories)
+        budget_keys = user_codes[:budget_count] * category_count + category_codes[:budget_count]
+        unique_keys, budget_rows = np.unique(budget_keys, return_inverse=True)
+
+        spend_users = user_codes[budget_count:] * category_count
+        days = spend['day']
+        daily = np.zeros((len(unique_keys), days_elapsed))
+        for spend_keys in (spend_users + category_codes[budget_count:-1], spend_users + overall_code):
+            rows = np.minimum(np.searchsorted(unique_keys, spend_keys), len(unique_keys) - 1)
+            matched = (unique_keys[rows] == spend_keys) & (days >= 1) & (days <= days_elapsed)
+            np.add.at(daily, (rows[matched], days[matched] - 1), spend['amount'][matched])
+
+        return BudgetForecaster.project(
+            daily[budget_rows],
+            budgets['amount_monthly'].astype(float),
+            days_in_month
+        )
+
+    @staticmethod
+    def _spend_query(month_start: datetime, window_end: datetime, user_id: Optional[str] = None):
+        day = cast(func.strftime('%d', Transaction.date), Integer)
+        conditions = [
+            Transaction.transaction_type == 'expense',
+            Transaction.date >= month_start,
+            Transaction.date < window_end
+        ]
+        if user_id:
+            conditions.append(Transaction.user_id == user_id)
+        return (
+            select(Transaction.user_id, Transaction.category, day, func.sum(Transaction.amount))
+            .where(and_(*conditions))
+            .group_by(Transaction.user_id, Transaction.category, day)
+        )
+
+    @staticmethod
+    def _columns(rows: List[Tuple], names: List[str], dtypes: List[Any]) -> Dict[str, np.ndarray]:
+        columns = list(zip(*rows)) if rows else [()] * len(names)
+        return {name: np.array(column, dtype=dtype) for name, column, dtype in zip(names, columns, dtypes)}
+
+    @staticmethod
+    async def forecast_all(db: AsyncSession, as_of: Optional[datetime] = None) -> Dict[str, np.ndarray]:
+        """Score every user's active budgets in one pass, for run_budget_forecast.py.
+
+        Two queries regardless of the number of users; returns parallel arrays
+        (budget_id, user_id, category, amount_monthly plus the projection).
+        """
+        as_of = as_of or datetime.utcnow()
+        month_start, window_end, days_in_month, days_elapsed = BudgetForecaster.month_window(as_of)
+
+        budget_result = await db.execute(
+            select(Budget.id, Budget.user_id, func.coalesce(Budget.category, OVERALL), Budget.amount_monthly)
+            .where(Budget.is_active == True)
+        )
+        budgets = BudgetForecaster._columns(
+            budget_result.all(),
+            ['budget_id', 'user_id', 'category', 'amount_monthly'],
+            [object, object, object, float]
+        )
+        if not len(budgets['budget_id']):
+            return {**budgets, 'spent': np.zeros(0), 'burn_rate': np.zeros(0),
+                    'projected': np.zeros(0), 'overspend_day': np.zeros(0, dtype=np.int64)}
+
+        spend_result = await db.execute(BudgetForecaster._spend_query(month_start, window_end))
+        spend = BudgetForecaster._columns(
+            spend_result.all(),
+            ['user_id', 'category', 'day', 'amount'],
+            [object, object, np.int64, float]
+        )
+
+        return {**budgets, **BudgetForecaster.forecast_rows(spend, budgets, days_elapsed, days_in_month)}
+
+    @staticmethod
+    async def forecast_user(
+        db: AsyncSession,
+        user_id: str,
+        as_of: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """Month-end projection and expected overspend date for each active budget."""
+        from app.services.budget_service import BudgetService
+
+        as_of = as_of or datetime.utcnow()
+        month_start, window_end, days_in_month, days_elapsed = BudgetForecaster.month_window(as_of)
+
+        budget_list = await BudgetService.get_budgets(db, user_id, active_only=True)
+        if not budget_list:
+            return []
+
+        spend_result = await db.execute(BudgetForecaster._spend_query(month_start, window_end, user_id))
+        spend = BudgetForecaster._columns(
+            spend_result.all(),
+            ['user_id', 'category', 'day', 'amount'],
+            [object, object, np.int64, float]
+        )
+        budgets = {
+            'user_id': np.full(len(budget_list), user_id, dtype=object),
+            'category': np.array([budget.category or OVERALL for budget in budget_list], dtype=object),
+            'amount_monthly': np.array([budget.amount_monthly for budget in budget_list], dtype=float)
+        }
+        forecast = BudgetForecaster.forecast_rows(spend, budgets, days_elapsed, days_in_month)
+
+        forecasts = []
+        for i, budget in enumerate(budget_list):
+            overspend_day = int(forecast['overspend_day'][i])
+            projected = float(forecast['projected'][i])
+            forecasts.append({
+                "budget_id": budget.id,
+                "category": budget.category,
+                "budgeted_amount": budget.amount_monthly,
+                "spent_amount": float(forecast['spent'][i]),
+                "daily_burn_rate": float(forecast['burn_rate'][i]),
+                "projected_amount": projected,
+                "projected_overspend": max(projected - budget.amount_monthly, 0.0),
+                "overspend_date": (month_start + timedelta(days=overspend_day - 1)).date() if overspend_day else None,
+                "currency": budget.currency
+            })
+
+        return forecasts
@@ -2,8 +2,10 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, func, or_
-from app.models import Budget, Transaction
+from app.models import Budget, MonthlyRollup
 from app.schemas import BudgetCreate, BudgetUpdate
+from app.services.rollup_service import RollupService
+from app.services.dashboard_cache import data_versions
 
 class BudgetService:
     @staticmethod
@@ -30,6 +32,7 @@ class BudgetService:
             **budget_data.dict()
         )
         db.add(budget)
+        data_versions.mark_changed(db, user_id)
         await db.commit()
         await db.refresh(budget)
         return budget
@@ -78,6 +81,7 @@ class BudgetService:
             setattr(budget, field, value)
 
         budget.updated_at = datetime.utcnow()
+        data_versions.mark_changed(db, user_id)
         await db.commit()
         await db.refresh(budget)
         return budget
@@ -95,9 +99,71 @@ class BudgetService:
         # Soft delete by deactivating
         budget.is_active = False
         budget.updated_at = datetime.utcnow()
+        data_versions.mark_changed(db, user_id)
         await db.commit()
         return True
 
+    @staticmethod
+    async def get_spending_by_month(
+        db: AsyncSession,
+        user_id: str,
+        start_month: str,
+        end_month: Optional[str] = None
+    ) -> Dict[str, Dict[Optional[str], float]]:
+        """Expense totals per month and category from one grouped rollup read.
+
+        Each month maps category -> total, with the overall total under None,
+        so any number of budgets can be matched against it in memory.
+        """
+        result = await db.execute(
+            select(
+                MonthlyRollup.month,
+                MonthlyRollup.category,
+                func.sum(MonthlyRollup.total_amount).label('total')
+            )
+            .where(
+                and_(
+                    MonthlyRollup.user_id == user_id,
+                    MonthlyRollup.transaction_type == 'expense',
+                    MonthlyRollup.month >= start_month,
+                    MonthlyRollup.month <= (end_month or start_month)
+                )
+            )
+            .group_by(MonthlyRollup.month, MonthlyRollup.category)
+        )
+
+        spending: Dict[str, Dict[Optional[str], float]] = {}
+        for row in result:
+            totals = spending.setdefault(row.month, {None: 0.0})
+            totals[row.category] = float(row.total)
+            totals[None] += float(row.total)
+        return spending
+
+    @staticmethod
+    def budget_usage(budget: Budget, spent_amount: float) -> Dict[str, Any]:
+        # Calculate percentage and status
+        percent_used = (spent_amount / budget.amount_monthly * 100) if budget.amount_monthly > 0 else 0
+
+        if percent_used <= 70:
+            status = "ok"
+        elif percent_used <= 90:
+            status = "warning"
+        else:
+            status = "danger"
+
+        remaining_amount = budget.amount_monthly - spent_amount
+
+        return {
+            "budget_id": budget.id,
+            "category": budget.category,
+            "budgeted_amount": budget.amount_monthly,
+            "spent_amount": spent_amount,
+            "remaining_amount": remaining_amount,
+            "percent_used": min(percent_used, 999.99),  # Cap at 999.99%
+            "status": status,
+            "currency": budget.currency
+        }
+
     @staticmethod
     async def calculate_budget_usage(
         db: AsyncSession,
@@ -109,66 +175,62 @@ class BudgetService:
             now = datetime.utcnow()
             month = now.strftime("%Y-%m")
 
-        # Parse month to get date range
+        # Normalise to the YYYY-MM rollup key
         year, month_num = map(int, month.split('-'))
-        start_date = datetime(year, month_num, 1)
-        if month_num == 12:
-            end_date = datetime(year + 1, 1, 1) - timedelta(seconds=1)
-        else:
-            end_date = datetime(year, month_num + 1, 1) - timedelta(seconds=1)
+        month = f"{year:04d}-{month_num:02d}"
 
-        # Get active budgets
+        # Get active budgets and the month's spending, whatever the number of budgets
         budgets = await BudgetService.get_budgets(db, user_id, active_only=True)
+        if not budgets:
+            return []
+        spending = (await BudgetService.get_spending_by_month(db, user_id, month)).get(month, {})
 
-        usage_list = []
-        for budget in budgets:
-            # Calculate spending for this budget's category
-            if budget.category:
-                # Category-specific budget
-                spending_query = select(func.sum(Transaction.amount)).where(
-                    and_(
-                        Transaction.user_id == user_id,
-                        Transaction.category == budget.category,
-                        Transaction.transaction_type == 'expense',
-                        Transaction.date >= start_date,
-                        Transaction.date <= end_date
-                    )
-                )
-            else:
-                # Overall budget
-                spending_query = select(func.sum(Transaction.amount)).where(
-                    and_(
-                        Transaction.user_id == user_id,
-                        Transaction.transaction_type == 'expense',
-                        Transaction.date >= start_date,
-                        Transaction.date <= end_date
-                    )
-                )
+        # Category-specific budgets match their category, overall budgets (no category) the total
+        return [
+            BudgetService.budget_usage(budget, spending.get(budget.category or None, 0.0))
+            for budget in budgets
+        ]
 
-            result = await db.execute(spending_query)
-            spent_amount = result.scalar() or 0.0
-
-            # Calculate percentage and status
-            percent_used = (spent_amount / budget.amount_monthly * 100) if budget.amount_monthly > 0 else 0
-
-            if percent_used <= 70:
-                status = "ok"
-            elif percent_used <= 90:
-                status = "warning"
-            else:
-                status = "danger"
-
-            remaining_amount = budget.amount_monthly - spent_amount
-
-            usage_list.append({
-                "budget_id": budget.id,
-                "category": budget.category,
-                "budgeted_amount": budget.amount_monthly,
-                "spent_amount": spent_amount,
-                "remaining_amount": remaining_amount,
-                "percent_used": min(percent_used, 999.99),  # Cap at 999.99%
-                "status": status,
-                "currency": budget.currency
-            })
-
-        return usage_list
\ No newline at end of file
+    @staticmethod
+    async def calculate_budget_usage_history(
+        db: AsyncSession,
+        user_id: str,
+        start_month: str,
+        end_month: str
+    ) -> Dict[str, Any]:
+        """Usage of every active budget for each month in an inclusive range.
+
+        Returned as a months x budgets matrix built from one grouped rollup read.
+        """
+        months = [start_month]
+        while months[-1] < end_month:
+            months.append(RollupService.shift_month(months[-1], 1))
+
+        budgets = await BudgetService.get_budgets(db, user_id, active_only=True)
+        spending = await BudgetService.get_spending_by_month(db, user_id, start_month, end_month) if budgets else {}
+
+        spent_matrix = []
+        percent_matrix = []
+        for month in months:
+            month_spending = spending.get(month, {})
+            usage = [
+                BudgetService.budget_usage(budget, month_spending.get(budget.category or None, 0.0))
+                for budget in budgets
+            ]
+            spent_matrix.append([item["spent_amount"] for item in usage])
+            percent_matrix.append([item["percent_used"] for item in usage])
+
+        return {
+            "months": months,
+            "budgets": [
+                {
+                    "budget_id": budget.id,
+                    "category": budget.category,
+                    "budgeted_amount": budget.amount_monthly,
+                    "currency": budget.currency
+                }
+                for budget in budgets
+            ],
+            "spent": spent_matrix,
+            "percent_used": percent_matrix
+        }
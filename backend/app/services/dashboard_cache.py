@@ -0,0 +1,119 @@
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from pydantic import BaseModel
+from sqlalchemy import event, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models import DataVersion
+
+class DataVersions:
+    """Per-user versions bumped whenever a user's transactions, budgets, goals or alerts change.
+
+    Versions are stored in data_versions and bumped in the same transaction
+    as the write, so a commit from any process, such as another API worker
+    or run_alert_batch.py, invalidates every worker's cached dashboard.
+    """
+
+    async def get(self, db: AsyncSession, user_id: str) -> int:
+        version = await db.scalar(select(DataVersion.version).where(DataVersion.user_id == user_id))
+        return version or 0
+
+    def mark_changed(self, db: AsyncSession, user_id: str):
+        """Bump the user's version as part of the session's current transaction."""
+        db.sync_session.info.setdefault('changed_users', set()).add(user_id)
+
+data_versions = DataVersions()
+
+@event.listens_for(Session, "before_commit")
+def _bump_changed_users(session: Session):
+    user_ids = session.info.pop('changed_users', None)
+    if not user_ids:
+        return
+    statement = sqlite_insert(DataVersion)
+    session.execute(
+        statement.on_conflict_do_update(
+            index_elements=["user_id"],
+            set_={"version": DataVersion.version + 1}
+        ),
+        [{"user_id": user_id, "version": 1} for user_id in sorted(user_ids)]
+    )
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session: Session):
+    session.info.pop('changed_users', None)
+
+class DashboardCache:
+    """LRU cache of dashboard payloads bounded by entry count and serialized size.
+
+    An entry is only served while the user's data version and the current
+    month match the ones it was built at, so any write, or the start of a new
+    month, invalidates it without explicit purging.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[int, str, BaseModel, int]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, user_id: str, version: int, period: str) -> Optional[BaseModel]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        cached_version, cached_period, payload, _ = entry
+        if cached_version != version or cached_period != period:
+            self._remove(user_id)
+            self.invalidations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return payload
+
+    def put(self, user_id: str, version: int, period: str, payload: BaseModel):
+        size = len(payload.model_dump_json())
+        if size > self.max_bytes:
+            return
+
+        if user_id in self._entries:
+            self._remove(user_id)
+        self._entries[user_id] = (version, period, payload, size)
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
+
+    def _remove(self, user_id: str):
+        _, _, _, size = self._entries.pop(user_id)
+        self._bytes -= size
+
+dashboard_cache = DashboardCache(settings.DASHBOARD_CACHE_MAX_ENTRIES, settings.DASHBOARD_CACHE_MAX_BYTES)
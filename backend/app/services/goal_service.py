@@ -1,9 +1,12 @@
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import List, Optional, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, func, case
 from app.models import Goal, Transaction
 from app.schemas import GoalCreate, GoalUpdate
+from app.services.dashboard_cache import data_versions
+from app.request_memo import memoized
+from app.services.goal_simulator import GoalSimulator
 import numpy as np
 
 class GoalService:
@@ -11,6 +14,7 @@ class GoalService:
     async def create_goal(db: AsyncSession, goal_data: GoalCreate, user_id: str) -> Goal:
         goal = Goal(**goal_data.dict(), user_id=user_id)
         db.add(goal)
+        data_versions.mark_changed(db, user_id)
         await db.commit()
         await db.refresh(goal)
         return goal
@@ -39,6 +43,7 @@ class GoalService:
             setattr(goal, field, value)
 
         goal.updated_at = datetime.utcnow()
+        data_versions.mark_changed(db, user_id)
         await db.commit()
         await db.refresh(goal)
         return goal
@@ -50,53 +55,95 @@ class GoalService:
             return False
 
         await db.delete(goal)
+        data_versions.mark_changed(db, user_id)
         await db.commit()
         return True
 
+    @staticmethod
+    async def get_cash_flow(db: AsyncSession, user_id: str) -> Dict[str, float]:
+        """Income, expenses and net savings over the last 30 days, memoized per request."""
+        async def compute() -> Dict[str, float]:
+            thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+            result = await db.execute(
+                select(
+                    func.coalesce(func.sum(case((Transaction.transaction_type == 'income', Transaction.amount))), 0.0),
+                    func.coalesce(func.sum(case((Transaction.transaction_type == 'expense', Transaction.amount))), 0.0)
+                )
+                .where(and_(
+                    Transaction.user_id == user_id,
+                    Transaction.transaction_type.in_(['income', 'expense']),
+                    Transaction.date >= thirty_days_ago
+                ))
+            )
+            income, expenses = result.one()
+            return {'income': float(income), 'expenses': float(expenses), 'savings': float(income - expenses)}
+
+        return await memoized('cash_flow', user_id, compute)
+
     @staticmethod
     async def calculate_savings_rate(db: AsyncSession, user_id: str) -> float:
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-
-        income_result = await db.execute(
-            select(Transaction)
-            .where(and_(
-                Transaction.user_id == user_id,
-                Transaction.transaction_type == 'income',
-                Transaction.date >= thirty_days_ago
-            ))
-        )
-        income_transactions = income_result.scalars().all()
-        monthly_income = sum(t.amount for t in income_transactions)
-
-        expense_result = await db.execute(
-            select(Transaction)
-            .where(and_(
-                Transaction.user_id == user_id,
-                Transaction.transaction_type == 'expense',
-                Transaction.date >= thirty_days_ago
-            ))
-        )
-        expense_transactions = expense_result.scalars().all()
-        monthly_expenses = sum(t.amount for t in expense_transactions)
-
-        monthly_savings = monthly_income - monthly_expenses
-        return max(0, monthly_savings)
+        cash_flow = await GoalService.get_cash_flow(db, user_id)
+        return max(0, cash_flow['savings'])
 
     @staticmethod
-    async def project_goal_completion(db: AsyncSession, goal: Goal, user_id: str) -> Optional[datetime]:
-        if goal.current_amount >= goal.target_amount:
-            return datetime.utcnow()
+    def project_completion_dates(
+        goals: List[Goal],
+        monthly_savings: float,
+        now: Optional[datetime] = None
+    ) -> List[Optional[datetime]]:
+        """Projected completion date per goal at a fixed monthly savings rate, in one array step."""
+        now = now or datetime.utcnow()
+        if not goals:
+            return []
+
+        target = np.array([goal.target_amount for goal in goals], dtype=float)
+        current = np.array([goal.current_amount for goal in goals], dtype=float)
+        completed = current >= target
 
-        monthly_savings = await GoalService.calculate_savings_rate(db, user_id)
+        if monthly_savings > 0:
+            days_needed = ((target - current) / monthly_savings * 30).astype(np.int64)
+        else:
+            days_needed = np.full(len(goals), -1, dtype=np.int64)
+        days_needed[completed] = 0
 
-        if monthly_savings <= 0:
-            return None
+        return [now + timedelta(days=int(days)) if days >= 0 else None for days in days_needed]
 
-        remaining_amount = goal.target_amount - goal.current_amount
-        months_needed = remaining_amount / monthly_savings
-        projected_date = datetime.utcnow() + timedelta(days=int(months_needed * 30))
+    @staticmethod
+    async def project_goal_completion(db: AsyncSession, goal: Goal, user_id: str) -> Optional[datetime]:
+        monthly_savings = await GoalService.calculate_savings_rate(db, user_id)
+        return GoalService.project_completion_dates([goal], monthly_savings)[0]
+
+    @staticmethod
+    async def project_goals(
+        db: AsyncSession,
+        user_id: str,
+        trajectories: Optional[int] = None,
+        seed: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Projections for all active goals from a single savings-rate computation.
+
+        Each goal also gets Monte Carlo completion percentiles from the
+        user's monthly net savings history.
+        """
+        goals = await GoalService.get_all_goals(db, user_id, active_only=True)
+        monthly_savings = await GoalService.calculate_savings_rate(db, user_id)
+        projected_dates = GoalService.project_completion_dates(goals, monthly_savings)
+        simulations = await GoalSimulator.simulate_goals(db, user_id, goals, trajectories, seed)
+
+        projections = []
+        for goal, projected_date, simulation in zip(goals, projected_dates, simulations):
+            projections.append({
+                "goal_id": goal.id,
+                "goal_name": goal.name,
+                "projected_completion_date": projected_date,
+                "deadline": goal.deadline,
+                "on_track": projected_date is not None and projected_date <= goal.deadline,
+                "current_progress": (goal.current_amount / goal.target_amount) * 100,
+                "remaining_amount": goal.target_amount - goal.current_amount,
+                "simulation": simulation
+            })
 
-        return projected_date
+        return {"monthly_savings": monthly_savings, "projections": projections}
 
     @staticmethod
     async def update_goal_progress(db: AsyncSession, goal_id: int, amount_to_add: float, user_id: str) -> Optional[Goal]:
@@ -110,6 +157,7 @@ class GoalService:
         if goal.current_amount >= goal.target_amount:
             goal.is_active = False
 
+        data_versions.mark_changed(db, user_id)
         await db.commit()
         await db.refresh(goal)
         return goal
@@ -0,0 +1,128 @@
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_, func, case
+from app.config import settings
+from app.models import Goal, MonthlyRollup
+from app.services.rollup_service import RollupService
+
+PERCENTILES = (10, 50, 90)
+
+class GoalSimulator:
+    """Monte Carlo goal completion dates for irregular incomes.
+
+    Trajectories are built by resampling the user's past months of net
+    savings, so a few strong or lean months widen the spread instead of
+    being averaged away.
+    """
+
+    @staticmethod
+    async def get_monthly_net_savings(db: AsyncSession, user_id: str, months: Optional[int] = None) -> np.ndarray:
+        """Net savings of each complete month, oldest first, from the rollups.
+
+        Starts at the user's first month with data, at most `months` back;
+        months without any transactions count as zero.
+        """
+        months = months or settings.GOAL_SIMULATION_HISTORY_MONTHS
+        current_month = RollupService.month_key(datetime.utcnow())
+        start_month = RollupService.shift_month(current_month, -months)
+
+        result = await db.execute(
+            select(
+                MonthlyRollup.month,
+                func.sum(case(
+                    (MonthlyRollup.transaction_type == 'income', MonthlyRollup.total_amount),
+                    else_=-MonthlyRollup.total_amount
+                ))
+            )
+            .where(and_(
+                MonthlyRollup.user_id == user_id,
+                MonthlyRollup.transaction_type.in_(['income', 'expense']),
+                MonthlyRollup.month >= start_month,
+                MonthlyRollup.month < current_month
+            ))
+            .group_by(MonthlyRollup.month)
+            .order_by(MonthlyRollup.month)
+        )
+        net_by_month = dict(result.all())
+        if not net_by_month:
+            return np.zeros(0)
+
+        history = []
+        month = min(net_by_month)
+        while month < current_month:
+            history.append(net_by_month.get(month, 0.0))
+            month = RollupService.shift_month(month, 1)
+        return np.array(history, dtype=float)
+
+    @staticmethod
+    def simulate(
+        history: np.ndarray,
+        remaining: np.ndarray,
+        trajectories: int,
+        horizon_months: int,
+        seed: Optional[int] = None
+    ) -> Dict[str, np.ndarray]:
+        """Months needed to save each remaining amount, across resampled trajectories.
+
+        Every goal is evaluated against the same (trajectories x horizon)
+        matrix of bootstrapped months. Returns the P10/P50/P90 month counts
+        per goal and the full (goals x trajectories) `months_needed` matrix,
+        with inf where the goal is not reached within the horizon.
+        """
+        rng = np.random.default_rng(seed)
+        samples = rng.choice(history, size=(trajectories, horizon_months))
+
+        # Money can be withdrawn in bad months, so use the best balance reached so far
+        best_balance = np.maximum.accumulate(np.cumsum(samples, axis=1), axis=1)
+
+        # Months below target, +1 for the month it is reached; horizon + 1 means never.
+        # One goal at a time keeps the comparison at (trajectories x horizon).
+        months_needed = np.empty((len(remaining), trajectories))
+        for i, target in enumerate(remaining):
+            months_needed[i] = 0 if target <= 0 else (best_balance < target).sum(axis=1) + 1
+        months_needed[months_needed > horizon_months] = np.inf
+
+        quantiles = np.quantile(months_needed, [p / 100 for p in PERCENTILES], axis=1, method='higher')
+        return {
+            **{f"p{p}": quantiles[i] for i, p in enumerate(PERCENTILES)},
+            'months_needed': months_needed
+        }
+
+    @staticmethod
+    async def simulate_goals(
+        db: AsyncSession,
+        user_id: str,
+        goals: List[Goal],
+        trajectories: Optional[int] = None,
+        seed: Optional[int] = None
+    ) -> List[Optional[Dict[str, Any]]]:
+        """P10/P50/P90 completion dates and deadline odds for each goal.
+
+        Entries are None when there are fewer than GOAL_SIMULATION_MIN_MONTHS
+        complete months of history to sample from.
+        """
+        history = await GoalSimulator.get_monthly_net_savings(db, user_id)
+        if not goals or len(history) < settings.GOAL_SIMULATION_MIN_MONTHS:
+            return [None] * len(goals)
+
+        now = datetime.utcnow()
+        horizon = settings.GOAL_SIMULATION_HORIZON_MONTHS
+        remaining = np.array([goal.target_amount - goal.current_amount for goal in goals], dtype=float)
+        result = GoalSimulator.simulate(
+            history, remaining, trajectories or settings.GOAL_SIMULATION_TRAJECTORIES, horizon, seed
+        )
+
+        def to_date(months: float) -> Optional[datetime]:
+            return now + timedelta(days=int(months * 30)) if np.isfinite(months) else None
+
+        simulations = []
+        for i, goal in enumerate(goals):
+            months_to_deadline = (goal.deadline - now).days / 30
+            simulations.append({
+                "history_months": len(history),
+                **{f"p{p}_completion_date": to_date(result[f"p{p}"][i]) for p in PERCENTILES},
+                "probability_by_deadline": float((result['months_needed'][i] <= months_to_deadline).mean())
+            })
+        return simulations
@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import shutil
+import uuid
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Set, Tuple
+from fastapi import UploadFile
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.services.import_service import ImportService, ARCHIVE_EXTENSIONS
+from app.services.transaction_service import TransactionService
+from app.services.alert_scheduler import alert_scheduler
+
+logger = logging.getLogger(__name__)
+
+class ImportJob:
+    def __init__(self, user_id: str, work_dir: str, files: List[Tuple[str, str, str]]):
+        self.id = str(uuid.uuid4())
+        self.user_id = user_id
+        self.work_dir = work_dir
+        self.files = files  # (filename, extension, spooled path)
+        self.status = "queued"  # queued, importing, completed, failed
+        self.rows_parsed = 0
+        self.rows_inserted = 0
+        self.rows_rejected = 0
+        self.duplicates_skipped = 0
+        self.batches = 0
+        self.errors = []
+        self.error: Optional[str] = None
+        self.phase_timings: Dict[str, float] = {}
+        self.created_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+
+    def update_progress(self, totals: Dict[str, Any]):
+        self.rows_parsed = totals['rows_parsed']
+        self.rows_inserted = totals['rows_inserted']
+        self.rows_rejected = totals['rows_rejected']
+        self.duplicates_skipped = totals['duplicates_skipped']
+        self.batches = totals['batches']
+        self.errors = list(totals['errors'])
+        self.phase_timings.update(totals['timings'])
+
+    def fail(self, error: str, rows_removed: bool):
+        self.status = "failed"
+        self.error = error
+        if rows_removed:
+            self.rows_inserted = 0
+            self.duplicates_skipped = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "files": [filename for filename, _, _ in self.files],
+            "status": self.status,
+            "rows_parsed": self.rows_parsed,
+            "rows_inserted": self.rows_inserted,
+            "rows_rejected": self.rows_rejected,
+            "duplicates_skipped": self.duplicates_skipped,
+            "batches": self.batches,
+            "errors": self.errors,
+            "error": self.error,
+            "phase_timings": {phase: round(seconds, 4) for phase, seconds in self.phase_timings.items()},
+            "created_at": self.created_at,
+            "finished_at": self.finished_at
+        }
+
+class ImportJobManager:
+    """Runs uploads on background tasks, at most IMPORT_MAX_CONCURRENT_JOBS at a time.
+
+    Jobs live in process memory, so they are only visible to the worker that
+    accepted the upload and are forgotten on restart.
+    """
+
+    def __init__(self, max_concurrent_jobs: int):
+        self.jobs: Dict[str, ImportJob] = {}
+        self._semaphore = asyncio.Semaphore(max_concurrent_jobs)
+        self._tasks: Set[asyncio.Task] = set()
+
+    def submit(
+        self,
+        user_id: str,
+        work_dir: str,
+        files: List[Tuple[str, str, str]],
+        upload_seconds: float = 0.0
+    ) -> ImportJob:
+        self.prune()
+        job = ImportJob(user_id, work_dir, files)
+        job.phase_timings['upload'] = upload_seconds
+        self.jobs[job.id] = job
+
+        task = asyncio.create_task(self._run(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def get(self, job_id: str, user_id: str) -> Optional[ImportJob]:
+        job = self.jobs.get(job_id)
+        if job and job.user_id == user_id:
+            return job
+        return None
+
+    def prune(self):
+        """Forget finished jobs older than the retention window."""
+        now = datetime.utcnow()
+        expired = [
+            job_id for job_id, job in self.jobs.items()
+            if job.finished_at and (now - job.finished_at).total_seconds() > settings.IMPORT_JOB_RETENTION_SECONDS
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+
+    async def shutdown(self):
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _run(self, job: ImportJob):
+        try:
+            async with self._semaphore:
+                job.status = "importing"
+                async with AsyncSessionLocal() as db:
+                    filename, extension, path = job.files[0]
+                    if len(job.files) == 1 and extension not in ARCHIVE_EXTENSIONS:
+                        # A single statement streams through in constant memory
+                        with open(path, 'rb') as fh:
+                            upload = UploadFile(file=fh, filename=filename)
+                            await ImportService.import_upload(
+                                db, upload, extension, job.user_id,
+                                progress_callback=job.update_progress,
+                                import_job_id=job.id
+                            )
+                    else:
+                        await ImportService.import_files(
+                            db, job.files, job.work_dir, job.user_id,
+                            progress_callback=job.update_progress,
+                            import_job_id=job.id
+                        )
+
+            job.status = "completed"
+            alert_scheduler.trigger(job.user_id)
+        except asyncio.CancelledError:
+            await self._fail(job, "Import was cancelled")
+            raise
+        except ValueError as e:
+            await self._fail(job, str(e))
+        except Exception as e:
+            await self._fail(job, f"Failed to process file: {str(e)}")
+        finally:
+            job.finished_at = datetime.utcnow()
+            shutil.rmtree(job.work_dir, ignore_errors=True)
+
+    async def _fail(self, job: ImportJob, error: str):
+        """Mark the job failed and remove the batches it already committed."""
+        rows_removed = False
+        try:
+            async with AsyncSessionLocal() as db:
+                await TransactionService.delete_import(db, job.user_id, job.id)
+            rows_removed = True
+        except Exception:
+            logger.exception("Could not remove rows of failed import job %s", job.id)
+            error = f"{error} (rows already imported were kept)"
+        job.fail(error, rows_removed)
+
+import_jobs = ImportJobManager(settings.IMPORT_MAX_CONCURRENT_JOBS)
@@ -0,0 +1,561 @@
+import asyncio
+import codecs
+import csv
+import json
+import os
+import shutil
+import time
+import zipfile
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from io import StringIO
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple, Callable
+from fastapi import UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.services.transaction_service import TransactionService, REQUIRED_CSV_COLUMNS
+
+SUPPORTED_EXTENSIONS = ['csv', 'json', 'ndjson', 'jsonl']
+NDJSON_EXTENSIONS = ['ndjson', 'jsonl']
+JSON_MAX_ITEM_CHUNKS = 4  # upload chunks a single JSON array item may span
+JSON_TRUNCATION_SLACK = 16  # syntax errors this close to the buffer end may be a value cut mid-chunk
+ARCHIVE_EXTENSIONS = ['zip']
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+# (batch number, parsed transactions, per-row errors)
+ImportBatch = Tuple[int, List[Dict[str, Any]], List[str]]
+
+def parse_statement_file(path: str, file_extension: str) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Parse a whole statement file with the TransactionService converters.
+
+    Module-level so it can be pickled into the import process pool. Returns
+    the valid transactions and one error per rejected row; problems with the
+    file as a whole raise ValueError.
+    """
+    if file_extension == 'csv':
+        try:
+            df = pd.read_csv(path, encoding='utf-8-sig')
+        except Exception as e:
+            raise ValueError(f"Failed to parse CSV: {str(e)}")
+        if not all(col in df.columns for col in REQUIRED_CSV_COLUMNS):
+            raise ValueError(f"Failed to parse CSV: CSV must contain columns: {REQUIRED_CSV_COLUMNS}")
+        return TransactionService.frame_to_transactions(df)
+
+    items: List[Tuple[str, Any]] = []
+    errors: List[str] = []
+    with open(path, encoding='utf-8-sig') as fh:
+        if file_extension in NDJSON_EXTENSIONS:
+            for line_no, line in enumerate(fh, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    items.append((f"line {line_no}", json.loads(line)))
+                except json.JSONDecodeError as e:
+                    errors.append(f"line {line_no}: invalid JSON: {e.msg}")
+        else:
+            try:
+                data = json.load(fh)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Failed to parse JSON: {str(e)}")
+            if not isinstance(data, list):
+                data = [data]
+            items = [(f"item {position}", item) for position, item in enumerate(data, start=1)]
+
+    transactions = []
+    for label, item in items:
+        try:
+            transactions.append(TransactionService.json_item_to_transaction(item))
+        except (TypeError, ValueError) as e:
+            errors.append(f"{label}: {str(e)}")
+    return transactions, errors
+
+class ImportService:
+    @staticmethod
+    def get_process_pool() -> ProcessPoolExecutor:
+        global _process_pool
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(max_workers=settings.IMPORT_PROCESS_WORKERS or None)
+        return _process_pool
+
+    @staticmethod
+    def shutdown_process_pool():
+        global _process_pool
+        if _process_pool is not None:
+            _process_pool.shutdown(cancel_futures=True)
+            _process_pool = None
+
+    @staticmethod
+    def extract_archive(path: str, dest_dir: str) -> List[Tuple[str, str, str]]:
+        """Unpack the statement files in a ZIP archive into `dest_dir`.
+
+        Returns (display name, extension, path) per statement. Members with
+        unsupported extensions and macOS metadata are skipped; archives that
+        would expand past IMPORT_MAX_ARCHIVE_BYTES are refused.
+        """
+        try:
+            archive = zipfile.ZipFile(path)
+        except zipfile.BadZipFile:
+            raise ValueError("Failed to read ZIP archive: file is not a valid archive")
+
+        with archive:
+            members = []
+            for info in archive.infolist():
+                name = os.path.basename(info.filename)
+                extension = name.split('.')[-1].lower()
+                if info.is_dir() or info.filename.startswith('__MACOSX/') or name.startswith('.'):
+                    continue
+                if extension in SUPPORTED_EXTENSIONS:
+                    members.append((info, name, extension))
+
+            if len(members) > settings.IMPORT_MAX_ARCHIVE_FILES:
+                raise ValueError(f"ZIP archive contains more than {settings.IMPORT_MAX_ARCHIVE_FILES} statement files")
+            if sum(info.file_size for info, _, _ in members) > settings.IMPORT_MAX_ARCHIVE_BYTES:
+                raise ValueError("ZIP archive is too large to import")
+
+            extracted = []
+            for position, (info, name, extension) in enumerate(members):
+                # Flatten member paths so nothing can be written outside dest_dir
+                target = os.path.join(dest_dir, f"archive-{position}.{extension}")
+                with archive.open(info) as source, open(target, 'wb') as dest:
+                    shutil.copyfileobj(source, dest)
+                extracted.append((info.filename, extension, target))
+
+        return extracted
+
+    @staticmethod
+    async def iter_text_chunks(file: UploadFile, chunk_size: Optional[int] = None) -> AsyncIterator[str]:
+        """Read an upload in fixed-size chunks and decode UTF-8 incrementally."""
+        chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+        decoder = codecs.getincrementaldecoder('utf-8-sig')()
+
+        while True:
+            chunk = await file.read(chunk_size)
+            if not chunk:
+                break
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            yield tail
+
+    @staticmethod
+    async def iter_csv_records(chunks: AsyncIterator[str]) -> AsyncIterator[Tuple[int, str]]:
+        """Yield (line number, record text) for each CSV record in a chunk stream.
+
+        A record is complete once it holds an even number of quote characters,
+        so quoted fields spanning several lines stay in one record. Blank lines
+        are skipped, matching pandas.
+        """
+        pending = ''
+        record_lines: List[str] = []
+        record_start = 1
+        quotes = 0
+        line_no = 0
+
+        async for text in chunks:
+            pending += text
+            lines = pending.split('\n')
+            pending = lines.pop()
+
+            for line in lines:
+                line_no += 1
+                if not record_lines:
+                    if not line.strip():
+                        continue
+                    record_start = line_no
+                record_lines.append(line + '\n')
+                quotes += line.count('"')
+                if quotes % 2 == 0:
+                    yield record_start, ''.join(record_lines)
+                    record_lines = []
+                    quotes = 0
+
+        if pending:
+            line_no += 1
+            if not record_lines:
+                record_start = line_no
+            record_lines.append(pending + '\n')
+        if record_lines and ''.join(record_lines).strip():
+            yield record_start, ''.join(record_lines)
+
+    @staticmethod
+    async def iter_csv_batches(
+        chunks: AsyncIterator[str],
+        batch_size: Optional[int] = None
+    ) -> AsyncIterator[ImportBatch]:
+        """Parse a CSV chunk stream into batches of at most `batch_size` transactions."""
+        batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+        header: Optional[str] = None
+        header_fields = 0
+        records: List[str] = []
+        line_numbers: List[int] = []
+        batch_number = 0
+        date_format: Optional[str] = None
+        date_format_inferred = False
+
+        def to_transactions(df: pd.DataFrame, lines: List[int]) -> Tuple[List[Dict[str, Any]], List[str]]:
+            # The date format is picked once, from the first batch, for the whole file
+            nonlocal date_format, date_format_inferred
+            if not date_format_inferred and df['date'].dtype == object and df['date'].notna().any():
+                date_format = TransactionService.infer_date_format(df['date'])
+                date_format_inferred = True
+            return TransactionService.frame_to_transactions(df, line_numbers=lines, date_format=date_format)
+
+        def parse_batch() -> ImportBatch:
+            try:
+                df = pd.read_csv(StringIO(header + ''.join(records)))
+                return (batch_number, *to_transactions(df, line_numbers))
+            except Exception:
+                pass
+
+            # A malformed record broke the whole batch; isolate it and keep the rest
+            good_records, good_lines, malformed = [], [], []
+            for record, line_no in zip(records, line_numbers):
+                fields = len(next(csv.reader(StringIO(record)), []))
+                if fields == header_fields:
+                    good_records.append(record)
+                    good_lines.append(line_no)
+                else:
+                    malformed.append(f"line {line_no}: expected {header_fields} fields, saw {fields}")
+
+            try:
+                df = pd.read_csv(StringIO(header + ''.join(good_records)))
+                transactions, errors = to_transactions(df, good_lines)
+            except Exception as e:
+                return batch_number, [], malformed + [f"line {line_no}: {str(e)}" for line_no in good_lines]
+            return batch_number, transactions, malformed + errors
+
+        async for line_no, record in ImportService.iter_csv_records(chunks):
+            if header is None:
+                columns = list(pd.read_csv(StringIO(record)).columns)
+                if not all(col in columns for col in REQUIRED_CSV_COLUMNS):
+                    raise ValueError(f"Failed to parse CSV: CSV must contain columns: {REQUIRED_CSV_COLUMNS}")
+                header = record
+                header_fields = len(columns)
+                continue
+
+            records.append(record)
+            line_numbers.append(line_no)
+            if len(records) >= batch_size:
+                batch_number += 1
+                yield parse_batch()
+                records, line_numbers = [], []
+
+        if header is None:
+            raise ValueError("Failed to parse CSV: file is empty")
+
+        if records:
+            batch_number += 1
+            yield parse_batch()
+
+    @staticmethod
+    async def iter_json_array(chunks: AsyncIterator[str]) -> AsyncIterator[Any]:
+        """Yield the elements of a top-level JSON array one at a time.
+
+        Only the unconsumed tail of the stream is buffered, so memory is bounded
+        by the chunk size plus the largest single element; an element spanning
+        more than JSON_MAX_ITEM_CHUNKS chunks fails the file. A top-level
+        object is yielded as a single element, matching parse_json.
+        """
+        decoder = json.JSONDecoder()
+        stream = chunks.__aiter__()
+        buffer = ''
+        pos = 0
+        exhausted = False
+        max_item_chars = JSON_MAX_ITEM_CHUNKS * settings.UPLOAD_CHUNK_SIZE
+
+        async def fill() -> bool:
+            nonlocal buffer, pos, exhausted
+            if exhausted:
+                return False
+            try:
+                text = await stream.__anext__()
+            except StopAsyncIteration:
+                exhausted = True
+                return False
+            buffer = buffer[pos:] + text
+            pos = 0
+            return True
+
+        async def next_char() -> str:
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos].isspace():
+                    pos += 1
+                if pos < len(buffer):
+                    return buffer[pos]
+                if not await fill():
+                    return ''
+
+        async def decode_value(position: int) -> Any:
+            nonlocal pos
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                    # A bare number near the buffer edge may continue in the next chunk
+                    if len(buffer) - end > JSON_TRUNCATION_SLACK or exhausted:
+                        pos = end
+                        return value
+                except json.JSONDecodeError as e:
+                    # Only an error at the end of the buffer can be fixed by reading more
+                    truncated = (
+                        e.msg.startswith("Unterminated string")
+                        or len(buffer) - e.pos <= JSON_TRUNCATION_SLACK
+                    )
+                    if exhausted or not truncated:
+                        raise ValueError(f"Failed to parse JSON: item {position}: {e.msg}")
+                if len(buffer) - pos > max_item_chars:
+                    raise ValueError(
+                        f"Failed to parse JSON: item {position} is larger than {max_item_chars} characters"
+                    )
+                await fill()
+
+        first = await next_char()
+        if first == '':
+            return
+        if first != '[':
+            yield await decode_value(1)
+            if await next_char():
+                raise ValueError("Failed to parse JSON: unexpected data after top-level value")
+            return
+
+        pos += 1
+        position = 0
+        while True:
+            char = await next_char()
+            if char == ']':
+                pos += 1
+                break
+            if position > 0:
+                if char != ',':
+                    raise ValueError(f"Failed to parse JSON: expected ',' or ']' after item {position}")
+                pos += 1
+                if not await next_char():
+                    raise ValueError("Failed to parse JSON: unterminated array")
+            elif char == '':
+                raise ValueError("Failed to parse JSON: unterminated array")
+
+            position += 1
+            yield await decode_value(position)
+
+        if await next_char():
+            raise ValueError("Failed to parse JSON: unexpected data after top-level array")
+
+    @staticmethod
+    async def iter_ndjson_lines(chunks: AsyncIterator[str]) -> AsyncIterator[Tuple[int, str]]:
+        """Yield (line number, line) for every non-blank line in a chunk stream."""
+        pending = ''
+        line_no = 0
+
+        async for text in chunks:
+            pending += text
+            lines = pending.split('\n')
+            pending = lines.pop()
+            for line in lines:
+                line_no += 1
+                if line.strip():
+                    yield line_no, line
+
+        if pending.strip():
+            yield line_no + 1, pending
+
+    @staticmethod
+    async def iter_json_batches(
+        chunks: AsyncIterator[str],
+        batch_size: Optional[int] = None,
+        newline_delimited: bool = False
+    ) -> AsyncIterator[ImportBatch]:
+        """Parse a JSON array or NDJSON stream into batches of at most `batch_size` transactions.
+
+        Invalid items are skipped and reported. A syntax error inside a JSON
+        array is fatal since parsing cannot resume after it, while a bad NDJSON
+        line only loses that line.
+        """
+        batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+        transactions: List[Dict[str, Any]] = []
+        errors: List[str] = []
+        batch_number = 0
+
+        async def items() -> AsyncIterator[Tuple[str, Any]]:
+            if newline_delimited:
+                async for line_no, line in ImportService.iter_ndjson_lines(chunks):
+                    try:
+                        yield f"line {line_no}", json.loads(line)
+                    except json.JSONDecodeError as e:
+                        yield f"line {line_no}", e
+            else:
+                position = 0
+                async for item in ImportService.iter_json_array(chunks):
+                    position += 1
+                    yield f"item {position}", item
+
+        async for label, item in items():
+            try:
+                if isinstance(item, json.JSONDecodeError):
+                    raise ValueError(f"invalid JSON: {item.msg}")
+                transactions.append(TransactionService.json_item_to_transaction(item))
+            except (TypeError, ValueError) as e:
+                errors.append(f"{label}: {str(e)}")
+
+            if len(transactions) + len(errors) >= batch_size:
+                batch_number += 1
+                yield batch_number, transactions, errors
+                transactions, errors = [], []
+
+        if transactions or errors:
+            batch_number += 1
+            yield batch_number, transactions, errors
+
+    @staticmethod
+    async def import_upload(
+        db: AsyncSession,
+        file: UploadFile,
+        file_extension: str,
+        user_id: str,
+        batch_size: Optional[int] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        import_job_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Stream an uploaded statement into the database one batch at a time.
+
+        Only the current chunk and batch are held in memory. Each batch is
+        committed on its own so the SQLite write lock is released between
+        batches; rows are tagged with `import_job_id` so a failed import can be
+        removed with TransactionService.delete_import. Rejected rows are
+        skipped and reported; errors that make the file unreadable raise
+        ValueError. The progress callback receives the running totals after
+        every batch.
+        """
+        chunks = ImportService.iter_text_chunks(file)
+        if file_extension == 'csv':
+            batches = ImportService.iter_csv_batches(chunks, batch_size)
+        else:
+            newline_delimited = file_extension in NDJSON_EXTENSIONS
+            batches = ImportService.iter_json_batches(chunks, batch_size, newline_delimited)
+
+        totals = {
+            'rows_parsed': 0,
+            'rows_inserted': 0,
+            'rows_rejected': 0,
+            'duplicates_skipped': 0,
+            'batches': 0,
+            'errors': [],
+            'timings': {'parse': 0.0, 'insert': 0.0}
+        }
+
+        batch_started = time.perf_counter()
+        async for batch_number, transactions, errors in batches:
+            totals['timings']['parse'] += time.perf_counter() - batch_started
+            totals['batches'] = batch_number
+            totals['rows_parsed'] += len(transactions) + len(errors)
+            totals['rows_rejected'] += len(errors)
+
+            room = settings.IMPORT_MAX_REPORTED_ERRORS - len(totals['errors'])
+            totals['errors'].extend(f"batch {batch_number}: {error}" for error in errors[:max(room, 0)])
+
+            if transactions:
+                insert_started = time.perf_counter()
+                result = await TransactionService.bulk_insert(
+                    db, transactions, user_id, batch_size=batch_size, import_job_id=import_job_id
+                )
+                await db.commit()
+                totals['rows_inserted'] += result['inserted']
+                totals['duplicates_skipped'] += result['duplicates']
+                totals['timings']['insert'] += time.perf_counter() - insert_started
+
+            if progress_callback:
+                progress_callback(totals)
+            batch_started = time.perf_counter()
+
+        return totals
+
+    @staticmethod
+    async def import_files(
+        db: AsyncSession,
+        files: List[Tuple[str, str, str]],
+        work_dir: str,
+        user_id: str,
+        batch_size: Optional[int] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        import_job_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Import several statements or ZIP archives at once.
+
+        `files` holds (display name, extension, path) tuples. Archives are
+        unpacked into `work_dir`, every statement is parsed in the process pool
+        in parallel, and the merged rows are inserted and committed batch by
+        batch, tagged with `import_job_id` like import_upload. A file that
+        cannot be parsed is reported and the others are still imported.
+        """
+        totals = {
+            'rows_parsed': 0,
+            'rows_inserted': 0,
+            'rows_rejected': 0,
+            'duplicates_skipped': 0,
+            'batches': 0,
+            'errors': [],
+            'timings': {'extract': 0.0, 'parse': 0.0, 'insert': 0.0}
+        }
+
+        def report(errors: List[str]):
+            room = settings.IMPORT_MAX_REPORTED_ERRORS - len(totals['errors'])
+            totals['errors'].extend(errors[:max(room, 0)])
+
+        started = time.perf_counter()
+        statements = []
+        for name, extension, path in files:
+            if extension not in ARCHIVE_EXTENSIONS:
+                statements.append((name, extension, path))
+                continue
+            try:
+                members = await asyncio.to_thread(ImportService.extract_archive, path, work_dir)
+            except ValueError as e:
+                report([f"{name}: {str(e)}"])
+                continue
+            statements.extend((f"{name}/{member}", member_extension, member_path)
+                              for member, member_extension, member_path in members)
+        totals['timings']['extract'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        pool = ImportService.get_process_pool()
+        results = await asyncio.gather(
+            *[loop.run_in_executor(pool, parse_statement_file, path, extension)
+              for _, extension, path in statements],
+            return_exceptions=True
+        )
+        totals['timings']['parse'] = time.perf_counter() - started
+
+        transactions: List[Dict[str, Any]] = []
+        for (name, _, _), result in zip(statements, results):
+            if isinstance(result, Exception):
+                report([f"{name}: {str(result)}"])
+                continue
+            parsed, errors = result
+            transactions.extend(parsed)
+            totals['rows_parsed'] += len(parsed) + len(errors)
+            totals['rows_rejected'] += len(errors)
+            report([f"{name}: {error}" for error in errors])
+
+        if progress_callback:
+            progress_callback(totals)
+
+        started = time.perf_counter()
+        batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+        for start in range(0, len(transactions), batch_size):
+            result = await TransactionService.bulk_insert(
+                db, transactions[start:start + batch_size], user_id,
+                batch_size=batch_size, import_job_id=import_job_id
+            )
+            await db.commit()
+            totals['rows_inserted'] += result['inserted']
+            totals['duplicates_skipped'] += result['duplicates']
+            totals['batches'] += 1
+            totals['timings']['insert'] = time.perf_counter() - started
+
+            if progress_callback:
+                progress_callback(totals)
+        return totals
@@ -0,0 +1,135 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, and_, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.models import MonthlyRollup, Transaction
+
+class RollupService:
+    """Per-user monthly totals by category and transaction type.
+
+    Every transaction insert updates monthly_rollups in the same database
+    transaction, so aggregate reads cost one row per month and category
+    instead of a scan of the user's history.
+    """
+
+    @staticmethod
+    def month_key(date: datetime) -> str:
+        return date.strftime("%Y-%m")
+
+    @staticmethod
+    def shift_month(month: str, delta: int) -> str:
+        """Move a YYYY-MM key by `delta` months."""
+        year, month_num = map(int, month.split('-'))
+        index = year * 12 + (month_num - 1) + delta
+        return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+    @staticmethod
+    async def apply_transactions(db: AsyncSession, user_id: str, rows: List[Dict[str, Any]]):
+        """Fold newly inserted transaction rows into the rollups, without committing."""
+        totals: Dict[Tuple[str, str, str], List[float]] = defaultdict(lambda: [0.0, 0])
+        for row in rows:
+            key = (RollupService.month_key(row['date']), row['category'], row['transaction_type'])
+            totals[key][0] += row['amount']
+            totals[key][1] += 1
+
+        if not totals:
+            return
+
+        statement = sqlite_insert(MonthlyRollup).values([
+            {
+                'user_id': user_id,
+                'month': month,
+                'category': category,
+                'transaction_type': transaction_type,
+                'total_amount': total,
+                'transaction_count': count
+            }
+            for (month, category, transaction_type), (total, count) in totals.items()
+        ])
+        statement = statement.on_conflict_do_update(
+            index_elements=['user_id', 'month', 'category', 'transaction_type'],
+            set_={
+                'total_amount': MonthlyRollup.total_amount + statement.excluded.total_amount,
+                'transaction_count': MonthlyRollup.transaction_count + statement.excluded.transaction_count
+            }
+        )
+        await db.execute(statement)
+
+    @staticmethod
+    def rebuild_statements(user_id: Optional[str] = None):
+        """DELETE and INSERT ... SELECT statements that recompute rollups from transactions."""
+        clear = delete(MonthlyRollup)
+        source = select(
+            Transaction.user_id,
+            func.strftime('%Y-%m', Transaction.date),
+            Transaction.category,
+            Transaction.transaction_type,
+            func.sum(Transaction.amount),
+            func.count(Transaction.id)
+        )
+        if user_id:
+            clear = clear.where(MonthlyRollup.user_id == user_id)
+            source = source.where(Transaction.user_id == user_id)
+        source = source.group_by(
+            Transaction.user_id,
+            func.strftime('%Y-%m', Transaction.date),
+            Transaction.category,
+            Transaction.transaction_type
+        )
+
+        fill = sqlite_insert(MonthlyRollup).from_select(
+            ['user_id', 'month', 'category', 'transaction_type', 'total_amount', 'transaction_count'],
+            source
+        )
+        return clear, fill
+
+    @staticmethod
+    async def rebuild(db: AsyncSession, user_id: Optional[str] = None):
+        """Recompute rollups for one user, or everyone, from the transactions table."""
+        for statement in RollupService.rebuild_statements(user_id):
+            await db.execute(statement)
+        await db.commit()
+
+    @staticmethod
+    def rebuild_sync(connection):
+        for statement in RollupService.rebuild_statements():
+            connection.execute(statement)
+
+    @staticmethod
+    async def get_rollups(db: AsyncSession, user_id: str) -> List[MonthlyRollup]:
+        result = await db.execute(
+            select(MonthlyRollup)
+            .where(MonthlyRollup.user_id == user_id)
+            .order_by(MonthlyRollup.month)
+        )
+        return result.scalars().all()
+
+    @staticmethod
+    async def get_category_totals(
+        db: AsyncSession,
+        user_id: str,
+        start_month: str,
+        end_month: Optional[str] = None,
+        transaction_type: str = 'expense'
+    ) -> Dict[str, Tuple[float, int]]:
+        """Sum and count per category over an inclusive month range (open-ended if no end)."""
+        conditions = [
+            MonthlyRollup.user_id == user_id,
+            MonthlyRollup.transaction_type == transaction_type,
+            MonthlyRollup.month >= start_month
+        ]
+        if end_month:
+            conditions.append(MonthlyRollup.month <= end_month)
+
+        result = await db.execute(
+            select(
+                MonthlyRollup.category,
+                func.sum(MonthlyRollup.total_amount).label('total'),
+                func.sum(MonthlyRollup.transaction_count).label('count')
+            )
+            .where(and_(*conditions))
+            .group_by(MonthlyRollup.category)
+        )
+        return {row.category: (float(row.total), int(row.count)) for row in result}
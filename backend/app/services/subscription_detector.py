@@ -122,44 +122,53 @@ class SubscriptionDetector:
         return result.scalars().all()
 
     @staticmethod
-    async def identify_gray_charges(db: AsyncSession, user_id: str = None) -> List[Dict[str, Any]]:
-        recurring = await SubscriptionDetector.get_all_recurring(db, user_id)
-
-        gray_charges = []
+    def gray_charge(charge: RecurringCharge) -> Optional[Dict[str, Any]]:
+        """Describe a recurring charge as a gray charge, or None if it looks intentional."""
         suspicious_keywords = ['trial', 'premium', 'pro', 'plus', 'subscription',
                               'monthly', 'annual', 'membership', 'service']
 
-        for charge in recurring:
-            is_suspicious = False
-            reasons = []
+        is_suspicious = False
+        reasons = []
 
-            merchant_lower = charge.merchant.lower()
-            for keyword in suspicious_keywords:
-                if keyword in merchant_lower:
-                    is_suspicious = True
-                    reasons.append(f"Contains keyword: {keyword}")
-                    break
-
-            if charge.average_amount < 10:
+        merchant_lower = charge.merchant.lower()
+        for keyword in suspicious_keywords:
+            if keyword in merchant_lower:
                 is_suspicious = True
-                reasons.append("Small recurring amount (possible forgotten subscription)")
-
-            if charge.confidence_score > 0.9 and charge.frequency_days in [28, 29, 30, 31]:
-                reasons.append("Monthly subscription pattern detected")
-
-            if charge.confidence_score > 0.9 and charge.frequency_days in [365, 366]:
-                reasons.append("Annual subscription pattern detected")
-
-            if is_suspicious or reasons:
-                gray_charges.append({
-                    'merchant': charge.merchant,
-                    'average_amount': charge.average_amount,
-                    'frequency_days': charge.frequency_days,
-                    'last_charge_date': charge.last_charge_date,
-                    'next_expected_date': charge.next_expected_date,
-                    'reasons': reasons,
-                    'confidence_score': charge.confidence_score
-                })
+                reasons.append(f"Contains keyword: {keyword}")
+                break
+
+        if charge.average_amount < 10:
+            is_suspicious = True
+            reasons.append("Small recurring amount (possible forgotten subscription)")
+
+        if charge.confidence_score > 0.9 and charge.frequency_days in [28, 29, 30, 31]:
+            reasons.append("Monthly subscription pattern detected")
+
+        if charge.confidence_score > 0.9 and charge.frequency_days in [365, 366]:
+            reasons.append("Annual subscription pattern detected")
+
+        if not (is_suspicious or reasons):
+            return None
+
+        return {
+            'merchant': charge.merchant,
+            'average_amount': charge.average_amount,
+            'frequency_days': charge.frequency_days,
+            'last_charge_date': charge.last_charge_date,
+            'next_expected_date': charge.next_expected_date,
+            'reasons': reasons,
+            'confidence_score': charge.confidence_score
+        }
+
+    @staticmethod
+    async def identify_gray_charges(db: AsyncSession, user_id: str = None) -> List[Dict[str, Any]]:
+        recurring = await SubscriptionDetector.get_all_recurring(db, user_id)
+
+        gray_charges = []
+        for charge in recurring:
+            gray_charge = SubscriptionDetector.gray_charge(charge)
+            if gray_charge:
+                gray_charges.append(gray_charge)
 
         return gray_charges
 
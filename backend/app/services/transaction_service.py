@@ -1,47 +1,213 @@
 import csv
+import hashlib
 import json
+import re
+import warnings
+import numpy as np
 import pandas as pd
+from pandas.tseries.api import guess_datetime_format
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Callable
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, update, delete, bindparam, and_, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.config import settings
 from app.models import Transaction
+from app.services.rollup_service import RollupService
+from app.services.dashboard_cache import data_versions
 from app.schemas import TransactionCreate
 from io import StringIO
 
+REQUIRED_CSV_COLUMNS = ['date', 'amount', 'merchant', 'category']
+MAX_REPORTED_ROW_ERRORS = 10
+
+DATE_FORMAT_SAMPLE_SIZE = 100  # distinct date values used to pick a file's date format
+# strptime directives that read a value exactly as pd.to_datetime(value) does
+EXACT_DATE_DIRECTIVES = set('YmdHMSf')
+
 class TransactionService:
     @staticmethod
-    async def parse_csv(file_content: str) -> List[Dict[str, Any]]:
-        transactions = []
+    def infer_date_format(values: pd.Series) -> Optional[str]:
+        """Pick a strptime format for a date column that reads like the per-value parser.
+
+        Candidates are the month-first guesses for a sample of the column's
+        values. Only formats with a four-digit year and the month before the
+        day are kept, since those parse a value exactly as pd.to_datetime
+        does on its own, so ambiguous dates like 03/01/2024 stay month-first
+        even when other rows (13/02/2024) can only be day-first. The
+        candidate that parses the most samples wins.
+        """
+        samples = values.dropna().astype(str).str.strip().drop_duplicates().head(DATE_FORMAT_SAMPLE_SIZE)
+
+        candidates: List[str] = []
+        with warnings.catch_warnings():
+            # pandas warns when a value can only be read day-first; such guesses are dropped below
+            warnings.simplefilter('ignore', UserWarning)
+            for sample in samples:
+                date_format = guess_datetime_format(sample)
+                if date_format and date_format not in candidates:
+                    candidates.append(date_format)
+
+        best_format, best_count = None, 0
+        for date_format in candidates:
+            directives = re.findall(r'%(.)', date_format)
+            if not set(directives) <= EXACT_DATE_DIRECTIVES or 'Y' not in directives:
+                continue
+            if 'd' in directives and 'm' in directives and directives.index('d') < directives.index('m'):
+                continue
+            count = int(pd.to_datetime(samples, format=date_format, errors='coerce').notna().sum())
+            if count > best_count:
+                best_format, best_count = date_format, count
+        return best_format
+
+    @staticmethod
+    def parse_date_column(values: pd.Series, date_format: Optional[str] = None) -> pd.Series:
+        """Parse a whole date column at once, falling back per element for odd rows.
+
+        The format is inferred from the column unless the caller passes the
+        one already inferred for an earlier part of the same file. Values it
+        cannot read are parsed one at a time with pd.to_datetime, exactly as
+        the per-row import did.
+        """
+        if values.dtype != object:
+            return pd.to_datetime(values, errors='coerce')
+
+        date_format = date_format or TransactionService.infer_date_format(values)
+        if date_format:
+            parsed = pd.to_datetime(values, format=date_format, errors='coerce')
+        else:
+            parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+
+        retry = parsed.isna() & values.notna()
+        if retry.any():
+            with warnings.catch_warnings():
+                # Day-first fallbacks (13/02/2024) warn once per value
+                warnings.simplefilter('ignore', UserWarning)
+                parsed[retry] = values[retry].map(TransactionService.parse_date_value)
+        return parsed
+
+    @staticmethod
+    def parse_date_value(value: Any) -> Optional[pd.Timestamp]:
         try:
-            df = pd.read_csv(StringIO(file_content))
+            return pd.to_datetime(value)
+        except (ValueError, TypeError, OverflowError):
+            return pd.NaT
+
+    @staticmethod
+    def frame_to_transactions(
+        df: pd.DataFrame,
+        first_line: int = 2,
+        line_numbers: Optional[List[int]] = None,
+        date_format: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """Convert a CSV frame into transaction dicts column-wise.
+
+        Returns the valid transactions and one error per rejected row. Rows are
+        reported at `first_line + position`, or at `line_numbers[position]` when
+        the caller knows the exact file line of every row. Batches of one file
+        should share the `date_format` inferred from its first batch.
+        """
+        dates = TransactionService.parse_date_column(df['date'], date_format)
+        amounts = pd.to_numeric(df['amount'], errors='coerce').astype(float)
+        merchants = df['merchant'].astype(str)
+        categories = df['category'].astype(str)
+        if 'description' in df.columns:
+            descriptions = df['description'].astype(str)
+        else:
+            descriptions = pd.Series('', index=df.index)
+
+        checks = [
+            (dates.isna().to_numpy(), 'invalid date'),
+            (amounts.isna().to_numpy(), 'invalid amount'),
+            (df['merchant'].isna().to_numpy(), 'missing merchant'),
+            (df['category'].isna().to_numpy(), 'missing category'),
+        ]
+
+        invalid = np.zeros(len(df), dtype=bool)
+        for mask, _ in checks:
+            invalid |= mask
 
-            required_columns = ['date', 'amount', 'merchant', 'category']
-            if not all(col in df.columns for col in required_columns):
-                raise ValueError(f"CSV must contain columns: {required_columns}")
+        errors = []
+        for position in np.flatnonzero(invalid):
+            reasons = [reason for mask, reason in checks if mask[position]]
+            line = line_numbers[position] if line_numbers else first_line + position
+            errors.append(f"line {line}: {', '.join(reasons)}")
 
-            for _, row in df.iterrows():
-                transaction = {
-                    'date': pd.to_datetime(row['date']),
-                    'amount': float(row['amount']),
-                    'merchant': str(row['merchant']),
-                    'category': str(row['category']),
-                    'description': str(row.get('description', ''))
-                }
+        valid = ~invalid
+        amount_values = amounts.to_numpy()[valid]
+        is_income = amount_values < 0
+        transaction_types = np.where(is_income, 'income', 'expense').tolist()
+        amount_values = np.abs(amount_values).tolist()
+
+        transactions = [
+            {
+                'date': date,
+                'amount': amount,
+                'merchant': merchant,
+                'category': category,
+                'description': description,
+                'transaction_type': transaction_type
+            }
+            for date, amount, merchant, category, description, transaction_type in zip(
+                dates[valid].tolist(),
+                amount_values,
+                merchants[valid].tolist(),
+                categories[valid].tolist(),
+                descriptions[valid].tolist(),
+                transaction_types
+            )
+        ]
+
+        return transactions, errors
+
+    @staticmethod
+    async def parse_csv(file_content: str) -> List[Dict[str, Any]]:
+        try:
+            df = pd.read_csv(StringIO(file_content))
 
-                if transaction['amount'] < 0:
-                    transaction['transaction_type'] = 'income'
-                    transaction['amount'] = abs(transaction['amount'])
-                else:
-                    transaction['transaction_type'] = 'expense'
+            if not all(col in df.columns for col in REQUIRED_CSV_COLUMNS):
+                raise ValueError(f"CSV must contain columns: {REQUIRED_CSV_COLUMNS}")
 
-                transactions.append(transaction)
+            transactions, errors = TransactionService.frame_to_transactions(df)
 
         except Exception as e:
             raise ValueError(f"Failed to parse CSV: {str(e)}")
 
+        if errors:
+            shown = '; '.join(errors[:MAX_REPORTED_ROW_ERRORS])
+            more = len(errors) - MAX_REPORTED_ROW_ERRORS
+            suffix = f" (and {more} more)" if more > 0 else ""
+            raise ValueError(f"Failed to parse CSV: {len(errors)} invalid rows - {shown}{suffix}")
+
         return transactions
 
+    @staticmethod
+    def json_item_to_transaction(item: Any) -> Dict[str, Any]:
+        if not isinstance(item, dict):
+            raise ValueError(f"expected an object, got {type(item).__name__}")
+
+        try:
+            date = item['date']
+            if isinstance(date, str):
+                date = datetime.fromisoformat(date)
+            elif not isinstance(date, datetime):
+                raise ValueError(f"invalid date {date!r}: expected an ISO 8601 string")
+            transaction = {
+                'date': date,
+                'amount': float(item['amount']),
+                'merchant': str(item['merchant']),
+                'category': str(item['category']),
+                'description': str(item.get('description', '')),
+                'transaction_type': item.get('transaction_type', 'expense')
+            }
+        except KeyError as e:
+            raise ValueError(f"missing field {e}")
+
+        if transaction['amount'] < 0:
+            transaction['amount'] = abs(transaction['amount'])
+
+        return transaction
+
     @staticmethod
     async def parse_json(file_content: str) -> List[Dict[str, Any]]:
         try:
@@ -49,21 +215,7 @@ class TransactionService:
             if not isinstance(data, list):
                 data = [data]
 
-            transactions = []
-            for item in data:
-                transaction = {
-                    'date': datetime.fromisoformat(item['date']) if isinstance(item['date'], str) else item['date'],
-                    'amount': float(item['amount']),
-                    'merchant': str(item['merchant']),
-                    'category': str(item['category']),
-                    'description': str(item.get('description', '')),
-                    'transaction_type': item.get('transaction_type', 'expense')
-                }
-
-                if transaction['amount'] < 0:
-                    transaction['amount'] = abs(transaction['amount'])
-
-                transactions.append(transaction)
+            transactions = [TransactionService.json_item_to_transaction(item) for item in data]
 
         except Exception as e:
             raise ValueError(f"Failed to parse JSON: {str(e)}")
@@ -71,16 +223,179 @@ class TransactionService:
         return transactions
 
     @staticmethod
-    async def bulk_create(db: AsyncSession, transactions: List[Dict[str, Any]], user_id: str) -> int:
-        created_count = 0
-        for trans_data in transactions:
-            trans_data['user_id'] = user_id
-            transaction = Transaction(**trans_data)
-            db.add(transaction)
-            created_count += 1
+    def compute_fingerprint(
+        user_id: str,
+        date: datetime,
+        amount: float,
+        merchant: str,
+        description: Optional[str]
+    ) -> str:
+        """Content hash identifying a transaction across repeated imports."""
+        content = '|'.join([
+            user_id,
+            date.strftime('%Y-%m-%dT%H:%M:%S.%f'),
+            f"{float(amount):.2f}",
+            str(merchant).strip().lower(),
+            (description or '').strip().lower()
+        ])
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def backfill_fingerprints(connection):
+        """Fingerprint existing rows; later copies of a duplicate keep a NULL fingerprint."""
+        rows = connection.execute(
+            select(
+                Transaction.id, Transaction.user_id, Transaction.date,
+                Transaction.amount, Transaction.merchant, Transaction.description
+            ).order_by(Transaction.id)
+        )
+
+        seen = set()
+        updates = []
+        for row in rows:
+            fingerprint = TransactionService.compute_fingerprint(
+                row.user_id, row.date, row.amount, row.merchant, row.description
+            )
+            if (row.user_id, fingerprint) in seen:
+                continue
+            seen.add((row.user_id, fingerprint))
+            updates.append({'row_id': row.id, 'row_fingerprint': fingerprint})
+
+        if updates:
+            connection.execute(
+                update(Transaction)
+                .where(Transaction.id == bindparam('row_id'))
+                .values(fingerprint=bindparam('row_fingerprint')),
+                updates
+            )
+
+    @staticmethod
+    async def bulk_insert(
+        db: AsyncSession,
+        transactions: List[Dict[str, Any]],
+        user_id: str,
+        batch_size: Optional[int] = None,
+        return_ids: bool = False,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        import_job_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Insert transactions with Core executemany batches, without committing.
+
+        Skips ORM unit-of-work bookkeeping entirely; the caller owns the
+        transaction so several calls can be committed together, along with
+        the matching monthly rollup updates. Rows whose
+        fingerprint is already stored for the user, or repeated within the
+        input, are skipped by ON CONFLICT DO NOTHING; RETURNING tells which
+        rows were actually inserted. Rows are tagged with
+        `import_job_id` when a background import writes them. The progress
+        callback receives (rows processed so far, total rows).
+        """
+        batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+        # The unique (user_id, fingerprint) index does the duplicate check, so
+        # overlapping imports for one user skip each other's rows instead of failing
+        statement = (
+            sqlite_insert(Transaction)
+            .on_conflict_do_nothing(index_elements=['user_id', 'fingerprint'])
+            .returning(Transaction.id, Transaction.fingerprint)
+        )
+
+        total = len(transactions)
+        inserted = 0
+        duplicates = 0
+        ids: List[int] = []
+        seen = set()
+
+        for start in range(0, total, batch_size):
+            rows = []
+            for trans_data in transactions[start:start + batch_size]:
+                fingerprint = TransactionService.compute_fingerprint(
+                    user_id, trans_data['date'], trans_data['amount'],
+                    trans_data['merchant'], trans_data.get('description')
+                )
+                if fingerprint in seen:
+                    duplicates += 1
+                    continue
+                seen.add(fingerprint)
+                transaction_type = trans_data.get('transaction_type') or 'expense'
+                rows.append({
+                    'user_id': user_id,
+                    'date': trans_data['date'],
+                    'amount': trans_data['amount'],
+                    'merchant': trans_data['merchant'],
+                    'category': trans_data['category'],
+                    'description': trans_data.get('description'),
+                    'transaction_type': getattr(transaction_type, 'value', transaction_type),
+                    'fingerprint': fingerprint,
+                    'import_job_id': import_job_id
+                })
+
+            if rows:
+                result = await db.execute(statement, rows)
+                created = {fingerprint: row_id for row_id, fingerprint in result.all()}
+                duplicates += len(rows) - len(created)
+                rows = [row for row in rows if row['fingerprint'] in created]
+
+            if rows:
+                if return_ids:
+                    ids.extend(created[row['fingerprint']] for row in rows)
+                await RollupService.apply_transactions(db, user_id, rows)
+                data_versions.mark_changed(db, user_id)
+                inserted += len(rows)
+
+            if progress_callback:
+                progress_callback(min(start + batch_size, total), total)
+
+        return {'inserted': inserted, 'duplicates': duplicates, 'ids': ids}
+
+    @staticmethod
+    async def delete_import(db: AsyncSession, user_id: str, import_job_id: str) -> int:
+        """Remove every row a background import wrote and commit; returns how many.
+
+        The user's rollups are recomputed in the same transaction.
+        """
+        result = await db.execute(
+            delete(Transaction).where(and_(
+                Transaction.user_id == user_id,
+                Transaction.import_job_id == import_job_id
+            ))
+        )
+        data_versions.mark_changed(db, user_id)
+        await RollupService.rebuild(db, user_id)
+        return result.rowcount
+
+    @staticmethod
+    async def bulk_create(
+        db: AsyncSession,
+        transactions: List[Dict[str, Any]],
+        user_id: str,
+        batch_size: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> int:
+        result = await TransactionService.bulk_insert(
+            db, transactions, user_id, batch_size=batch_size, progress_callback=progress_callback
+        )
+        await db.commit()
+        return result['inserted']
 
+    @staticmethod
+    async def create_transaction(db: AsyncSession, transaction_data: Dict[str, Any], user_id: str) -> Transaction:
+        result = await TransactionService.bulk_insert(db, [transaction_data], user_id, return_ids=True)
         await db.commit()
-        return created_count
+        if result['ids']:
+            return await db.get(Transaction, result['ids'][0])
+
+        # Identical to a stored transaction; hand back the existing row
+        fingerprint = TransactionService.compute_fingerprint(
+            user_id, transaction_data['date'], transaction_data['amount'],
+            transaction_data['merchant'], transaction_data.get('description')
+        )
+        existing = await db.execute(
+            select(Transaction).where(and_(
+                Transaction.user_id == user_id,
+                Transaction.fingerprint == fingerprint
+            ))
+        )
+        return existing.scalar_one_or_none()
 
     @staticmethod
     async def get_all(db: AsyncSession, user_id: str, skip: int = 0, limit: int = 100) -> List[Transaction]:
@@ -113,84 +428,33 @@ class TransactionService:
 
     @staticmethod
     async def get_spending_overview(db: AsyncSession, user_id: str) -> Dict[str, Any]:
-        from datetime import datetime
-
-        # Get current month boundaries
-        now = datetime.utcnow()
-        month_start = datetime(now.year, now.month, 1)
-        if now.month == 12:
-            month_end = datetime(now.year + 1, 1, 1)
-        else:
-            month_end = datetime(now.year, now.month + 1, 1)
-
-        income_result = await db.execute(
-            select(func.sum(Transaction.amount))
-            .where(and_(
-                Transaction.user_id == user_id,
-                Transaction.transaction_type == 'income'
-            ))
-        )
-        total_income = income_result.scalar() or 0.0
-
-        expense_result = await db.execute(
-            select(func.sum(Transaction.amount))
-            .where(and_(
-                Transaction.user_id == user_id,
-                Transaction.transaction_type == 'expense'
-            ))
-        )
-        total_expenses = expense_result.scalar() or 0.0
-
-        # Get all-time categories for compatibility
-        category_result = await db.execute(
-            select(
-                Transaction.category,
-                func.sum(Transaction.amount).label('total')
-            )
-            .where(and_(
-                Transaction.user_id == user_id,
-                Transaction.transaction_type == 'expense'
-            ))
-            .group_by(Transaction.category)
-        )
-        categories = {row.category: float(row.total) for row in category_result}
-
-        # Get current month categories
-        current_month_result = await db.execute(
-            select(
-                Transaction.category,
-                func.sum(Transaction.amount).label('total')
-            )
-            .where(and_(
-                Transaction.user_id == user_id,
-                Transaction.transaction_type == 'expense',
-                Transaction.date >= month_start,
-                Transaction.date < month_end
-            ))
-            .group_by(Transaction.category)
-        )
-        current_month_categories = {row.category: float(row.total) for row in current_month_result}
-
-        monthly_result = await db.execute(
-            select(
-                func.strftime('%Y-%m', Transaction.date).label('month'),
-                Transaction.transaction_type,
-                func.sum(Transaction.amount).label('total')
-            )
-            .where(Transaction.user_id == user_id)
-            .group_by('month', Transaction.transaction_type)
-            .order_by('month')
-        )
+        current_month = RollupService.month_key(datetime.utcnow())
 
+        total_income = 0.0
+        total_expenses = 0.0
+        categories = {}
+        current_month_categories = {}
         monthly_data = {}
-        for row in monthly_result:
-            month = row.month
+
+        # One read of the monthly rollups covers every aggregate on the page
+        for rollup in await RollupService.get_rollups(db, user_id):
+            month = rollup.month
             if month not in monthly_data:
                 monthly_data[month] = {'month': month, 'income': 0, 'expenses': 0}
-            if row.transaction_type == 'income':
-                monthly_data[month]['income'] = float(row.total)
-            else:
-                monthly_data[month]['expenses'] = float(row.total)
+
+            if rollup.transaction_type == 'income':
+                total_income += rollup.total_amount
+                monthly_data[month]['income'] += rollup.total_amount
+                continue
+
+            monthly_data[month]['expenses'] += rollup.total_amount
+            if rollup.transaction_type == 'expense':
+                total_expenses += rollup.total_amount
+                categories[rollup.category] = categories.get(rollup.category, 0.0) + rollup.total_amount
+                if month == current_month:
+                    current_month_categories[rollup.category] = (
+                        current_month_categories.get(rollup.category, 0.0) + rollup.total_amount
+                    )
 
         return {
             'total_income': total_income,
@@ -199,4 +463,4 @@ class TransactionService:
             'categories': categories,
             'current_month_categories': current_month_categories,
             'monthly_trend': list(monthly_data.values())
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,95 @@
+"""
+Benchmark the batch budget forecaster against a per-budget Python loop
+Run with: python -m benchmarks.bench_budget_forecast [--users 100000] [--baseline-users 10000]
+"""
+
+import argparse
+import time
+import numpy as np
+from app.services.budget_forecaster import BudgetForecaster, OVERALL
+
+CATEGORIES = np.array(['grocery', 'restaurant', 'subscription', 'transport', 'shopping', 'utilities'], dtype=object)
+DAYS_ELAPSED = 17
+DAYS_IN_MONTH = 31
+
+def build_data(users: int, seed: int = 7):
+    """Grouped daily spend rows and budgets shaped like the nightly job's two queries."""
+    rng = np.random.default_rng(seed)
+    user_ids = np.array([f"user-{i}" for i in range(users)], dtype=object)
+
+    # Every user spends in every category on a random subset of the elapsed days
+    user_idx, category_idx, day = np.meshgrid(
+        np.arange(users), np.arange(len(CATEGORIES)), np.arange(1, DAYS_ELAPSED + 1), indexing='ij'
+    )
+    keep = rng.random(user_idx.shape) < 0.4
+    spend = {
+        'user_id': user_ids[user_idx[keep]],
+        'category': CATEGORIES[category_idx[keep]],
+        'day': day[keep].astype(np.int64),
+        'amount': rng.gamma(2.0, 15.0, keep.sum())
+    }
+
+    # Four category budgets and one overall budget per user
+    budget_categories = np.append(CATEGORIES[:4], OVERALL)
+    budgets = {
+        'user_id': np.repeat(user_ids, len(budget_categories)),
+        'category': np.tile(budget_categories, users),
+        'amount_monthly': rng.uniform(100, 600, users * len(budget_categories))
+    }
+    budgets['amount_monthly'][budgets['category'] == OVERALL] *= 6
+    return spend, budgets
+
+def forecast_loop(spend, budgets):
+    """Project each budget separately, the way a straightforward implementation would."""
+    daily = {}
+    for user_id, category, day, amount in zip(spend['user_id'], spend['category'], spend['day'], spend['amount']):
+        for key in ((user_id, category), (user_id, OVERALL)):
+            days = daily.setdefault(key, [0.0] * DAYS_ELAPSED)
+            days[day - 1] += amount
+
+    results = []
+    for user_id, category, limit in zip(budgets['user_id'], budgets['category'], budgets['amount_monthly']):
+        days = daily.get((user_id, category), [0.0] * DAYS_ELAPSED)
+        spent = 0.0
+        overspend_day = 0
+        for day, amount in enumerate(days, start=1):
+            spent += amount
+            if not overspend_day and spent > limit:
+                overspend_day = day
+        rate = spent / DAYS_ELAPSED
+        projected = spent + rate * (DAYS_IN_MONTH - DAYS_ELAPSED)
+        if not overspend_day and projected > limit:
+            overspend_day = DAYS_ELAPSED + int((limit - spent) // rate) + 1
+        results.append((spent, projected, overspend_day))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=100_000)
+    parser.add_argument('--baseline-users', type=int, default=10_000)
+    args = parser.parse_args()
+
+    spend, budgets = build_data(args.users)
+    started = time.perf_counter()
+    forecast = BudgetForecaster.forecast_rows(spend, budgets, DAYS_ELAPSED, DAYS_IN_MONTH)
+    vectorized = time.perf_counter() - started
+
+    baseline_spend, baseline_budgets = build_data(args.baseline_users)
+    started = time.perf_counter()
+    loop_results = forecast_loop(baseline_spend, baseline_budgets)
+    loop = time.perf_counter() - started
+
+    check = BudgetForecaster.forecast_rows(baseline_spend, baseline_budgets, DAYS_ELAPSED, DAYS_IN_MONTH)
+    assert np.allclose(check['projected'], [projected for _, projected, _ in loop_results])
+    assert (check['overspend_day'] == [day for _, _, day in loop_results]).all()
+
+    at_risk = int((forecast['overspend_day'] > 0).sum())
+    vectorized_rate = args.users / vectorized
+    loop_rate = args.baseline_users / loop
+    print(f"{args.users:,} users, {len(budgets['user_id']):,} budgets, {len(spend['day']):,} spend rows")
+    print(f"vectorized: {vectorized:.2f}s ({vectorized_rate:,.0f} users/s), {at_risk:,} budgets projected to overspend")
+    print(f"loop ({args.baseline_users:,} users): {loop:.2f}s ({loop_rate:,.0f} users/s)")
+    print(f"speedup: {vectorized_rate / loop_rate:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark ORM per-row inserts against the Core executemany path on SQLite
+Run with: python -m benchmarks.bench_bulk_insert [--sizes 10000 100000]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.models import Base, Transaction, User
+from app.services.transaction_service import TransactionService
+
+def build_transactions(rows: int):
+    start = datetime(2024, 1, 1)
+    return [
+        {
+            'date': start + timedelta(minutes=i * 7),
+            'amount': float(i % 250) + 0.99,
+            'merchant': f"Merchant {i % 40}",
+            'category': f"category-{i % 9}",
+            'description': f"Purchase {i}",
+            'transaction_type': 'expense'
+        }
+        for i in range(rows)
+    ]
+
+async def orm_bulk_create(db: AsyncSession, transactions, user_id: str) -> int:
+    """The original one-ORM-object-per-row implementation, kept as the baseline."""
+    created_count = 0
+    for trans_data in transactions:
+        db.add(Transaction(**trans_data, user_id=user_id))
+        created_count += 1
+    await db.commit()
+    return created_count
+
+async def run(rows: int, use_core: bool) -> float:
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    transactions = build_transactions(rows)
+    async with session_factory() as db:
+        db.add(User(id='bench-user', email='bench@example.com', hashed_password='x'))
+        await db.commit()
+
+        started = time.perf_counter()
+        if use_core:
+            await TransactionService.bulk_create(db, transactions, 'bench-user')
+        else:
+            await orm_bulk_create(db, transactions, 'bench-user')
+        elapsed = time.perf_counter() - started
+
+    await engine.dispose()
+    os.remove(path)
+    return rows / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'ORM rows/s':>12} {'Core rows/s':>12} {'speedup':>9}")
+    for rows in args.sizes:
+        orm_rate = asyncio.run(run(rows, use_core=False))
+        core_rate = asyncio.run(run(rows, use_core=True))
+        print(f"{rows:>10} {orm_rate:>12,.0f} {core_rate:>12,.0f} {core_rate / orm_rate:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark the column-wise CSV import against the original per-row loop
+Run with: python -m benchmarks.bench_csv_import [--sizes 10000 100000 1000000]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+from io import StringIO
+import pandas as pd
+from app.services.transaction_service import TransactionService
+
+MERCHANTS = ['Whole Foods', 'Starbucks', 'Netflix', 'Uber', 'Amazon', 'Payroll Inc']
+CATEGORIES = ['grocery', 'restaurant', 'subscription', 'transport', 'shopping', 'income']
+
+def build_csv(rows: int) -> str:
+    start = datetime(2024, 1, 1)
+    lines = ['date,amount,merchant,category,description']
+    for i in range(rows):
+        date = start + timedelta(minutes=i * 7)
+        amount = -round(random.uniform(1000, 5000), 2) if i % 15 == 0 else round(random.uniform(2, 300), 2)
+        merchant = random.choice(MERCHANTS)
+        lines.append(f"{date.strftime('%Y-%m-%d %H:%M:%S')},{amount},{merchant},{random.choice(CATEGORIES)},{merchant} purchase")
+    return '\n'.join(lines) + '\n'
+
+def parse_csv_iterrows(file_content: str):
+    """The original row-at-a-time implementation, kept here as the baseline."""
+    transactions = []
+    df = pd.read_csv(StringIO(file_content))
+    for _, row in df.iterrows():
+        transaction = {
+            'date': pd.to_datetime(row['date']),
+            'amount': float(row['amount']),
+            'merchant': str(row['merchant']),
+            'category': str(row['category']),
+            'description': str(row.get('description', ''))
+        }
+        if transaction['amount'] < 0:
+            transaction['transaction_type'] = 'income'
+            transaction['amount'] = abs(transaction['amount'])
+        else:
+            transaction['transaction_type'] = 'expense'
+        transactions.append(transaction)
+    return transactions
+
+# Ambiguous and mixed dates: the vectorized path must read each one as pd.to_datetime(value) does
+EQUIVALENCE_DATES = [
+    '13/02/2024', '03/01/2024', '02/03/2024', '12/31/2023 10:00', '1/2/2024', '03/04/70',
+    '2024-01-05', '2024-01-05 10:30:00', 'Jan 5 2024', '05-01-2024', '20240102'
+]
+
+def check_equivalence():
+    content = 'date,amount,merchant,category,description\n' + ''.join(
+        f'"{date}",{i + 1},Shop,shopping,x\n' for i, date in enumerate(EQUIVALENCE_DATES)
+    )
+    assert asyncio.run(TransactionService.parse_csv(content)) == parse_csv_iterrows(content), \
+        "vectorized dates differ from the per-row path"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    check_equivalence()
+    random.seed(42)
+    print(f"{'rows':>10} {'iterrows (s)':>14} {'vectorized (s)':>16} {'speedup':>9}")
+    for rows in args.sizes:
+        content = build_csv(rows)
+
+        started = time.perf_counter()
+        baseline = parse_csv_iterrows(content)
+        baseline_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        vectorized = asyncio.run(TransactionService.parse_csv(content))
+        vectorized_seconds = time.perf_counter() - started
+
+        assert vectorized == baseline, "vectorized output differs from the per-row path"
+        print(f"{rows:>10} {baseline_seconds:>14.2f} {vectorized_seconds:>16.2f} {baseline_seconds / vectorized_seconds:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 import random
 import json
 from passlib.context import CryptContext
+from app.services.transaction_service import TransactionService
 
 # Use bcrypt for password hashing (same as the app)
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -105,6 +106,12 @@ def create_demo_user():
         """, (alert_id, user_id, alert_type, title, description, metadata,
               datetime.now() - timedelta(hours=random.randint(1, 48))))
 
+    # Seed the unread counter the alert endpoints read instead of counting alerts
+    cursor.execute("""
+        INSERT INTO alert_counters (user_id, unread_count)
+        SELECT user_id, COUNT(*) FROM alerts WHERE user_id = ? AND is_read = 0 GROUP BY user_id
+    """, (user_id,))
+
     print(f"Created {len(alerts)} alerts")
 
     # Create recurring charges (subscriptions)
@@ -261,18 +268,36 @@ def create_demo_user():
     # Sort transactions by date
     transactions.sort(key=lambda x: x['date'])
 
-    # Insert transactions into database
+    # Insert transactions into database, fingerprinted like imports so re-uploads are deduplicated
+    inserted = 0
+    fingerprints = set()
     for trans in transactions:
+        fingerprint = TransactionService.compute_fingerprint(
+            user_id, trans['date'], trans['amount'], trans['merchant'], trans['description']
+        )
+        if fingerprint in fingerprints:
+            continue
+        fingerprints.add(fingerprint)
         cursor.execute("""
             INSERT INTO transactions (user_id, date, amount, merchant, category, description,
                                     transaction_type, is_recurring, is_anomaly, anomaly_score,
-                                    created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                                    fingerprint, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, (user_id, trans['date'], trans['amount'], trans['merchant'], trans['category'],
               trans['description'], trans['transaction_type'], trans.get('is_recurring', False),
-              False, 0.0, datetime.utcnow(), datetime.utcnow()))
+              False, 0.0, fingerprint, datetime.utcnow(), datetime.utcnow()))
+        inserted += 1
 
-    print(f"Created {len(transactions)} transactions")
+    print(f"Created {inserted} transactions")
+
+    # Fill the monthly rollups the dashboard reads from
+    cursor.execute("""
+        INSERT INTO monthly_rollups (user_id, month, category, transaction_type, total_amount, transaction_count)
+        SELECT user_id, strftime('%Y-%m', date), category, transaction_type, SUM(amount), COUNT(id)
+        FROM transactions
+        WHERE user_id = ?
+        GROUP BY strftime('%Y-%m', date), category, transaction_type
+    """, (user_id,))
 
     # Commit all changes
     conn.commit()
@@ -281,7 +306,7 @@ def create_demo_user():
     print("\n✅ Demo user created successfully!")
     print(f"Email: {email}")
     print(f"Password: {password}")
-    print(f"Total transactions: {len(transactions)}")
+    print(f"Total transactions: {inserted}")
     print(f"Date range: {start_date.date()} to {current_date.date()}")
 
 if __name__ == "__main__":
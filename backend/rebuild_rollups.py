@@ -0,0 +1,26 @@
+"""
+Recompute the monthly rollup table from transactions
+Run with: python rebuild_rollups.py [--user-id USER_ID]
+"""
+
+import argparse
+import asyncio
+from app.database import AsyncSessionLocal, init_db
+from app.services.rollup_service import RollupService
+
+async def main(user_id=None):
+    await init_db()
+    scope = f"user {user_id}" if user_id else "all users"
+    print(f"Rebuilding monthly rollups for {scope}...")
+    try:
+        async with AsyncSessionLocal() as db:
+            await RollupService.rebuild(db, user_id)
+        print("✓ Monthly rollups rebuilt")
+    except Exception as e:
+        print(f"❌ Error rebuilding rollups: {e}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute monthly rollups from transactions")
+    parser.add_argument("--user-id", help="Only rebuild this user's rollups")
+    args = parser.parse_args()
+    asyncio.run(main(args.user_id))
@@ -0,0 +1,24 @@
+"""
+Repair per-user unread alert counters that drifted from the alerts table
+Run with: python reconcile_alert_counters.py
+"""
+
+import asyncio
+from app.database import AsyncSessionLocal, init_db
+from app.services.alert_service import AlertService
+
+async def main():
+    await init_db()
+    print("Reconciling unread alert counters...")
+    try:
+        async with AsyncSessionLocal() as db:
+            drift = await AlertService.reconcile_unread_counts(db)
+        if drift:
+            print(f"✓ Repaired counters for {drift} users")
+        else:
+            print("✓ All counters match")
+    except Exception as e:
+        print(f"❌ Error reconciling counters: {e}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
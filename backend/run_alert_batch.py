@@ -0,0 +1,38 @@
+"""
+Generate alerts for every active user, resuming an interrupted run
+Run with: python run_alert_batch.py [--chunk-size 500] [--concurrency 8] [--restart]
+
+Alerts written here bump the users' rows in data_versions, so running API
+workers drop their cached dashboards on the next request. Open alert
+streams are only fed by the process that writes the alert, so they do
+not receive these.
+"""
+
+import argparse
+import asyncio
+import logging
+from app.database import init_db
+from app.services.alert_batch import AlertBatchRunner
+
+async def main(chunk_size=None, concurrency=None, restart=False):
+    await init_db()
+    print("Generating alerts for all users...")
+    try:
+        report = await AlertBatchRunner.run(chunk_size, concurrency, resume=not restart)
+        if report["resumed_after"]:
+            print(f"Resumed after user {report['resumed_after']}")
+        print(
+            f"✓ {report['users']} users ({report['failed']} failed) in {report['seconds']:.1f}s, "
+            f"{report['users_per_second']:.1f} users/s"
+        )
+    except Exception as e:
+        print(f"❌ Error generating alerts: {e}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate alerts for all active users")
+    parser.add_argument("--chunk-size", type=int, help="Users fetched and checkpointed at a time")
+    parser.add_argument("--concurrency", type=int, help="Users evaluated at once")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint of an unfinished run")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    asyncio.run(main(args.chunk_size, args.concurrency, args.restart))
@@ -0,0 +1,46 @@
+"""
+Project every active budget to month end and report the ones at risk
+Run with: python run_budget_forecast.py [--as-of 2024-03-17] [--top 20]
+"""
+
+import argparse
+import asyncio
+from datetime import datetime
+import numpy as np
+from app.database import AsyncSessionLocal, init_db
+from app.services.budget_forecaster import BudgetForecaster, OVERALL
+
+async def main(as_of=None, top=20):
+    await init_db()
+    as_of = as_of or datetime.utcnow()
+    print(f"Forecasting budgets as of {as_of.date()}...")
+    try:
+        async with AsyncSessionLocal() as db:
+            forecast = await BudgetForecaster.forecast_all(db, as_of)
+
+        at_risk = np.flatnonzero(forecast['overspend_day'] > 0)
+        over = np.count_nonzero(forecast['spent'] > forecast['amount_monthly'])
+        users = len(np.unique(forecast['user_id'][at_risk]))
+        print(
+            f"✓ {len(forecast['budget_id'])} budgets: {len(at_risk)} projected to overspend "
+            f"({over} already over) across {users} users"
+        )
+
+        # Soonest overspend first, then by how far past the limit the projection lands
+        overshoot = forecast['projected'][at_risk] - forecast['amount_monthly'][at_risk]
+        order = at_risk[np.lexsort((-overshoot, forecast['overspend_day'][at_risk]))]
+        for i in order[:top]:
+            category = forecast['category'][i] if forecast['category'][i] != OVERALL else "overall"
+            print(
+                f"  day {forecast['overspend_day'][i]:>2}  user {forecast['user_id'][i]}  {category}: "
+                f"${forecast['projected'][i]:,.2f} projected of ${forecast['amount_monthly'][i]:,.2f}"
+            )
+    except Exception as e:
+        print(f"❌ Error forecasting budgets: {e}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Project all active budgets to month end")
+    parser.add_argument("--as-of", type=datetime.fromisoformat, help="Forecast as of this date (default: today)")
+    parser.add_argument("--top", type=int, default=20, help="At-risk budgets to list")
+    args = parser.parse_args()
+    asyncio.run(main(args.as_of, args.top))
@@ -0,0 +1,36 @@
+import asyncio
+import os
+import tempfile
+import uuid
+
+# Settings are read at import time, so point the app at a scratch database first
+_db_dir = tempfile.mkdtemp(prefix="nudget-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(_db_dir, 'test.db')}"
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("ENCRYPTION_KEY", "test-encryption-key")
+
+import pytest
+from app.database import AsyncSessionLocal, engine, init_db
+from app.models import User
+from app.services.alert_scheduler import alert_scheduler
+
+@pytest.fixture(scope="session")
+def run():
+    """Run a coroutine on the one event loop the pooled aiosqlite connections belong to."""
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(init_db())
+    yield loop.run_until_complete
+    loop.run_until_complete(alert_scheduler.shutdown())
+    loop.run_until_complete(engine.dispose())
+    loop.close()
+
+@pytest.fixture
+def user_id(run) -> str:
+    """A fresh user, so tests sharing the database never see each other's rows."""
+    async def create() -> str:
+        async with AsyncSessionLocal() as db:
+            user = User(email=f"{uuid.uuid4()}@example.com", hashed_password="x", name="Test")
+            db.add(user)
+            await db.commit()
+            return user.id
+    return run(create())
@@ -0,0 +1,88 @@
+import uuid
+import pytest
+from sqlalchemy import select
+from app.database import AsyncSessionLocal
+from app.models import JobCheckpoint, User
+from app.services.alert_batch import CHECKPOINT_NAME, AlertBatchRunner
+from app.services.alert_service import AlertService
+
+async def active_user_ids():
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(User.id).where(User.is_active == True).order_by(User.id))
+        return list(result.scalars().all())
+
+async def create_users(count):
+    async with AsyncSessionLocal() as db:
+        db.add_all([
+            User(email=f"{uuid.uuid4()}@example.com", hashed_password="x", name="Batch")
+            for _ in range(count)
+        ])
+        await db.commit()
+
+async def checkpoint():
+    async with AsyncSessionLocal() as db:
+        return await db.get(JobCheckpoint, CHECKPOINT_NAME)
+
+def test_interrupted_run_resumes_after_checkpoint(run, monkeypatch):
+    run(create_users(7))
+    all_users = run(active_user_ids())
+    processed = []
+
+    async def generate_all_alerts(db, user_id):
+        processed.append(user_id)
+
+    monkeypatch.setattr(AlertService, "generate_all_alerts", generate_all_alerts)
+
+    # The third chunk lookup fails, as if the database went away mid-run
+    next_chunk = AlertBatchRunner._next_chunk
+    calls = []
+
+    async def failing_next_chunk(after_user_id, chunk_size):
+        calls.append(after_user_id)
+        if len(calls) == 3:
+            raise RuntimeError("database unavailable")
+        return await next_chunk(after_user_id, chunk_size)
+
+    monkeypatch.setattr(AlertBatchRunner, "_next_chunk", failing_next_chunk)
+    with pytest.raises(RuntimeError):
+        run(AlertBatchRunner.run(chunk_size=3, concurrency=2, resume=False))
+
+    first_run = list(processed)
+    assert first_run == all_users[:6]
+    saved = run(checkpoint())
+    assert saved.last_user_id == all_users[5]
+    assert saved.users_processed == 6
+    assert saved.completed_at is None
+
+    monkeypatch.setattr(AlertBatchRunner, "_next_chunk", next_chunk)
+    processed.clear()
+    report = run(AlertBatchRunner.run(chunk_size=3, concurrency=2))
+
+    assert report["resumed_after"] == all_users[5]
+    assert processed == all_users[6:]
+    assert report["users"] == len(all_users) - 6
+    assert sorted(first_run + processed) == all_users
+
+    saved = run(checkpoint())
+    assert saved.last_user_id is None
+    assert saved.users_processed == len(all_users)
+    assert saved.completed_at is not None
+
+    # A finished run leaves nothing to resume: the next one starts over
+    processed.clear()
+    report = run(AlertBatchRunner.run(chunk_size=3))
+    assert report["resumed_after"] is None
+    assert processed == all_users
+
+def test_failed_users_are_counted_and_skipped(run, monkeypatch):
+    all_users = run(active_user_ids())
+
+    async def generate_all_alerts(db, user_id):
+        if user_id == all_users[0]:
+            raise ValueError("bad data")
+
+    monkeypatch.setattr(AlertService, "generate_all_alerts", generate_all_alerts)
+    report = run(AlertBatchRunner.run(chunk_size=4, resume=False))
+
+    assert report["users"] == len(all_users)
+    assert report["failed"] == 1
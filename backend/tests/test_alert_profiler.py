@@ -0,0 +1,107 @@
+import asyncio
+from datetime import datetime
+import httpx
+from sqlalchemy import func, select, text
+from app.auth import create_access_token
+from app.database import AsyncSessionLocal
+from app.main import app
+from app.models import Alert
+from app.schemas import BudgetCreate
+from app.services.alert_profiler import AlertRunProfile
+from app.services.alert_rules import RULES, AlertRuleEngine
+from app.services.budget_service import BudgetService
+from app.services.transaction_service import TransactionService
+
+SNAPSHOT_STEPS = ["monthly_totals", "budgets", "goals", "recurring_charges", "recent_alerts", "savings_rate"]
+
+async def profiled_selects(profile, name, count, pause=0.0):
+    async with AsyncSessionLocal() as db:
+        await db.execute(text("SELECT 1"))  # outside any step, not counted
+        with profile.step(name, "snapshot"):
+            for _ in range(count):
+                await db.execute(text("SELECT 1"))
+                await asyncio.sleep(pause)
+
+def test_statements_are_counted_per_step(run):
+    profile = AlertRunProfile("u1")
+    run(profiled_selects(profile, "three", 3))
+    run(profiled_selects(profile, "none", 0))
+
+    assert [(step["name"], step["statements"]) for step in profile.steps] == [("three", 3), ("none", 0)]
+    assert profile.to_dict()["statements"] == 3
+
+def test_concurrent_runs_keep_separate_counts(run):
+    first, second = AlertRunProfile("u1"), AlertRunProfile("u2")
+
+    async def both():
+        # Interleaved on one loop: each statement must land in its own run's step
+        await asyncio.gather(
+            profiled_selects(first, "step", 4, pause=0.001),
+            profiled_selects(second, "step", 7, pause=0.001)
+        )
+
+    run(both())
+    assert first.steps[0]["statements"] == 4
+    assert second.steps[0]["statements"] == 7
+
+async def seed_over_budget(user_id):
+    now = datetime.utcnow()
+    async with AsyncSessionLocal() as db:
+        await TransactionService.bulk_insert(db, [
+            {"date": now.replace(day=1), "amount": 180.0, "merchant": "Bistro", "category": "dining",
+             "transaction_type": "expense"}
+        ], user_id)
+        await db.commit()
+        await BudgetService.create_budget(db, BudgetCreate(category="dining", amount_monthly=100), user_id)
+
+async def dry_run(user_id, groups=None):
+    async with AsyncSessionLocal() as db:
+        return await AlertRuleEngine.dry_run(db, user_id, groups)
+
+async def alert_count(user_id):
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(select(func.count()).where(Alert.user_id == user_id))
+
+def test_dry_run_profile_counts_statements_per_generator(run, user_id):
+    run(seed_over_budget(user_id))
+    result = run(dry_run(user_id))
+
+    steps = {step["name"]: step for step in result["steps"]}
+    assert [step["name"] for step in result["steps"]] == SNAPSHOT_STEPS + list(RULES)
+    # The snapshot takes one query per step; rules only read the snapshot
+    assert {name: steps[name]["statements"] for name in SNAPSHOT_STEPS} == dict.fromkeys(SNAPSHOT_STEPS, 1)
+    assert {name: steps[name]["statements"] for name in RULES} == dict.fromkeys(RULES, 0)
+    assert result["statements"] == len(SNAPSHOT_STEPS)
+    assert steps["budgets"]["rows_read"] == 1
+
+    assert result["dry_run"] is True
+    assert steps["budget_usage"]["candidates"] == len(result["alerts"]["budget_usage"]) >= 1
+    assert run(alert_count(user_id)) == 0
+
+def test_dry_run_group_filter(run, user_id):
+    run(seed_over_budget(user_id))
+    result = run(dry_run(user_id, ["budget"]))
+
+    budget_rules = [name for name, (group, _) in RULES.items() if group == "budget"]
+    assert list(result["alerts"]) == budget_rules
+    assert [step["name"] for step in result["steps"] if step["kind"] == "rule"] == budget_rules
+
+def test_dry_run_endpoint_under_concurrent_requests(run, user_id):
+    run(seed_over_budget(user_id))
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user_id})}"}
+
+    async def requests():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*[
+                client.get("/api/alerts/dry-run", headers=headers) for _ in range(4)
+            ])
+
+    responses = run(requests())
+    for response in responses:
+        assert response.status_code == 200
+        body = response.json()
+        assert body["user_id"] == user_id
+        assert body["statements"] == len(SNAPSHOT_STEPS)
+        assert sum(step["statements"] for step in body["steps"] if step["kind"] == "rule") == 0
+    assert run(alert_count(user_id)) == 0
@@ -0,0 +1,46 @@
+import asyncio
+from app.services.alert_scheduler import AlertScheduler
+from app.services.alert_service import AlertService
+
+def record_runs(monkeypatch, duration=0.0):
+    runs = []
+
+    async def generate_all_alerts(db, user_id):
+        runs.append(user_id)
+        await asyncio.sleep(duration)
+
+    monkeypatch.setattr(AlertService, "generate_all_alerts", generate_all_alerts)
+    return runs
+
+async def settle(scheduler):
+    while scheduler._tasks:
+        await asyncio.gather(*scheduler._tasks.values())
+
+def test_triggers_within_the_window_share_one_run(run, monkeypatch):
+    runs = record_runs(monkeypatch)
+    scheduler = AlertScheduler(debounce_seconds=0.05)
+
+    async def burst():
+        for _ in range(5):
+            scheduler.trigger("u1")
+            await asyncio.sleep(0.005)
+        scheduler.trigger("u2")
+        await settle(scheduler)
+
+    run(burst())
+    assert sorted(runs) == ["u1", "u2"]
+
+def test_triggers_during_a_run_cause_one_follow_up(run, monkeypatch):
+    runs = record_runs(monkeypatch, duration=0.05)
+    scheduler = AlertScheduler(debounce_seconds=0.01)
+
+    async def overlapping():
+        scheduler.trigger("u1")
+        await asyncio.sleep(0.03)  # first run is in progress
+        scheduler.trigger("u1")
+        scheduler.trigger("u1")
+        await settle(scheduler)
+
+    run(overlapping())
+    assert runs == ["u1", "u1"]
+    assert not scheduler._tasks
@@ -0,0 +1,51 @@
+import asyncio
+import json
+import httpx
+from app.auth import create_access_token
+from app.main import app
+from app.services.alert_generation_service import AlertGenerationService
+from app.services.alert_hub import alert_hub
+from app.database import AsyncSessionLocal
+
+def request(run, method, url, **kwargs):
+    async def go():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await client.request(method, url, **kwargs)
+    return run(go())
+
+def bearer(token):
+    return {"Authorization": f"Bearer {token}"}
+
+def test_stream_tokens_are_not_access_tokens(run, user_id):
+    access_token = create_access_token({"sub": user_id})
+    response = request(run, "POST", "/api/alerts/stream-token", headers=bearer(access_token))
+    assert response.status_code == 200
+    stream_token = response.json()["token"]
+
+    # A stream token cannot call the API, and an access token cannot go in the URL
+    assert request(run, "GET", "/api/alerts/", headers=bearer(stream_token)).status_code == 401
+    assert request(run, "GET", "/api/alerts/stream", params={"token": access_token}).status_code == 401
+    assert request(run, "GET", "/api/alerts/stream").status_code == 401
+
+def test_worker_stats_are_limited_to_ops_accounts(run, user_id):
+    headers = bearer(create_access_token({"sub": user_id}))
+    assert request(run, "GET", "/api/alerts/stream/stats", headers=headers).status_code == 403
+    assert request(run, "GET", "/api/dashboard/cache-stats", headers=headers).status_code == 403
+
+def test_written_alerts_reach_open_streams(run, user_id):
+    queue = alert_hub.subscribe(user_id)
+    try:
+        async def write():
+            async with AsyncSessionLocal() as db:
+                return await AlertGenerationService.write_alerts(db, user_id, [
+                    AlertGenerationService.build_candidate("GOAL_PROGRESS", "Halfway there", "d")
+                ])
+
+        created = run(write())
+        event = run(asyncio.wait_for(queue.get(), 1))
+        assert event.startswith(f"id: {created[0].id}\nevent: alert\n")
+        assert json.loads(event.split("data: ", 1)[1])["title"] == "Halfway there"
+        assert queue.empty()
+    finally:
+        alert_hub.unsubscribe(user_id, queue)
+    assert alert_hub.stats() == {"users": 0, "subscribers": 0}
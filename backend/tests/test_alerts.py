@@ -0,0 +1,86 @@
+from sqlalchemy import func, select
+from app.database import AsyncSessionLocal
+from app.models import Alert
+from app.schemas import AlertCreate
+from app.services.alert_generation_service import AlertGenerationService
+from app.services.alert_service import AlertService
+
+def call(run, method, *args):
+    """Run one AlertService/AlertGenerationService call on its own session."""
+    async def go():
+        async with AsyncSessionLocal() as db:
+            return await method(db, *args)
+    return run(go())
+
+def unread(run, user_id):
+    """The stored counter and the count it stands in for."""
+    async def go():
+        async with AsyncSessionLocal() as db:
+            counted = await db.scalar(
+                select(func.count()).where(Alert.user_id == user_id, Alert.is_read == False)
+            )
+            return await AlertService.get_unread_count(db, user_id), counted
+    return run(go())
+
+def create(run, user_id, alert_type="BUDGET_WARNING", title="Over budget"):
+    alert = AlertCreate(type=alert_type, title=title, description="d", metadata={"category": "dining"})
+    return call(run, AlertService.create_alert, alert, user_id)
+
+def test_unread_counter_through_create_mark_and_delete(run, user_id):
+    alerts = [create(run, user_id, title=f"Alert {i}") for i in range(4)]
+    create(run, user_id, alert_type="ANOMALY", title="Odd charge")
+    assert unread(run, user_id) == (5, 5)
+
+    assert call(run, AlertService.mark_alerts_read, [alerts[0].id, alerts[0].id], user_id) == 1
+    assert call(run, AlertService.mark_alerts_read, [alerts[0].id], user_id) == 0
+    assert unread(run, user_id) == (4, 4)
+
+    assert call(run, AlertService.mark_read_by_type, user_id, "ANOMALY") == 1
+    assert unread(run, user_id) == (3, 3)
+
+    # One read and one unread alert deleted: only the unread one comes off the counter
+    assert call(run, AlertService.delete_alerts, [alerts[0].id, alerts[1].id], user_id) == 2
+    assert unread(run, user_id) == (2, 2)
+
+    assert call(run, AlertService.mark_all_read, user_id) == 2
+    assert unread(run, user_id) == (0, 0)
+
+def test_unread_counter_never_goes_negative(run, user_id):
+    async def adjust(delta):
+        async with AsyncSessionLocal() as db:
+            await AlertService.adjust_unread_count(db, user_id, delta)
+            await db.commit()
+
+    run(adjust(-2))
+    assert unread(run, user_id)[0] == 0
+    run(adjust(3))
+    run(adjust(-5))
+    assert unread(run, user_id)[0] == 0
+
+def test_reconcile_repairs_drift(run, user_id):
+    create(run, user_id)
+
+    async def drift():
+        async with AsyncSessionLocal() as db:
+            await AlertService.adjust_unread_count(db, user_id, 4)
+            await db.commit()
+
+    run(drift())
+    assert unread(run, user_id) == (5, 1)
+    assert call(run, AlertService.reconcile_unread_counts) >= 1
+    assert unread(run, user_id) == (1, 1)
+
+def test_write_alerts_skips_unread_duplicates(run, user_id):
+    def candidates(*titles):
+        return [AlertGenerationService.build_candidate("GOAL_PROGRESS", title, "d") for title in titles]
+
+    created = call(run, AlertGenerationService.write_alerts, user_id, candidates("Goal A", "Goal B", "Goal A"))
+    assert sorted(alert.title for alert in created) == ["Goal A", "Goal B"]
+    assert call(run, AlertGenerationService.write_alerts, user_id, candidates("Goal A", "Goal B")) == []
+    assert unread(run, user_id) == (2, 2)
+
+    # Once read, the same alert may be raised again
+    call(run, AlertService.mark_all_read, user_id)
+    created = call(run, AlertGenerationService.write_alerts, user_id, candidates("Goal A"))
+    assert [alert.title for alert in created] == ["Goal A"]
+    assert unread(run, user_id) == (1, 1)
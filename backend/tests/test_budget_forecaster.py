@@ -0,0 +1,93 @@
+import uuid
+from datetime import date, datetime
+import pytest
+from app.database import AsyncSessionLocal
+from app.models import User
+from app.schemas import BudgetCreate
+from app.services.budget_forecaster import BudgetForecaster
+from app.services.budget_service import BudgetService
+from app.services.transaction_service import TransactionService
+
+AS_OF = datetime(2024, 3, 10, 15, 30)  # 10 days elapsed of 31
+
+async def seed(user_id, budgets, spend):
+    async with AsyncSessionLocal() as db:
+        await TransactionService.bulk_insert(db, [
+            {"date": when, "amount": amount, "merchant": f"{category} {i}", "category": category,
+             "transaction_type": transaction_type}
+            for i, (when, amount, category, transaction_type) in enumerate(spend)
+        ], user_id)
+        await db.commit()
+        for category, amount in budgets:
+            await BudgetService.create_budget(db, BudgetCreate(category=category, amount_monthly=amount), user_id)
+
+async def create_user():
+    async with AsyncSessionLocal() as db:
+        user = User(email=f"{uuid.uuid4()}@example.com", hashed_password="x", name="Other")
+        db.add(user)
+        await db.commit()
+        return user.id
+
+async def forecast_user(user_id):
+    async with AsyncSessionLocal() as db:
+        return await BudgetForecaster.forecast_user(db, user_id, AS_OF)
+
+async def forecast_all():
+    async with AsyncSessionLocal() as db:
+        return await BudgetForecaster.forecast_all(db, AS_OF)
+
+SPEND = [
+    (datetime(2024, 2, 27), 90.0, "dining", "expense"),     # previous month
+    (datetime(2024, 3, 2), 30.0, "dining", "expense"),
+    (datetime(2024, 3, 3), 60.0, "transport", "expense"),
+    (datetime(2024, 3, 5), 50.0, "dining", "expense"),
+    (datetime(2024, 3, 8), 200.0, "shopping", "expense"),   # no budget of its own, counts towards overall
+    (datetime(2024, 3, 9), 1500.0, "salary", "income"),
+    (datetime(2024, 3, 11), 500.0, "dining", "expense"),    # after as_of
+]
+BUDGETS = [("dining", 100.0), ("transport", 300.0), (None, 400.0)]
+
+# Hand-computed from SPEND over days 1-10 of March, projected over 31 days:
+#   dining     spent  80, 8/day  -> 80 + 8 * 21 = 248, over 100 on day 10 + floor(20 / 8) + 1 = 13
+#   transport  spent  60, 6/day  -> 60 + 6 * 21 = 186, stays under 300
+#   overall    spent 340, 34/day -> 340 + 34 * 21 = 1054, over 400 on day 10 + floor(60 / 34) + 1 = 12
+EXPECTED = {
+    "dining": (80.0, 8.0, 248.0, date(2024, 3, 13)),
+    "transport": (60.0, 6.0, 186.0, None),
+    None: (340.0, 34.0, 1054.0, date(2024, 3, 12)),
+}
+
+def test_forecast_user_matches_hand_computed_values(run, user_id):
+    run(seed(user_id, BUDGETS, SPEND))
+    forecasts = {forecast["category"]: forecast for forecast in run(forecast_user(user_id))}
+
+    assert set(forecasts) == set(EXPECTED)
+    for category, (spent, burn_rate, projected, overspend_date) in EXPECTED.items():
+        forecast = forecasts[category]
+        assert forecast["spent_amount"] == pytest.approx(spent)
+        assert forecast["daily_burn_rate"] == pytest.approx(burn_rate)
+        assert forecast["projected_amount"] == pytest.approx(projected)
+        assert forecast["projected_overspend"] == pytest.approx(max(projected - forecast["budgeted_amount"], 0.0))
+        assert forecast["overspend_date"] == overspend_date
+
+def test_forecast_all_matches_hand_computed_values(run, user_id):
+    run(seed(user_id, BUDGETS, SPEND))
+    # Already over its limit on day 1
+    other_id = run(create_user())
+    run(seed(other_id, [("dining", 50.0)], [(datetime(2024, 3, 1), 60.0, "dining", "expense")]))
+
+    batch = run(forecast_all())
+    rows = {
+        (batch["user_id"][i], batch["category"][i]): (
+            batch["spent"][i], batch["burn_rate"][i], batch["projected"][i], int(batch["overspend_day"][i])
+        )
+        for i in range(len(batch["budget_id"]))
+        if batch["user_id"][i] in (user_id, other_id)
+    }
+
+    assert rows == pytest.approx({
+        (user_id, "dining"): (80.0, 8.0, 248.0, 13),
+        (user_id, "transport"): (60.0, 6.0, 186.0, 0),
+        (user_id, ""): (340.0, 34.0, 1054.0, 12),
+        (other_id, "dining"): (60.0, 6.0, 186.0, 1),
+    })
@@ -0,0 +1,77 @@
+from datetime import datetime
+from app.database import AsyncSessionLocal
+from app.schemas import BudgetCreate
+from app.services.budget_service import BudgetService
+from app.services.transaction_service import TransactionService
+
+TRANSACTIONS = [
+    # (date, amount, category, type)
+    (datetime(2023, 12, 20), 70.0, "dining", "expense"),  # before the range
+    (datetime(2024, 1, 5), 30.0, "dining", "expense"),
+    (datetime(2024, 1, 18), 20.0, "dining", "expense"),
+    (datetime(2024, 1, 9), 100.0, "transport", "expense"),
+    (datetime(2024, 1, 31), 1000.0, "salary", "income"),
+    (datetime(2024, 2, 14), 90.0, "dining", "expense"),
+    (datetime(2024, 4, 2), 45.0, "transport", "expense"),
+    (datetime(2024, 4, 3), 12.0, "shopping", "expense"),
+]
+
+async def seed(user_id):
+    async with AsyncSessionLocal() as db:
+        await TransactionService.bulk_insert(db, [
+            {"date": date, "amount": amount, "merchant": f"{category} {i}", "category": category,
+             "transaction_type": transaction_type}
+            for i, (date, amount, category, transaction_type) in enumerate(TRANSACTIONS)
+        ], user_id)
+        await db.commit()
+
+        for category, amount in (("dining", 100.0), ("transport", 200.0), (None, 500.0), ("shopping", 50.0)):
+            budget = await BudgetService.create_budget(db, BudgetCreate(category=category, amount_monthly=amount), user_id)
+        await BudgetService.delete_budget(db, budget.id, user_id)  # inactive budgets are left out
+
+async def history(user_id, start_month, end_month):
+    async with AsyncSessionLocal() as db:
+        return await BudgetService.calculate_budget_usage_history(db, user_id, start_month, end_month)
+
+async def usage(user_id, month):
+    async with AsyncSessionLocal() as db:
+        return await BudgetService.calculate_budget_usage(db, user_id, month)
+
+def by_category(result, matrix):
+    columns = [budget["category"] for budget in result["budgets"]]
+    return {category: [round(row[i], 6) for row in result[matrix]] for i, category in enumerate(columns)}
+
+def test_usage_history_matrix(run, user_id):
+    run(seed(user_id))
+    result = run(history(user_id, "2024-01", "2024-04"))
+
+    assert result["months"] == ["2024-01", "2024-02", "2024-03", "2024-04"]
+    assert sorted((b["category"] or "", b["budgeted_amount"], b["currency"]) for b in result["budgets"]) == [
+        ("", 500.0, "USD"), ("dining", 100.0, "USD"), ("transport", 200.0, "USD")
+    ]
+
+    assert by_category(result, "spent") == {
+        "dining": [50.0, 90.0, 0.0, 0.0],
+        "transport": [100.0, 0.0, 0.0, 45.0],
+        None: [150.0, 90.0, 0.0, 57.0],
+    }
+    assert by_category(result, "percent_used") == {
+        "dining": [50.0, 90.0, 0.0, 0.0],
+        "transport": [50.0, 0.0, 0.0, 22.5],
+        None: [30.0, 18.0, 0.0, 11.4],
+    }
+
+def test_usage_history_matches_single_month_usage(run, user_id):
+    run(seed(user_id))
+    result = run(history(user_id, "2023-12", "2024-02"))
+    spent = by_category(result, "spent")
+
+    for column, month in enumerate(["2023-12", "2024-1", "2024-02"]):
+        for item in run(usage(user_id, month)):
+            assert spent[item["category"]][column] == item["spent_amount"]
+
+def test_usage_history_without_budgets(run, user_id):
+    result = run(history(user_id, "2024-11", "2025-02"))
+    assert result["months"] == ["2024-11", "2024-12", "2025-01", "2025-02"]
+    assert result["budgets"] == []
+    assert result["spent"] == [[], [], [], []]
@@ -0,0 +1,70 @@
+from datetime import datetime
+import pytest
+from app.services.import_service import ImportService
+from app.services.transaction_service import TransactionService
+
+CSV_HEADER = "date,amount,merchant,category,description\n"
+
+def parse(run, rows):
+    return run(TransactionService.parse_csv(CSV_HEADER + rows))
+
+def test_dates_read_like_the_per_row_parser(run):
+    # 13/02/2024 can only be day-first; the ambiguous dates around it stay month-first
+    transactions = parse(run, "03/01/2024,1,A,food,x\n13/02/2024,2,B,food,x\n02/03/2024,3,C,food,x\n")
+    assert [t["date"] for t in transactions] == [
+        datetime(2024, 3, 1), datetime(2024, 2, 13), datetime(2024, 2, 3)
+    ]
+
+def test_mixed_date_formats(run):
+    transactions = parse(run, '2024-01-05,1,A,food,x\n"2024-01-05 10:30:00",2,B,food,x\n"Jan 6 2024",3,C,food,x\n')
+    assert [t["date"] for t in transactions] == [
+        datetime(2024, 1, 5), datetime(2024, 1, 5, 10, 30), datetime(2024, 1, 6)
+    ]
+
+def test_negative_amounts_are_income(run):
+    income, expense = parse(run, "2024-01-05,-2500,Payroll,income,x\n2024-01-06,12.5,Cafe,dining,x\n")
+    assert (income["amount"], income["transaction_type"]) == (2500.0, "income")
+    assert (expense["amount"], expense["transaction_type"]) == (12.5, "expense")
+
+def test_invalid_rows_are_reported_by_line(run):
+    with pytest.raises(ValueError, match="2 invalid rows - line 3: invalid date; line 4: invalid amount"):
+        parse(run, "2024-01-05,1,A,food,x\nnot a date,2,B,food,x\n2024-01-06,abc,C,food,x\n")
+
+def test_missing_columns(run):
+    with pytest.raises(ValueError, match="must contain columns"):
+        run(TransactionService.parse_csv("a,b\n1,2\n"))
+
+async def chunks(text, size=7):
+    for start in range(0, len(text), size):
+        yield text[start:start + size]
+
+async def csv_batches(text, batch_size=None, size=7):
+    return [batch async for batch in ImportService.iter_csv_batches(chunks(text, size), batch_size)]
+
+def test_streamed_batches_match_parse_csv(run):
+    rows = "".join(f"2024-01-{day:02d},{day}.5,Shop {day},shopping,x\n" for day in range(1, 29))
+    batches = run(csv_batches(CSV_HEADER + rows, batch_size=10))
+    assert [number for number, _, _ in batches] == [1, 2, 3]
+    assert [t for _, transactions, _ in batches for t in transactions] == parse(run, rows)
+
+def test_streamed_date_format_is_kept_across_batches(run):
+    batches = run(csv_batches(CSV_HEADER + "02/03/2024,10,A,food,x\n13/02/2024,5,B,food,y\n", batch_size=1))
+    assert [batch[1][0]["date"] for batch in batches] == [datetime(2024, 2, 3), datetime(2024, 2, 13)]
+
+def test_streamed_quoted_newline_and_bad_rows(run):
+    text = (
+        CSV_HEADER
+        + '03/01/2024,10,A,food,"multi\nline"\n'
+        + "not a date,5,B,food,x\n"
+        + "03/01/2024,abc,C,food,\n"
+        + "03/01/2024,-7,D,food,y\n"
+    )
+    (_, transactions, errors), = run(csv_batches(text, size=3))
+    assert [t["merchant"] for t in transactions] == ["A", "D"]
+    assert transactions[0]["description"] == "multi\nline"
+    assert (transactions[1]["amount"], transactions[1]["transaction_type"]) == (7.0, "income")
+    assert errors == ["line 4: invalid date", "line 5: invalid amount"]
+
+def test_streamed_missing_columns(run):
+    with pytest.raises(ValueError, match="must contain columns"):
+        run(csv_batches("a,b\n1,2\n"))
@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta
+from pydantic import BaseModel
+from app.database import AsyncSessionLocal
+from app.schemas import AlertCreate, AlertType, BudgetCreate, GoalCreate
+from app.services.alert_service import AlertService
+from app.services.budget_service import BudgetService
+from app.services.dashboard_cache import DashboardCache, data_versions
+from app.services.goal_service import GoalService
+from app.services.transaction_service import TransactionService
+
+class Payload(BaseModel):
+    text: str
+
+async def version(user_id):
+    async with AsyncSessionLocal() as db:
+        return await data_versions.get(db, user_id)
+
+async def create_transaction(user_id):
+    async with AsyncSessionLocal() as db:
+        await TransactionService.create_transaction(db, {
+            "date": datetime(2024, 3, 1), "amount": 12.0, "merchant": "Shop",
+            "category": "shopping", "transaction_type": "expense"
+        }, user_id)
+
+async def create_budget(user_id):
+    async with AsyncSessionLocal() as db:
+        budget = await BudgetService.create_budget(db, BudgetCreate(category="dining", amount_monthly=200), user_id)
+        return budget.id
+
+async def delete_budget(user_id, budget_id):
+    async with AsyncSessionLocal() as db:
+        await BudgetService.delete_budget(db, budget_id, user_id)
+
+async def create_goal(user_id):
+    async with AsyncSessionLocal() as db:
+        await GoalService.create_goal(db, GoalCreate(
+            name="Trip", target_amount=1000, deadline=datetime.utcnow() + timedelta(days=90)
+        ), user_id)
+
+async def create_alert(user_id):
+    async with AsyncSessionLocal() as db:
+        await AlertService.create_alert(db, AlertCreate(
+            type=AlertType.SUMMARY, title="Summary", description="Monthly summary"
+        ), user_id)
+
+def test_every_kind_of_write_bumps_the_version(run, user_id):
+    assert run(version(user_id)) == 0
+
+    run(create_transaction(user_id))
+    assert run(version(user_id)) == 1
+
+    budget_id = run(create_budget(user_id))
+    assert run(version(user_id)) == 2
+    run(delete_budget(user_id, budget_id))
+    assert run(version(user_id)) == 3
+
+    run(create_goal(user_id))
+    assert run(version(user_id)) == 4
+
+    run(create_alert(user_id))
+    assert run(version(user_id)) == 5
+
+def test_rolled_back_write_keeps_the_version(run, user_id):
+    async def rolled_back():
+        async with AsyncSessionLocal() as db:
+            await data_versions.get(db, user_id)  # opens the transaction
+            data_versions.mark_changed(db, user_id)
+            await db.rollback()
+            await db.commit()
+
+    run(rolled_back())
+    assert run(version(user_id)) == 0
+
+def test_write_invalidates_cached_payload(run, user_id):
+    cache = DashboardCache(max_entries=10, max_bytes=10_000)
+    cache.put(user_id, run(version(user_id)), "2024-03", Payload(text="before"))
+    assert cache.get(user_id, run(version(user_id)), "2024-03") == Payload(text="before")
+
+    run(create_goal(user_id))
+    assert cache.get(user_id, run(version(user_id)), "2024-03") is None
+    assert cache.stats()["invalidations"] == 1
+    assert cache.stats()["entries"] == 0
+
+def test_new_month_invalidates_cached_payload():
+    cache = DashboardCache(max_entries=10, max_bytes=10_000)
+    cache.put("u1", 3, "2024-03", Payload(text="march"))
+    assert cache.get("u1", 3, "2024-04") is None
+    assert cache.stats()["invalidations"] == 1
+
+def test_lru_evicts_by_entry_count():
+    cache = DashboardCache(max_entries=2, max_bytes=10_000)
+    cache.put("a", 1, "2024-03", Payload(text="a"))
+    cache.put("b", 1, "2024-03", Payload(text="b"))
+    assert cache.get("a", 1, "2024-03") is not None  # "b" is now least recently used
+    cache.put("c", 1, "2024-03", Payload(text="c"))
+
+    assert cache.get("b", 1, "2024-03") is None
+    assert cache.get("a", 1, "2024-03") is not None
+    assert cache.get("c", 1, "2024-03") is not None
+    assert cache.stats()["evictions"] == 1
+
+def test_lru_evicts_by_serialized_size():
+    size = len(Payload(text="x" * 100).model_dump_json())
+    cache = DashboardCache(max_entries=10, max_bytes=size * 2)
+    for user in ("a", "b", "c"):
+        cache.put(user, 1, "2024-03", Payload(text=user * 100))
+
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["bytes"] == size * 2
+    assert cache.get("a", 1, "2024-03") is None
+    assert cache.stats()["evictions"] == 1
+
+    # A payload larger than the whole budget is never cached
+    cache.put("d", 1, "2024-03", Payload(text="d" * 1000))
+    assert cache.get("d", 1, "2024-03") is None
+    assert cache.stats()["entries"] == 2
@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta
+import numpy as np
+from app.database import AsyncSessionLocal
+from app.models import Goal
+from app.services.goal_simulator import GoalSimulator
+from app.services.rollup_service import RollupService
+from app.services.transaction_service import TransactionService
+
+def months_needed_by_loop(samples, target):
+    """Reference: walk each trajectory month by month."""
+    needed = []
+    for trajectory in samples:
+        if target <= 0:
+            needed.append(0)
+            continue
+        balance, best = 0.0, -np.inf
+        for month, amount in enumerate(trajectory, start=1):
+            balance += amount
+            best = max(best, balance)
+            if best >= target:
+                needed.append(month)
+                break
+        else:
+            needed.append(np.inf)
+    return np.array(needed, dtype=float)
+
+def test_constant_history_gives_exact_months():
+    result = GoalSimulator.simulate(np.array([100.0, 100.0, 100.0]), np.array([250.0, 1000.0, 0.0, -5.0]), 50, 120, seed=1)
+
+    for p in ("p10", "p50", "p90"):
+        assert result[p].tolist() == [3, 10, 0, 0]
+
+def test_seeded_percentiles_match_month_by_month_walk():
+    history = np.array([0.0, 50.0, 120.0, -30.0, 400.0])
+    targets = np.array([300.0, 900.0, 0.0])
+    result = GoalSimulator.simulate(history, targets, 500, 60, seed=42)
+
+    samples = np.random.default_rng(42).choice(history, size=(500, 60))
+    for i, target in enumerate(targets):
+        expected = months_needed_by_loop(samples, target)
+        expected[expected > 60] = np.inf
+        assert np.array_equal(result["months_needed"][i], expected)
+        for p in (10, 50, 90):
+            assert result[f"p{p}"][i] == np.quantile(expected, p / 100, method="higher")
+        assert result["p10"][i] <= result["p50"][i] <= result["p90"][i]
+
+    again = GoalSimulator.simulate(history, targets, 500, 60, seed=42)
+    assert np.array_equal(again["months_needed"], result["months_needed"])
+
+def test_history_without_positive_savings_never_completes():
+    result = GoalSimulator.simulate(np.array([-50.0, 0.0, -20.0]), np.array([100.0, 0.0]), 200, 120, seed=3)
+
+    assert np.isinf(result["months_needed"][0]).all()
+    assert np.isinf([result["p10"][0], result["p50"][0], result["p90"][0]]).all()
+    assert (result["months_needed"][1] == 0).all()
+
+async def seed_months(user_id, net_by_month_ago):
+    """One income and one expense in each of the given complete months before this one."""
+    current_month = RollupService.month_key(datetime.utcnow())
+    transactions = []
+    for months_ago, (income, expense) in net_by_month_ago.items():
+        year, month = map(int, RollupService.shift_month(current_month, -months_ago).split("-"))
+        day = datetime(year, month, 15)
+        if income:
+            transactions.append({"date": day, "amount": income, "merchant": "Employer",
+                                 "category": "salary", "transaction_type": "income"})
+        if expense:
+            transactions.append({"date": day, "amount": expense, "merchant": "Landlord",
+                                 "category": "housing", "transaction_type": "expense"})
+    async with AsyncSessionLocal() as db:
+        await TransactionService.bulk_insert(db, transactions, user_id)
+        await db.commit()
+
+async def simulate_goals(user_id, goals):
+    async with AsyncSessionLocal() as db:
+        return await GoalSimulator.simulate_goals(db, user_id, goals, trajectories=200, seed=7)
+
+def goal(target, current, days_to_deadline):
+    return Goal(name="Goal", target_amount=target, current_amount=current,
+                deadline=datetime.utcnow() + timedelta(days=days_to_deadline))
+
+def test_simulate_goals_dates_from_known_history(run, user_id):
+    run(seed_months(user_id, {4: (1000.0, 600.0), 3: (1000.0, 600.0), 2: (1000.0, 600.0), 1: (1000.0, 600.0)}))
+    goals = [goal(2000.0, 800.0, 100), goal(2000.0, 800.0, 60), goal(500.0, 500.0, 30)]
+    simulations = run(simulate_goals(user_id, goals))
+    today = datetime.utcnow().date()
+
+    # 400 saved every month: 1200 left takes 3 months, the completed goal none
+    in_three_months, too_soon, already_done = simulations
+    for p in (10, 50, 90):
+        assert in_three_months[f"p{p}_completion_date"].date() == today + timedelta(days=90)
+        assert already_done[f"p{p}_completion_date"].date() == today
+    assert in_three_months["history_months"] == 4
+    assert in_three_months["probability_by_deadline"] == 1.0
+    assert too_soon["probability_by_deadline"] == 0.0  # deadline in 2 months
+    assert already_done["probability_by_deadline"] == 1.0
+
+def test_simulate_goals_without_positive_savings(run, user_id):
+    run(seed_months(user_id, {3: (0, 250.0), 2: (100.0, 100.0), 1: (0, 80.0)}))
+    simulations = run(simulate_goals(user_id, [goal(1000.0, 0.0, 365), goal(300.0, 300.0, 365)]))
+
+    never, done = simulations
+    assert all(never[f"p{p}_completion_date"] is None for p in (10, 50, 90))
+    assert never["probability_by_deadline"] == 0.0
+    assert done["probability_by_deadline"] == 1.0
+
+def test_simulate_goals_needs_enough_history(run, user_id):
+    run(seed_months(user_id, {2: (1000.0, 100.0), 1: (1000.0, 100.0)}))
+    assert run(simulate_goals(user_id, [goal(1000.0, 0.0, 365)])) == [None]
@@ -0,0 +1,71 @@
+import asyncio
+import json
+import os
+import tempfile
+from sqlalchemy import select, func
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models import Transaction
+from app.services.rollup_service import RollupService
+from app.services.import_jobs import ImportJobManager
+
+ITEMS = [
+    {"date": f"2024-01-{day:02d}", "amount": -10.0 * day, "merchant": f"Shop {day}", "category": "shopping"}
+    for day in range(1, 6)
+]
+
+async def import_files(user_id, uploads):
+    work_dir = tempfile.mkdtemp()
+    files = []
+    for position, (name, text) in enumerate(uploads):
+        extension = name.split('.')[-1]
+        path = os.path.join(work_dir, f"upload-{position}.{extension}")
+        with open(path, 'w') as fh:
+            fh.write(text)
+        files.append((name, extension, path))
+    manager = ImportJobManager(1)
+    job = manager.submit(user_id, work_dir, files)
+    await asyncio.gather(*manager._tasks)
+    return job
+
+async def count_rows(user_id):
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(select(func.count(Transaction.id)).where(Transaction.user_id == user_id))
+
+async def rollup_count(user_id):
+    async with AsyncSessionLocal() as db:
+        return sum(rollup.transaction_count for rollup in await RollupService.get_rollups(db, user_id))
+
+def test_successful_job_commits_every_batch(run, user_id, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 2)
+    job = run(import_files(user_id, [("upload.json", json.dumps(ITEMS))]))
+
+    assert job.status == "completed"
+    assert job.batches == 3
+    assert job.rows_inserted == 5
+    assert run(count_rows(user_id)) == 5
+    assert run(rollup_count(user_id)) == 5
+    assert not os.path.exists(job.work_dir)
+
+def test_failed_job_removes_committed_batches(run, user_id, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 2)
+    # The first two batches are committed before the parser reaches the broken tail
+    text = json.dumps(ITEMS)[:-1] + ", oops]"
+    job = run(import_files(user_id, [("upload.json", text)]))
+
+    assert job.status == "failed"
+    assert job.error.startswith("Failed to parse JSON")
+    assert job.batches == 2
+    assert job.rows_inserted == 0
+    assert run(count_rows(user_id)) == 0
+    assert run(rollup_count(user_id)) == 0
+
+def test_multi_file_job_commits_every_batch(run, user_id, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 2)
+    csv_text = "date,amount,merchant,category\n2024-02-01,-4.5,Bakery,dining\n"
+    job = run(import_files(user_id, [("a.json", json.dumps(ITEMS)), ("b.csv", csv_text)]))
+
+    assert job.status == "completed"
+    assert job.batches == 3
+    assert job.rows_inserted == 6
+    assert run(count_rows(user_id)) == 6
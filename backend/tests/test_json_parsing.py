@@ -0,0 +1,72 @@
+import json
+import pytest
+from app.services.import_service import ImportService
+from app.services.transaction_service import TransactionService
+
+async def chunks(text, size=7):
+    for start in range(0, len(text), size):
+        yield text[start:start + size]
+
+async def json_batches(text, newline_delimited=False, size=7):
+    return [
+        batch async for batch in
+        ImportService.iter_json_batches(chunks(text, size), newline_delimited=newline_delimited)
+    ]
+
+async def collect(iterator):
+    return [value async for value in iterator]
+
+ITEMS = [
+    {"date": "2024-01-02T10:30:00", "amount": -12.5, "merchant": 'Café "Q"', "category": "dining"},
+    {"date": "2024-01-03", "amount": 1e3, "merchant": "Salary", "category": "income", "transaction_type": "income"},
+    {"date": "2024-01-04", "amount": 10.25, "merchant": "Shop", "category": "shopping", "description": "x"},
+]
+
+def test_array_any_chunk_size(run):
+    text = json.dumps(ITEMS)
+    expected = run(TransactionService.parse_json(text))
+    for size in range(1, len(text) + 1):
+        batches = run(json_batches(text, size=size))
+        assert [t for _, transactions, _ in batches for t in transactions] == expected
+
+def test_numbers_split_across_chunks(run):
+    text = "[10.5, -7e+2, 3]"
+    for size in range(1, len(text) + 1):
+        values = run(collect(ImportService.iter_json_array(chunks(text, size))))
+        assert values == [10.5, -700.0, 3]
+
+def test_syntax_error_fails_without_reading_the_rest(run):
+    read = 0
+
+    async def counted(text):
+        nonlocal read
+        async for chunk in chunks(text, 64):
+            read += 1
+            yield chunk
+
+    text = '[{"date": "2024-01-02", "amount": }, ' + '{"x": 1}, ' * 1000 + "]"
+    with pytest.raises(ValueError, match="item 1"):
+        run(collect(ImportService.iter_json_array(counted(text))))
+    assert read == 1
+
+def test_oversized_item_fails(run, monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "UPLOAD_CHUNK_SIZE", 64)
+    text = '["' + "x" * 1000 + '"]'
+    with pytest.raises(ValueError, match="larger than 256 characters"):
+        run(collect(ImportService.iter_json_array(chunks(text, 64))))
+
+def test_item_errors_are_reported(run):
+    items = [ITEMS[0], {**ITEMS[1], "date": 12345}, {"amount": 1}]
+    (_, transactions, errors), = run(json_batches(json.dumps(items)))
+    assert len(transactions) == 1
+    assert errors == [
+        "item 2: invalid date 12345: expected an ISO 8601 string",
+        "item 3: missing field 'date'",
+    ]
+
+def test_ndjson_bad_line_only_loses_that_line(run):
+    text = "\n".join([json.dumps(ITEMS[0]), "{bad", "", json.dumps(ITEMS[2])]) + "\n"
+    (_, transactions, errors), = run(json_batches(text, newline_delimited=True))
+    assert [t["merchant"] for t in transactions] == ['Café "Q"', "Shop"]
+    assert len(errors) == 1 and errors[0].startswith("line 2: invalid JSON")
@@ -0,0 +1,91 @@
+import asyncio
+from datetime import datetime, timedelta
+from sqlalchemy import func, select
+from app.database import AsyncSessionLocal
+from app.models import Transaction
+from app.services.rollup_service import RollupService
+from app.services.transaction_service import TransactionService
+
+def make_transactions(count, start=datetime(2024, 1, 1)):
+    categories = ["grocery", "dining", "transport", "salary"]
+    return [
+        {
+            "date": start + timedelta(hours=7 * i),
+            "amount": round(5 + (i * 37 % 500) / 10, 2),
+            "merchant": f"Merchant {i % 13}",
+            "category": categories[i % 4],
+            "description": f"purchase {i}",
+            "transaction_type": "income" if i % 4 == 3 else "expense",
+        }
+        for i in range(count)
+    ]
+
+async def insert(user_id, transactions, batch_size=None):
+    async with AsyncSessionLocal() as db:
+        result = await TransactionService.bulk_insert(db, transactions, user_id, batch_size=batch_size)
+        await db.commit()
+        return result["inserted"], result["duplicates"]
+
+async def count_transactions(user_id):
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(select(func.count()).where(Transaction.user_id == user_id))
+
+async def rollups(user_id):
+    async with AsyncSessionLocal() as db:
+        return {
+            (r.month, r.category, r.transaction_type): (round(r.total_amount, 6), r.transaction_count)
+            for r in await RollupService.get_rollups(db, user_id)
+        }
+
+async def rebuilt_rollups(user_id):
+    async with AsyncSessionLocal() as db:
+        await RollupService.rebuild(db, user_id)
+    return await rollups(user_id)
+
+def test_fingerprint_is_stable_and_distinguishes_fields():
+    base = ("u1", datetime(2024, 1, 2), 12.5, "Shop", "x")
+    assert TransactionService.compute_fingerprint(*base) == TransactionService.compute_fingerprint(*base)
+    assert TransactionService.compute_fingerprint(*base) != TransactionService.compute_fingerprint("u2", *base[1:])
+    assert TransactionService.compute_fingerprint(*base) != TransactionService.compute_fingerprint(
+        "u1", datetime(2024, 1, 2), 12.5, "Shop", "y"
+    )
+
+def test_duplicates_within_and_across_imports(run, user_id):
+    transactions = make_transactions(50)
+    assert run(insert(user_id, transactions + transactions[:10], batch_size=16)) == (50, 10)
+    assert run(insert(user_id, transactions)) == (0, 50)
+    assert run(count_transactions(user_id)) == 50
+
+def test_concurrent_imports_insert_each_row_once(run, user_id):
+    transactions = make_transactions(1500)
+
+    async def both():
+        return await asyncio.gather(insert(user_id, transactions, 200), insert(user_id, transactions, 200))
+
+    results = run(both())
+    assert sum(inserted for inserted, _ in results) == 1500
+    assert sum(duplicates for _, duplicates in results) == 1500
+    assert run(count_transactions(user_id)) == 1500
+    assert sum(count for _, count in run(rollups(user_id)).values()) == 1500
+
+def test_create_transaction_returns_existing_duplicate(run, user_id):
+    data = make_transactions(1)[0]
+
+    async def create_twice():
+        async with AsyncSessionLocal() as db:
+            first = await TransactionService.create_transaction(db, dict(data), user_id)
+            second = await TransactionService.create_transaction(db, dict(data), user_id)
+            return first.id, second.id
+
+    first_id, second_id = run(create_twice())
+    assert first_id == second_id
+    assert run(count_transactions(user_id)) == 1
+
+def test_incremental_rollups_match_full_recompute(run, user_id):
+    transactions = make_transactions(400)
+    run(insert(user_id, transactions[:250], batch_size=64))
+    run(insert(user_id, transactions[150:], batch_size=64))
+
+    incremental = run(rollups(user_id))
+    assert sum(count for _, count in incremental.values()) == 400
+    assert incremental == run(rebuilt_rollups(user_id))
@@ -31,19 +31,18 @@ export default function DashboardLayout({ children }: DashboardLayoutProps) {
 
   const fetchUnreadCount = async () => {
     try {
-      const response = await alertService.getAll(true, 100);
-      setUnreadAlertCount(response.data.length);
+      const response = await alertService.getUnreadCount();
+      setUnreadAlertCount(response.data.unread_count);
     } catch (error) {
       console.error('Failed to fetch unread alerts:', error);
     }
   };
 
-  // Fetch unread alert count
+  // Fetch unread alert count, then count new alerts as they are pushed
   useEffect(() => {
     fetchUnreadCount();
-    // Refresh count every 30 seconds
-    const interval = setInterval(fetchUnreadCount, 30000);
-    return () => clearInterval(interval);
+    const source = alertService.subscribe(() => setUnreadAlertCount((count) => count + 1));
+    return () => source?.close();
   }, []);
 
   // Refresh count when pathname changes (especially when navigating to/from alerts)
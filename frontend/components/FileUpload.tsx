@@ -13,16 +13,33 @@ export default function FileUpload({ onUploadComplete }: FileUploadProps) {
   const [message, setMessage] = useState('');
 
   const handleFileUpload = async (event: React.ChangeEvent<HTMLInputElement>) => {
-    const file = event.target.files?.[0];
-    if (!file) return;
+    const files = Array.from(event.target.files ?? []);
+    if (files.length === 0) return;
 
     setUploading(true);
     setMessage('');
 
     try {
-      const response = await transactionService.uploadFile(file);
-      setMessage(`Success! ${response.data.message}`);
-      onUploadComplete();
+      const response = await transactionService.uploadFiles(files);
+      let job = response.data;
+
+      // The import runs in the background; poll until it finishes
+      while (job.status !== 'completed' && job.status !== 'failed') {
+        setMessage(`Importing... ${job.rows_inserted} transactions so far`);
+        await new Promise((resolve) => setTimeout(resolve, 1000));
+        job = (await transactionService.getImportJob(job.job_id)).data;
+      }
+
+      if (job.status === 'failed') {
+        setMessage(`Error: ${job.error || 'Import failed'}`);
+      } else {
+        const skipped = [
+          job.duplicates_skipped ? `${job.duplicates_skipped} duplicates` : '',
+          job.rows_rejected ? `${job.rows_rejected} invalid rows` : '',
+        ].filter(Boolean).join(', ');
+        setMessage(`Success! Imported ${job.rows_inserted} transactions${skipped ? ` (skipped ${skipped})` : ''}`);
+        onUploadComplete();
+      }
     } catch (error: any) {
       setMessage(`Error: ${error.response?.data?.detail || 'Upload failed'}`);
     } finally {
@@ -35,7 +52,8 @@ export default function FileUpload({ onUploadComplete }: FileUploadProps) {
       <label className="relative cursor-pointer">
         <input
           type="file"
-          accept=".csv,.json"
+          accept=".csv,.json,.ndjson,.jsonl,.zip"
+          multiple
           onChange={handleFileUpload}
           disabled={uploading}
           className="hidden"
@@ -73,15 +73,35 @@ export interface SpendingOverview {
   }>;
 }
 
+export interface ImportJob {
+  job_id: string;
+  files: string[];
+  status: 'queued' | 'importing' | 'completed' | 'failed';
+  rows_parsed: number;
+  rows_inserted: number;
+  rows_rejected: number;
+  duplicates_skipped: number;
+  batches: number;
+  errors: string[];
+  error?: string;
+  phase_timings: Record<string, number>;
+  created_at: string;
+  finished_at?: string;
+}
+
 export const transactionService = {
-  async uploadFile(file: File) {
+  async uploadFiles(files: File[]) {
     const formData = new FormData();
-    formData.append('file', file);
-    return api.post('/api/transactions/upload', formData, {
+    files.forEach((file) => formData.append('files', file));
+    return api.post<ImportJob>('/api/transactions/upload', formData, {
       headers: { 'Content-Type': 'multipart/form-data' },
     });
   },
 
+  async getImportJob(jobId: string) {
+    return api.get<ImportJob>(`/api/transactions/import-jobs/${jobId}`);
+  },
+
   async getAll(skip = 0, limit = 100) {
     return api.get<Transaction[]>('/api/transactions', {
       params: { skip, limit },
@@ -151,6 +171,12 @@ export const goalService = {
   async getProjection(id: number) {
     return api.get(`/api/goals/${id}/projection`);
   },
+
+  async getProjections(seed?: number) {
+    return api.get('/api/goals/projections', {
+      params: { seed },
+    });
+  },
 };
 
 export interface Budget {
@@ -175,6 +201,25 @@ export interface BudgetUsage {
   currency?: string;
 }
 
+export interface BudgetUsageHistory {
+  months: string[];
+  budgets: { budget_id: string; category?: string; budgeted_amount: number; currency: string }[];
+  spent: number[][];
+  percent_used: number[][];
+}
+
+export interface BudgetForecast {
+  budget_id: string;
+  category?: string;
+  budgeted_amount: number;
+  spent_amount: number;
+  daily_burn_rate: number;
+  projected_amount: number;
+  projected_overspend: number;
+  overspend_date?: string;
+  currency: string;
+}
+
 export const budgetService = {
   async create(budget: Omit<Budget, 'id' | 'user_id' | 'is_active' | 'created_at' | 'updated_at'>) {
     return api.post<Budget>('/api/budgets/', budget);
@@ -192,6 +237,16 @@ export const budgetService = {
     });
   },
 
+  async getUsageHistory(from?: string, to?: string) {
+    return api.get<BudgetUsageHistory>('/api/budgets/usage/history', {
+      params: { from, to },
+    });
+  },
+
+  async getForecast() {
+    return api.get<BudgetForecast[]>('/api/budgets/forecast');
+  },
+
   async update(id: string, updates: Partial<Budget>) {
     return api.put<Budget>(`/api/budgets/${id}`, updates);
   },
@@ -236,7 +291,61 @@ export const alertService = {
     return api.post('/api/alerts/mark-read', { ids });
   },
 
+  async markAllAsRead() {
+    return api.post<{ count: number }>('/api/alerts/mark-all-read');
+  },
+
+  async markAsReadByType(type: Alert['type']) {
+    return api.post<{ count: number }>('/api/alerts/mark-read-by-type', { type });
+  },
+
+  async delete(ids: string[]) {
+    return api.post<{ count: number }>('/api/alerts/delete', { ids });
+  },
+
+  async getUnreadCount() {
+    return api.get<{ unread_count: number }>('/api/alerts/unread-count');
+  },
+
   async generateAlerts() {
     return api.post('/api/alerts/generate');
+  },
+
+  // EventSource cannot send headers, so each connection is opened with a
+  // short-lived stream token instead of putting the access token in the URL.
+  // The token expires, so reconnects fetch a new one rather than letting
+  // EventSource retry the old URL.
+  subscribe(onAlert: (alert: Alert) => void): { close: () => void } | null {
+    if (!localStorage.getItem('token')) return null;
+    let source: EventSource | null = null;
+    let retry: ReturnType<typeof setTimeout> | null = null;
+    let closed = false;
+
+    const reconnect = () => {
+      source?.close();
+      source = null;
+      if (!closed) retry = setTimeout(connect, 5000);
+    };
+
+    const connect = async () => {
+      try {
+        const { data } = await api.post<{ token: string }>('/api/alerts/stream-token');
+        if (closed) return;
+        source = new EventSource(`${API_BASE_URL}/api/alerts/stream?token=${encodeURIComponent(data.token)}`);
+        source.addEventListener('alert', (event) => onAlert(JSON.parse((event as MessageEvent).data)));
+        source.onerror = reconnect;
+      } catch {
+        reconnect();
+      }
+    };
+
+    connect();
+    return {
+      close() {
+        closed = true;
+        if (retry) clearTimeout(retry);
+        source?.close();
+      }
+    };
   }
 };
\ No newline at end of file